@@ -0,0 +1,137 @@
+"""
+Capped map search vs. 'Zillow.crawl_area'
+
+Scatters N homes over a metro-sized box (a few dense clusters on a sparse
+background) and serves Zillow map searches over them through a transport
+that, like Zillow, returns at most 500 pins per search plus the true
+'totalResultCount', after a fixed latency per request. Then times:
+
+    - single       one map search of the whole box
+    - crawl        'crawl_area' of the box, recording a density map
+    - recrawl      'crawl_area' again, pre-split from the first crawl's map
+    - polygon      'crawl_area' of a triangle inside the box
+
+    python -m benchmarks.bench_crawl -n 20000 --latency 0.1
+"""
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+import httpx
+import orjson
+
+from src.paths import ROOT_DIR
+from src._http import ClientPool
+from src._zillow import Zillow
+from src._crawl import DensityMap
+from src._crawl import point_in_polygon
+
+
+BOUNDS = {"north": 42.10, "south": 41.50, "east": -87.60, "west": -88.40}
+
+CAP = 500
+
+
+def _points(n: int, seed: int = 7) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    clusters = [
+        (rng.uniform(BOUNDS["south"], BOUNDS["north"]), rng.uniform(BOUNDS["west"], BOUNDS["east"]))
+        for _ in range(5)
+    ]
+    points = []
+    for i in range(n):
+        if i % 4 == 0:
+            points.append((rng.uniform(BOUNDS["south"], BOUNDS["north"]), rng.uniform(BOUNDS["west"], BOUNDS["east"])))
+            continue
+        lat, lon = clusters[i % len(clusters)]
+        points.append((
+            min(max(rng.gauss(lat, 0.03), BOUNDS["south"]), BOUNDS["north"]),
+            min(max(rng.gauss(lon, 0.03), BOUNDS["west"]), BOUNDS["east"]),
+        ))
+    return points
+
+
+class MapTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, points: list[tuple[float, float]], latency: float):
+        self.points = points
+        self.latency = latency
+        self.requests = 0
+        item = orjson.loads(ROOT_DIR.joinpath("search_response-zillow.json").read_bytes())[0]
+        self.pin = {key: item[key] for key in ("price", "unformattedPrice", "beds", "baths", "addressCity", "addressState")}
+
+
+    def _response(self, req: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        bounds = orjson.loads(req.content)["searchQueryState"]["mapBounds"]
+        # Half-open on the north/east edges so a point on a split line lands in one tile
+        matches = [
+            i for i, (lat, lon) in enumerate(self.points)
+            if bounds["southLatitude"] <= lat < bounds["northLatitude"]
+            and bounds["westLongitude"] <= lon < bounds["eastLongitude"]
+        ]
+        pins = [
+            {**self.pin, "zpid": i, "latLong": {"latitude": self.points[i][0], "longitude": self.points[i][1]}}
+            for i in matches[:CAP]
+        ]
+        content = orjson.dumps({
+            "cat1": {
+                "searchResults": {"listResults": [], "mapResults": pins},
+                "searchList": {"totalResultCount": len(matches), "totalPages": 1},
+            }
+        })
+        return httpx.Response(200, content=content, request=req)
+
+
+    def handle_request(self, req: httpx.Request) -> httpx.Response:
+        time.sleep(self.latency)
+        return self._response(req)
+
+
+    async def handle_async_request(self, req: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return self._response(req)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    args = parser.parse_args()
+
+    points = _points(args.n)
+    transport = MapTransport(points, args.latency)
+    pool = ClientPool(transport=transport)
+    zillow = Zillow(pool=pool)
+
+    triangle = [
+        (BOUNDS["south"], BOUNDS["west"]),
+        (BOUNDS["north"], (BOUNDS["west"] + BOUNDS["east"]) / 2),
+        (BOUNDS["south"], BOUNDS["east"]),
+    ]
+    in_triangle = sum(point_in_polygon(lat, lon, triangle) for lat, lon in points)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        density = DensityMap(Path(tmp).joinpath("density.json"))
+
+        for name, expected, run in (
+                ("single", CAP, lambda: zillow.normalize.search_response(pool.send(zillow.request.map_search(None, bounds=BOUNDS)))),
+                ("crawl", args.n, lambda: list(zillow.crawl_area(BOUNDS, density=density, max_in_flight=args.max_in_flight))),
+                ("recrawl", args.n, lambda: list(zillow.crawl_area(BOUNDS, density=DensityMap(density.path), max_in_flight=args.max_in_flight))),
+                ("polygon", in_triangle, lambda: list(zillow.crawl_area(triangle, max_in_flight=args.max_in_flight))),
+            ):
+            transport.requests = 0
+            start = time.perf_counter()
+            listings = run()
+            elapsed = time.perf_counter() - start
+            assert len(listings) == expected, (name, len(listings), expected)
+            print(f"{name:<8} {elapsed:6.2f}s  {transport.requests:>4} requests  {len(listings)} listings")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
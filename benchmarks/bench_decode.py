@@ -0,0 +1,63 @@
+"""
+Envelope stripping + JSON decoding of a search response body
+
+Times the old per-provider decode paths against the registered
+'ResponseDecoder' on the committed search_response-redfin.json fixture
+(prefixed with Redfin's "{}&&" and wrapped in the 'gis' envelope):
+
+    - bytes.replace + orjson.loads    (old Redfin path: copies + scans the body)
+    - httpx Response.json()           (old Realtor path: stdlib json)
+    - ResponseDecoder.decode          (memoryview slice + orjson)
+    - ResponseDecoder.decode(paths)   (only what 'normalize.property_search' reads)
+
+    python -m benchmarks.bench_decode -n 200
+"""
+import time
+import argparse
+import tracemalloc
+
+import httpx
+import orjson
+
+from src.paths import ROOT_DIR
+from src._http import get_decoder
+from src._redfin import Redfin
+
+
+def bench(name: str, decode, content: bytes, n: int):
+    start = time.perf_counter()
+    for _ in range(n):
+        decode(content)
+    elapsed = (time.perf_counter() - start) / n
+
+    tracemalloc.start()
+    decode(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{name:<30} {elapsed * 1e3:8.3f} ms/body  peak {peak / 1e6:6.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=200)
+    args = parser.parse_args()
+
+    fixture = ROOT_DIR.joinpath("search_response-redfin.json").read_bytes()
+    lines = fixture.count(b"\n") + 1
+    content = b'{}&&{"resultCode":0,"errorMessage":"Success","payload":{"homes":' + fixture + b"}}"
+    print(f"body: {len(content) / 1e6:.2f} MB, {lines} lines")
+
+    decoder = get_decoder("redfin")
+    paths = Redfin.normalize.search_paths
+    assert decoder.decode(content) == orjson.loads(content[4:])
+    assert Redfin.normalize.property_search(decoder.decode(content, paths)) == Redfin.normalize.property_search(decoder.decode(content))
+
+    bench("replace + orjson", lambda c: orjson.loads(c.replace(b"{}&&", b"")), content, args.n)
+    bench("Response.json()", lambda c: httpx.Response(200, content=c[4:]).json(), content, args.n)
+    bench("ResponseDecoder.decode", decoder.decode, content, args.n)
+    bench("ResponseDecoder.decode(paths)", lambda c: decoder.decode(c, paths), content, args.n)
+
+
+if __name__ == "__main__":
+    main()
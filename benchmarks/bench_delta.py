@@ -0,0 +1,160 @@
+"""
+Nightly re-crawl vs. 'Zillow.delta_query_search'
+
+Simulates a Zillow region of N for-sale homes served 41 per page (sorted
+by most recent change when asked to) through a transport that adds a
+fixed latency per request. After a first crawl, each "night" a small
+share of the homes get a new price or status, a few are newly listed and
+a few delisted, then the region is fetched two ways:
+
+    - full       'paginate_query_search', every page
+    - delta      'delta_query_search', stopping at the first unchanged page
+
+and finally a full delta walk, which reports the delistings.
+
+    python -m benchmarks.bench_delta -n 4000 --changed 0.02
+"""
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+import httpx
+import orjson
+
+from src._http import ClientPool
+from src._zillow import Zillow
+from src._delta import DeltaStore
+
+
+PAGE_SIZE = 41
+
+QUERY_UNDERSTANDING = orjson.dumps({"data": {"zgsQueryUnderstandingRequest": {"results": [{
+    "subType": "city",
+    "regionId": 1,
+    "region": {"mbr": "POLYGON((-88.3 41.6, -88.0 41.6, -88.0 41.8, -88.3 41.8, -88.3 41.6))"},
+}]}}})
+
+
+class RegionTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, n: int, latency: float, seed: int = 7):
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.clock = 0
+        self.requests = 0
+        self.homes = {}
+        for zpid in range(n):
+            self._list(zpid)
+
+
+    def _list(self, zpid: int):
+        self.clock += 1
+        self.homes[zpid] = {"price": self.rng.randrange(200, 900) * 1000, "status": "FOR_SALE", "changed": self.clock}
+
+
+    def night(self, changed: float):
+        """
+        Reprice or go pending on a share of the homes; list a few new ones
+        and delist a few old ones
+        """
+        for zpid in self.rng.sample(sorted(self.homes), int(len(self.homes) * changed / 8)):
+            del self.homes[zpid]
+        for zpid in self.rng.sample(sorted(self.homes), int(len(self.homes) * changed)):
+            self.clock += 1
+            home = self.homes[zpid]
+            if self.rng.random() < 0.7:
+                home["price"] -= 5000
+            else:
+                home["status"] = "PENDING"
+            home["changed"] = self.clock
+        start = max(self.homes) + 1
+        for zpid in range(start, start + int(len(self.homes) * changed / 4)):
+            self._list(zpid)
+
+
+    def _response(self, req: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if req.url.path == "/zg-graph":
+            return httpx.Response(200, content=QUERY_UNDERSTANDING, request=req)
+
+        state = orjson.loads(req.content)["searchQueryState"]
+        page = state["pagination"]["currentPage"]
+        zpids = sorted(self.homes)
+        if state["filterState"]["sortSelection"]["value"] == "mostrecentchange":
+            zpids.sort(key=lambda zpid: self.homes[zpid]["changed"], reverse=True)
+
+        results = [
+            {
+                "zpid": str(zpid),
+                "unformattedPrice": self.homes[zpid]["price"],
+                "statusType": self.homes[zpid]["status"],
+                "addressCity": "Naperville",
+                "addressState": "IL",
+            }
+            for zpid in zpids[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        ]
+        content = orjson.dumps({"cat1": {
+            "searchResults": {"listResults": results},
+            "searchList": {"totalResultCount": len(zpids), "totalPages": -(-len(zpids) // PAGE_SIZE)},
+        }})
+        return httpx.Response(200, content=content, request=req)
+
+
+    def handle_request(self, req: httpx.Request) -> httpx.Response:
+        time.sleep(self.latency)
+        return self._response(req)
+
+
+    async def handle_async_request(self, req: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return self._response(req)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=4000)
+    parser.add_argument("--changed", type=float, default=0.02)
+    parser.add_argument("--nights", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    transport = RegionTransport(args.n, args.latency)
+    pool = ClientPool(transport=transport)
+    zillow = Zillow(pool=pool)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DeltaStore(Path(tmp).joinpath("delta.json"))
+
+        transport.requests = 0
+        delta = zillow.delta_query_search("Naperville, IL", store)
+        print(f"first      {transport.requests:>4} requests  {len(delta.added)} added")
+
+        for night in range(1, args.nights + 1):
+            transport.night(args.changed)
+
+            transport.requests = 0
+            start = time.perf_counter()
+            listings = list(zillow.paginate_query_search("Naperville, IL", max_in_flight=1))
+            elapsed = time.perf_counter() - start
+            print(f"night {night}  full   {elapsed:6.2f}s  {transport.requests:>4} requests  {len(listings)} listings")
+
+            transport.requests = 0
+            start = time.perf_counter()
+            delta = zillow.delta_query_search("Naperville, IL", store)
+            elapsed = time.perf_counter() - start
+            print(
+                f"night {night}  delta  {elapsed:6.2f}s  {transport.requests:>4} requests  "
+                f"{len(delta.added)} added, {len(delta.changed)} changed"
+            )
+
+        transport.requests = 0
+        delta = zillow.delta_query_search("Naperville, IL", store, full=True)
+        print(f"full walk  {transport.requests:>4} requests  {len(delta.added)} added, {len(delta.changed)} changed, {len(delta.removed)} removed")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Interrupted area crawl: restart from scratch vs. resume from a 'Job'
+
+Serves the synthetic map of bench_crawl through a transport that goes
+down (every request fails, like a storm of 429s) after a set number of
+requests. Every tile past the outage fails (skipped by a plain crawl,
+journaled as failed by a job), and the crawl is then run again once the
+transport is back:
+
+    - restart    'crawl_area' again from the first tile
+    - resume     'crawl_area(job=...)', skipping the tiles already journaled
+
+    python -m benchmarks.bench_jobs -n 20000 --outage-after 60
+"""
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+import httpx
+
+from src._http import ClientPool
+from src._zillow import Zillow
+from src._jobs import Job
+from benchmarks.bench_crawl import BOUNDS
+from benchmarks.bench_crawl import MapTransport
+from benchmarks.bench_crawl import _points
+
+
+class OutageTransport(MapTransport):
+    def __init__(self, points: list[tuple[float, float]], latency: float, outage_after: int):
+        super().__init__(points, latency)
+        self.outage_after = outage_after
+        self.down = False
+
+
+    def _response(self, req: httpx.Request) -> httpx.Response:
+        if self.down or self.requests >= self.outage_after:
+            self.down = True
+            raise httpx.ConnectError("provider unavailable", request=req)
+        return super()._response(req)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--outage-after", type=int, default=60)
+    args = parser.parse_args()
+
+    points = _points(args.n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("restart", "resume"):
+            transport = OutageTransport(points, args.latency, args.outage_after)
+            pool = ClientPool(transport=transport)
+            zillow = Zillow(pool=pool)
+            job = Job(f"bench-{name}", Path(tmp).joinpath("jobs.sqlite")) if name == "resume" else None
+
+            try:
+                list(zillow.crawl_area(BOUNDS, max_in_flight=16, job=job))
+            except RuntimeError:
+                pass
+            journaled = job.progress("tiles")["done"] if job != None else 0
+            print(f"{name:<8} outage after {transport.requests} requests, {journaled} tiles journaled")
+
+            transport.down = False
+            transport.outage_after = float("inf")
+            transport.requests = 0
+            start = time.perf_counter()
+            listings = list(zillow.crawl_area(BOUNDS, max_in_flight=16, job=job))
+            elapsed = time.perf_counter() - start
+            assert len(listings) == args.n, (name, len(listings))
+            print(f"{name:<8} rerun {elapsed:6.2f}s  {transport.requests:>4} requests  {len(listings)} listings")
+
+            if job != None:
+                job.close()
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Normalization throughput and allocation per listing
+
+Replicates the committed search_response-*.json fixtures to N listings per
+provider and times 'normalize.property_search' (dicts, the public output)
+'normalize.listing' alone ('Listing' records) and
+'normalize.property_search_batch' (columnar 'ListingBatch'), plus the peak
+memory traced while building them.
+
+    python -m benchmarks.bench_normalize -n 10000
+"""
+import time
+import argparse
+import tracemalloc
+
+import orjson
+
+from src.paths import ROOT_DIR
+from src._redfin import Redfin
+from src._realtor import Realtor
+from src._homes import Homes
+from src._http import get_decoder
+
+
+def _envelope(provider: str, n: int):
+    items = orjson.loads(ROOT_DIR.joinpath(f"search_response-{provider}.json").read_bytes())
+    items = (items * (n // len(items) + 1))[:n]
+    if provider == "redfin":
+        return {"payload": {"homes": items}}
+    if provider == "realtor":
+        return {"data": {"home_search": {"properties": items}}}
+    return {"placards": items}
+
+
+def bench(name: str, normalize, data, n: int, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        normalize(data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    normalize(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{name:<16} {best:8.3f}s  {best / n * 1e6:8.2f} us/listing  peak {peak / n:8.0f} B/listing")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, cls in (("redfin", Redfin), ("realtor", Realtor), ("homes", Homes)):
+        data = _envelope(name, args.n)
+
+        items = data
+        for key in get_decoder(name).root:
+            items = items[key]
+
+        def records(_, listing=cls.normalize.listing, items=items):
+            return [listing(p) for p in items]
+
+        bench(f"{name} dicts", cls.normalize.property_search, data, args.n, args.repeat)
+        bench(f"{name} records", records, data, args.n, args.repeat)
+        bench(f"{name} batch", cls.normalize.property_search_batch, data, args.n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
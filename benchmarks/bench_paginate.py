@@ -0,0 +1,90 @@
+"""
+Sequential page loop vs. 'Realtor.paginate_query_search'
+
+Serves Realtor search pages built from the committed
+search_response-realtor.json fixture through a transport that adds a fixed
+latency per request, and times fetching every page of a 2 page and a 20
+page search:
+
+    - sequential   'query_search' per offset, one page after another
+    - paginated    page 1, then the rest concurrently
+
+    python -m benchmarks.bench_paginate --latency 0.25
+"""
+import time
+import asyncio
+import argparse
+
+import httpx
+import orjson
+
+from src.paths import ROOT_DIR
+from src._http import ClientPool
+from src._realtor import Realtor
+
+
+class LatencyTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, total: int, latency: float):
+        self.total = total
+        self.latency = latency
+        self.properties = orjson.loads(ROOT_DIR.joinpath("search_response-realtor.json").read_bytes())
+
+
+    def _response(self, req: httpx.Request) -> httpx.Response:
+        variables = orjson.loads(req.content)["variables"]
+        offset, limit = variables.get("offset", 0), variables["limit"]
+        properties = [
+            {**self.properties[i % len(self.properties)], "property_id": str(i), "listing_id": str(i)}
+            for i in range(offset, min(offset + limit, self.total))
+        ]
+        content = orjson.dumps({"data": {"home_search": {"total": self.total, "count": len(properties), "properties": properties}}})
+        return httpx.Response(200, content=content, request=req)
+
+
+    def handle_request(self, req: httpx.Request) -> httpx.Response:
+        time.sleep(self.latency)
+        return self._response(req)
+
+
+    async def handle_async_request(self, req: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return self._response(req)
+
+
+def sequential(realtor: Realtor, limit: int) -> list[dict]:
+    listings = []
+    offset = 0
+    while True:
+        page = realtor.query_search("Naperville, IL", limit=limit, offset=offset)
+        listings.extend(page)
+        if len(page) < limit:
+            return listings
+        offset += limit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    for pages in (2, 20):
+        total = pages * args.limit - 1
+        pool = ClientPool(transport=LatencyTransport(total, args.latency))
+        realtor = Realtor(pool=pool)
+
+        for name, run in (
+                ("sequential", lambda: sequential(realtor, args.limit)),
+                ("paginated", lambda: list(realtor.paginate_query_search("Naperville, IL", limit=args.limit, max_in_flight=pages))),
+            ):
+            start = time.perf_counter()
+            listings = run()
+            elapsed = time.perf_counter() - start
+            assert len(listings) == total
+            print(f"{pages:>2} pages  {name:<10} {elapsed:6.2f}s  {len(listings)} listings")
+
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Homes.com placard hydration: one POST vs. concurrent chunks
+
+Serves a dense area of N pins and their placards,
+replicated from the committed search_response-homes.json fixture, through
+a transport whose placards route takes a fixed overhead plus a cost per
+listing key, like a server building each placard. Times
+'Homes.iter_query_search' at several chunk sizes, to the first placard
+and to the last:
+
+    - chunk=N      every key in a single getplacardsbylisting POST
+    - chunk=k      k keys per request, 'max_in_flight' requests at a time
+
+    python -m benchmarks.bench_placards -n 2000 --overhead 0.15 --per-key 0.002
+"""
+import time
+import asyncio
+import argparse
+
+import httpx
+import orjson
+
+from src.paths import ROOT_DIR
+from src._http import ClientPool
+from src._homes import Homes
+
+
+class PlacardTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, n: int, overhead: float, per_key: float):
+        self.overhead = overhead
+        self.per_key = per_key
+        items = orjson.loads(ROOT_DIR.joinpath("search_response-homes.json").read_bytes())
+        self.placards = {}
+        self.pins = []
+        for i in range(n):
+            key = f"lk{i}"
+            self.placards[key] = {**items[i % len(items)], "listingKey": {"key": key}}
+            self.pins.append({"lk": {"key": key}})
+
+
+    def _delay(self, req: httpx.Request) -> float:
+        if req.url.path.endswith("getplacardsbylisting"):
+            return self.overhead + self.per_key * len(orjson.loads(req.content)["listingKeys"])
+        return self.overhead
+
+
+    def _response(self, req: httpx.Request) -> httpx.Response:
+        path = req.url.path
+        if "autocomplete" in path:
+            content = {"suggestions": {"places": [{"d": "Naperville", "s": "City", "g": {}}]}}
+        elif path.endswith("getpins"):
+            content = {"pins": self.pins}
+        else:
+            keys = [x["key"] for x in orjson.loads(req.content)["listingKeys"]]
+            content = {"placards": [self.placards[key] for key in keys]}
+        return httpx.Response(200, content=orjson.dumps(content), request=req)
+
+
+    def handle_request(self, req: httpx.Request) -> httpx.Response:
+        time.sleep(self._delay(req))
+        return self._response(req)
+
+
+    async def handle_async_request(self, req: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self._delay(req))
+        return self._response(req)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=2000)
+    parser.add_argument("--overhead", type=float, default=0.15)
+    parser.add_argument("--per-key", type=float, default=0.002)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    args = parser.parse_args()
+
+    pool = ClientPool(transport=PlacardTransport(args.n, args.overhead, args.per_key))
+    homes = Homes(pool=pool)
+
+    for chunk_size in (args.n, 400, 200, 100, 50, 25):
+        start = time.perf_counter()
+        first = None
+        listings = []
+        for listing in homes.iter_query_search("Naperville, IL", chunk_size=chunk_size, max_in_flight=args.max_in_flight):
+            if first == None:
+                first = time.perf_counter() - start
+            listings.append(listing)
+        elapsed = time.perf_counter() - start
+
+        assert len(listings) == args.n
+        print(f"chunk={chunk_size:<5} first {first:6.2f}s  all {elapsed:6.2f}s  {len(listings)} listings")
+
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
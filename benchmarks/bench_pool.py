@@ -0,0 +1,57 @@
+"""
+Per-call 'httpx.Client' vs. a shared 'ClientPool'
+
+Counts TCP connects / TLS handshakes (via the httpcore trace extension)
+and wall time for N sequential requests to the same host.
+
+    python -m benchmarks.bench_pool --url https://www.redfin.com/robots.txt -n 50
+"""
+import time
+import argparse
+
+import httpx
+
+from src._http import ClientPool
+
+
+def _counting_request(url: str, counts: dict):
+    def trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            counts["tcp"] += 1
+        elif event_name == "connection.start_tls.complete":
+            counts["tls"] += 1
+
+    return httpx.Request("GET", url, extensions={"trace": trace})
+
+
+def per_call(url: str, n: int):
+    counts = {"tcp": 0, "tls": 0}
+    start = time.perf_counter()
+    for _ in range(n):
+        with httpx.Client() as client:
+            client.send(_counting_request(url, counts)).read()
+    return time.perf_counter() - start, counts
+
+
+def pooled(url: str, n: int, http2: bool | None = None):
+    counts = {"tcp": 0, "tls": 0}
+    start = time.perf_counter()
+    with ClientPool(http2=http2) as pool:
+        for _ in range(n):
+            pool.send(_counting_request(url, counts)).read()
+    return time.perf_counter() - start, counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="https://www.redfin.com/robots.txt")
+    parser.add_argument("-n", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, fn in (("per-call client", per_call), ("shared pool", pooled)):
+        elapsed, counts = fn(args.url, args.n)
+        print(f"{name:<16} {elapsed:8.3f}s  {elapsed / args.n * 1000:8.2f} ms/req  tcp={counts['tcp']}  tls={counts['tls']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Decode + normalize of a whole search response, per provider
+
+Replicates the committed search_response-*.json fixtures to N listings,
+wraps them in the provider's response envelope and times three ways from
+bytes to normalized dicts:
+
+    - orjson    full orjson decode, 'normalize.property_search'
+    - selective only the spec's paths decoded, 'normalize.property_search'
+    - typed     msgspec decode into '_schemas', 'normalize.typed_listing'
+
+    python -m benchmarks.bench_typed -n 2000
+"""
+import time
+import argparse
+
+import orjson
+
+from src.paths import ROOT_DIR
+from src._http import get_decoder
+from src._redfin import Redfin
+from src._zillow import Zillow
+from src._realtor import Realtor
+from src._homes import Homes
+from src._schemas import decode_search
+
+
+def _body(provider: str, n: int) -> bytes:
+    items = orjson.loads(ROOT_DIR.joinpath(f"search_response-{provider}.json").read_bytes())
+    items = (items * (n // len(items) + 1))[:n]
+
+    data = items
+    for key in reversed(get_decoder(provider).root):
+        data = {key: data}
+    return get_decoder(provider).prefix + orjson.dumps(data)
+
+
+def bench(name: str, run, body: bytes, n: int, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(body)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<20} {best * 1e3:8.2f} ms  {best / n * 1e6:8.2f} us/listing")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, cls in (("redfin", Redfin), ("realtor", Realtor), ("zillow", Zillow), ("homes", Homes)):
+        body = _body(name, args.n)
+        decoder = get_decoder(name)
+        normalize = cls.normalize
+
+        def full(b):
+            return normalize.property_search(decoder.decode(b))
+
+        def selective(b):
+            return normalize.property_search(decoder.decode(b, normalize.search_paths))
+
+        def typed(b):
+            return [normalize.typed_listing(p).to_dict() for p in decode_search(b, name)]
+
+        assert full(body) == selective(body) == typed(body)
+
+        bench(f"{name} orjson", full, body, args.n, args.repeat)
+        bench(f"{name} selective", selective, body, args.n, args.repeat)
+        bench(f"{name} typed", typed, body, args.n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
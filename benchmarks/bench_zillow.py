@@ -0,0 +1,108 @@
+"""
+Zillow search normalization: 'listResults' + 'mapResults'
+
+Replicates the committed search_response-zillow.json fixture to N list
+results and builds the matching 'mapResults' pins (the same homes, with
+integer zpids and only the map keys, plus N // 4 map-only homes), then
+times from bytes to normalized dicts:
+
+    - ad hoc    orjson, nested-loop join on zpid, display price parsed
+    - orjson    orjson, 'normalize.property_search' (hash join)
+    - typed     msgspec into '_schemas', 'normalize.search_response'
+
+    python -m benchmarks.bench_zillow -n 500
+"""
+import time
+import argparse
+
+import orjson
+
+from src.paths import ROOT_DIR
+from src._zillow import Zillow
+
+
+MAP_KEYS = ("zpid", "price", "unformattedPrice", "latLong", "beds", "baths", "addressCity", "addressState")
+
+
+def _body(n: int) -> bytes:
+    items = orjson.loads(ROOT_DIR.joinpath("search_response-zillow.json").read_bytes())
+    list_results = []
+    for i in range(n):
+        item = dict(items[i % len(items)])
+        item["zpid"] = str(i)
+        list_results.append(item)
+
+    map_results = [
+        {**{key: item[key] for key in MAP_KEYS if key in item}, "zpid": int(item["zpid"])}
+        for item in list_results
+    ]
+    for i in range(n, n + n // 4):
+        pin = {key: value for key, value in list_results[i % n].items() if key in MAP_KEYS}
+        map_results.append({**pin, "zpid": i})
+
+    return orjson.dumps({"cat1": {"searchResults": {"listResults": list_results, "mapResults": map_results}}})
+
+
+def ad_hoc(body: bytes) -> list[dict]:
+    # What callers of the raw 'listResults' did: a nested-loop join and
+    # numbers parsed back out of display strings
+    search_results = orjson.loads(body)["cat1"]["searchResults"]
+    map_results = search_results["mapResults"]
+    list_results = search_results["listResults"]
+
+    merged = []
+    for item in list_results:
+        for pin in map_results:
+            if str(pin.get("zpid")) == item["zpid"]:
+                item = {**pin, **item}
+                break
+        merged.append(item)
+    listed = {item["zpid"] for item in list_results}
+    merged.extend(pin for pin in map_results if pin.get("zpid") != None and str(pin["zpid"]) not in listed)
+
+    results = []
+    for item in merged:
+        price = item.get("price")
+        price = int(price.replace("$", "").replace(",", "").rstrip("+")) if isinstance(price, str) and price[1:2].isdigit() else None
+        lat_long = item.get("latLong") or {}
+        results.append({
+            "db_property_id": str(item["zpid"]),
+            "price": price,
+            "lat": lat_long.get("latitude"),
+            "lon": lat_long.get("longitude"),
+        })
+    return results
+
+
+def bench(name: str, run, body: bytes, n: int, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(body)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<10} {best * 1e3:8.2f} ms  {best / n * 1e6:8.2f} us/listing")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = _body(args.n)
+    normalize = Zillow.normalize
+
+    def hash_join(b):
+        return normalize.property_search(orjson.loads(b))
+
+    total = args.n + args.n // 4
+    assert len(hash_join(body)) == len(ad_hoc(body)) == total
+    assert hash_join(body) == normalize.search_response(body)
+
+    bench("ad hoc", ad_hoc, body, total, args.repeat)
+    bench("orjson", hash_join, body, total, args.repeat)
+    bench("typed", normalize.search_response, body, total, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,32 @@
 from ._homes import Homes
+from ._homes import AsyncHomes
 
 from ._http import fetch_bulk
 from ._http import send_request
+from ._http import ClientPool
+from ._http import stream_bulk
+from ._http import iter_bulk
+from ._http import fetch_named
+from ._paginate import paginate
+from ._paginate import apaginate
+from ._crawl import Tile
+from ._crawl import DensityMap
+from ._crawl import AreaCrawler
+from ._delta import Delta
+from ._delta import DeltaStore
+from ._jobs import Job
+from ._http import RateLimiter
+from ._http import get_limiter
+from ._http import SingleFlight
+from ._http import register_decoder
+from ._http import get_decoder
+from ._http import SchemaError
+from ._cache import ResponseCache
+from ._cassette import Cassette
+from ._offload import NormalizeExecutor
+from ._models import Listing
+from ._models import Address
+from ._models import Agent
+from ._models import PropertyDetails
+from ._batch import ListingBatch
+from ._photos import PhotoSet
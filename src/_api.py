@@ -13,6 +13,8 @@ from . import paths
 from ._util import readjson
 from ._util import readfile
 from ._geo import get_bounding_box
+from ._http import get_pool
+from ._http import ClientPool
 from ._http import send_request
 from .ptext import console
 from ._constants import RF_UIPT_MAP
@@ -28,6 +30,7 @@ from ._constants import HM_PROPERTY_TYPE
 from ._constants import HM_DAYS_ON_MARKET
 from ._constants import HM_LISTING_TYPE_MAP
 from ._constants import HM_LISTING_STATUS_MAP
+from ._constants import HM_PLACARD_CHUNK_SIZE
 from ._constants import HM_AMENITY_OUTDOOR
 from ._constants import HM_AMENITY_INTERIOR
 from ._constants import HM_AMENITY_FLOORING
@@ -50,8 +53,8 @@ def _read_payload(s):
 
 
 class RealtorAPI:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
 
 
     def map_search(
@@ -75,8 +78,7 @@ class RealtorAPI:
             sort_type=sort_type,
             )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -106,8 +108,7 @@ class RealtorAPI:
             sort_type=sort_type,
             )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -137,8 +138,7 @@ class RealtorAPI:
             sort_type=sort_type,
             )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -171,8 +171,7 @@ class RealtorAPI:
     def property_details(self, property_id):
         req = self.request.property_details(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
         rawdata = r.json()
 
@@ -182,19 +181,17 @@ class RealtorAPI:
     def property_and_tax_history(self, property_id):
         req = self.request.property_and_tax_history(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
-            rawdata = r.json()
-        
-            return rawdata
+        rawdata = r.json()
+    
+        return rawdata
     
 
     def property_school_data(self, property_id):
         req = self.request.property_school_data(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -220,8 +217,7 @@ class RealtorAPI:
         
         req = self.request.property_estimates(property_id, hist_year_min, hist_year_max, fcast_date_str)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -231,8 +227,7 @@ class RealtorAPI:
     def property_saves(self, property_id):
         req = self.request.property_saves(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -242,8 +237,7 @@ class RealtorAPI:
     def property_gallery(self, property_id):
         req = self.request.property_gallery(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = r.json()
 
@@ -630,8 +624,8 @@ class RealtorAPI:
 
 
 class ZillowAPI:
-    def __init__(self):
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
 
     def map_search(
             self, 
@@ -693,8 +687,7 @@ class ZillowAPI:
             sort_order=sort_order,
         )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
         rawdata = orjson.loads(r.content)
 
@@ -728,8 +721,7 @@ class ZillowAPI:
             page=page,
         )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
         rawdata = orjson.loads(r.content)
 
@@ -761,7 +753,7 @@ class ZillowAPI:
             page=page,
         )
 
-        r = send_request(req)
+        r = send_request(req, self.pool.client)
 
         rawdata = orjson.loads(r.content)
 
@@ -800,51 +792,52 @@ class ZillowAPI:
         ):
         req = self.request.query_understanding(query)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        client = self.pool.client
 
-            query_data = self._compact_query_understanding(orjson.loads(r.content))
-            
-            for result in query_data:
-                if str(result["sub_type"]).lower() == region_type.strip().lower():
-                    region_id = result["region_id"]
-                    region_type = result["sub_type"]
-                    coordinates = result["polygon"]
-                    break
-
-            req = self.request.region_lookup(
-                region_id,
-                region_type, 
-                coordinates=coordinates,
-                price_min=price_min,
-                price_max=price_max,
-                num_beds_min=num_beds_min,
-                num_beds_max=num_beds_max,
-                num_baths_min=num_baths_min,
-                num_baths_max=num_baths_max,
-                include_pending_listings=include_pending_listings,
-                include_accepting_offers=include_accepting_offers,
-                open_houses_only=open_houses_only,
-                has_3d_tour_only=has_3d_tour_only,
-                year_built_min=year_built_min,
-                year_built_max=year_built_max,
-                has_finished_basement=has_finished_basement,
-                has_unfinished_basement=has_unfinished_basement,
-                has_garage=has_garage,
-                hide_55plus=age_55plus_only,
-                single_story_only=single_story_only,
-                has_ac=has_ac,
-                has_pool=has_pool,
-                doz=doz,
-                limit=limit,
-                page=page,
-                sort_order=sort_order,
-                )
-            
-            r = client.send(req)
+        r = client.send(req)
 
-            rawdata = orjson.loads(r.content)
+        query_data = self._compact_query_understanding(orjson.loads(r.content))
         
+        for result in query_data:
+            if str(result["sub_type"]).lower() == region_type.strip().lower():
+                region_id = result["region_id"]
+                region_type = result["sub_type"]
+                coordinates = result["polygon"]
+                break
+
+        req = self.request.region_lookup(
+            region_id,
+            region_type, 
+            coordinates=coordinates,
+            price_min=price_min,
+            price_max=price_max,
+            num_beds_min=num_beds_min,
+            num_beds_max=num_beds_max,
+            num_baths_min=num_baths_min,
+            num_baths_max=num_baths_max,
+            include_pending_listings=include_pending_listings,
+            include_accepting_offers=include_accepting_offers,
+            open_houses_only=open_houses_only,
+            has_3d_tour_only=has_3d_tour_only,
+            year_built_min=year_built_min,
+            year_built_max=year_built_max,
+            has_finished_basement=has_finished_basement,
+            has_unfinished_basement=has_unfinished_basement,
+            has_garage=has_garage,
+            hide_55plus=age_55plus_only,
+            single_story_only=single_story_only,
+            has_ac=has_ac,
+            has_pool=has_pool,
+            doz=doz,
+            limit=limit,
+            page=page,
+            sort_order=sort_order,
+            )
+        
+        r = client.send(req)
+
+        rawdata = orjson.loads(r.content)
+
         # return query_data
         return rawdata
         
@@ -858,7 +851,7 @@ class ZillowAPI:
             coordinates=coordinates
         )
 
-        r = send_request(req)
+        r = send_request(req, self.pool.client)
 
         rawdata = orjson.loads(r.content)
 
@@ -868,8 +861,7 @@ class ZillowAPI:
     def property_details(self, zpid):
         req = self.request.property_details(zpid)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content)
 
@@ -879,8 +871,7 @@ class ZillowAPI:
     def query_understanding(self, query:str):
         req = ZillowAPI.request.query_understanding(query)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content)
 
@@ -895,8 +886,7 @@ class ZillowAPI:
             page=page
         )
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content)
 
@@ -906,8 +896,7 @@ class ZillowAPI:
     def autocomplete(self, query_string:str):
         req = ZillowAPI.request.autocomplete_results(query_string)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content)
 
@@ -1614,8 +1603,8 @@ class ZillowAPI:
 
 
 class RedfinAPI:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
     
     def map_search(
             self,
@@ -1640,8 +1629,7 @@ class RedfinAPI:
                                       time_on_market_range=time_on_market_range, redfin_listings_only=redfin_listings_only,
                                       financing_type=financing_type, pool_type=pool_type, sort_by=sort_by)
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
 
@@ -1671,8 +1659,7 @@ class RedfinAPI:
                                          time_on_market_range=time_on_market_range, redfin_listings_only=redfin_listings_only,
                                          financing_type=financing_type, pool_type=pool_type, sort_by=sort_by)
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
 
@@ -1701,8 +1688,7 @@ class RedfinAPI:
                                          time_on_market_range=time_on_market_range, redfin_listings_only=redfin_listings_only,
                                          financing_type=financing_type, pool_type=pool_type, sort_by=sort_by)
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
 
@@ -1712,8 +1698,7 @@ class RedfinAPI:
     def query_region(self, location:str):
         req = self.request.query_region(location)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
         rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
 
@@ -2112,14 +2097,14 @@ _SortType = Literal[
 _SqFt = Literal[500, 750, 1000, 1250, 1500, 1750, 2000, 2250, 2500, 3000, 3500, 4000, 4500, 5000, 6000, 7000, 8000, 9000, 10000]
 
 class HomesAPI:
-    def __init__(self):
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
 
 
     def autocomplete(self, query:str):
         req = self.request.autocomplete(query)
 
-        r = send_request(req)
+        r = send_request(req, self.pool.client)
 
         data = orjson.loads(r.content)
 
@@ -2311,7 +2296,7 @@ class HomesAPI:
             **kwargs
         )
 
-        r = send_request(req)
+        r = send_request(req, self.pool.client)
 
         data = orjson.loads(r.content)
 
@@ -2686,6 +2671,20 @@ class HomesAPI:
             return req
 
 
+        @staticmethod
+        def getplacards_chunks(listing_keys:list[str], chunk_size:int=HM_PLACARD_CHUNK_SIZE) -> list[httpx.Request]:
+            """
+            'getplacards' split into requests of at most 'chunk_size' keys, so
+            a dense area isn't hydrated by one huge POST
+            """
+            listing_keys = listing_keys if isinstance(listing_keys, list) else [listing_keys]
+
+            return [
+                HomesAPI.request.getplacards(listing_keys[i:i + chunk_size])
+                for i in range(0, len(listing_keys), chunk_size)
+            ]
+
+
         @staticmethod
         def property_details(property_key:str):
             url = f"https://www.homes.com/routes/res/native/v20/property/detail/{property_key}"
@@ -0,0 +1,257 @@
+import math
+from array import array
+from typing import Any
+from typing import Iterable
+
+from ._models import Listing
+
+
+# Numeric columns, float64 with NaN for missing values
+NUMERIC_COLUMNS = ("price", "num_beds", "num_baths", "lat", "lon")
+# Low-cardinality strings, dictionary-encoded (int32 codes, -1 for missing)
+CATEGORICAL_COLUMNS = ("city", "state", "postal_code", "country_code", "county", "db_name", "agency_name", "status")
+# Strings that are (mostly) unique per listing
+STRING_COLUMNS = ("street", "agent_name", "db_listing_id", "db_property_id")
+
+COLUMNS = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS + STRING_COLUMNS
+
+
+class ListingBatch:
+    def __init__(
+            self,
+            numeric: dict[str, array],
+            codes: dict[str, array],
+            categories: dict[str, list[str]],
+            strings: dict[str, list[str | None]],
+        ):
+        """
+        Columnar batch of normalized listings
+
+        Holds the flat fields of 'Listing' records column by column instead
+        of one dict per listing: numeric fields are contiguous float64
+        arrays and repeated strings (city, state, db_name, agency, ...) are
+        dictionary-encoded, so a batch costs a fraction of the memory of the
+        equivalent dicts and converts to NumPy / pandas / pyarrow without
+        copying the numeric data. Nested fields (images, mls_info,
+        price_history) stay on the 'Listing' records.
+
+        Build one with 'from_listings' or a provider's
+        'normalize.property_search_batch', and combine pages or providers
+        with 'concat'.
+
+            batch = ListingBatch.concat([
+                Redfin.normalize.property_search_batch(redfin_data),
+                Realtor.normalize.property_search_batch(realtor_data),
+            ])
+            df = batch.to_pandas()
+
+        Parameters
+        ----------
+        numeric: dict[str, array]
+            'array("d")' per name in NUMERIC_COLUMNS
+
+        codes: dict[str, array]
+            'array("i")' of indices into 'categories' per name in
+            CATEGORICAL_COLUMNS
+
+        categories: dict[str, list[str]]
+            Distinct values of each categorical column
+
+        strings: dict[str, list[str | None]]
+            List per name in STRING_COLUMNS
+        """
+        self.numeric = numeric
+        self.codes = codes
+        self.categories = categories
+        self.strings = strings
+
+
+    @classmethod
+    def from_listings(cls, listings: Iterable[Listing]) -> "ListingBatch":
+        nan = math.nan
+        numeric = {name: array("d") for name in NUMERIC_COLUMNS}
+        codes = {name: array("i") for name in CATEGORICAL_COLUMNS}
+        strings = {name: [] for name in STRING_COLUMNS}
+        lookup = {name: {} for name in CATEGORICAL_COLUMNS}
+
+        # Bound methods and per-column state, hoisted out of the loop
+        price, beds, baths, lat, lon = (numeric[name].append for name in NUMERIC_COLUMNS)
+        encoders = [(codes[name].append, lookup[name]) for name in CATEGORICAL_COLUMNS]
+        street, agent, listing_id, property_id = (strings[name].append for name in STRING_COLUMNS)
+
+        for listing in listings:
+            address = listing.address
+
+            price(nan if listing.price == None else listing.price)
+            beds(nan if listing.num_beds == None else listing.num_beds)
+            baths(nan if listing.num_baths == None else listing.num_baths)
+            lat(nan if address.lat == None else address.lat)
+            lon(nan if address.lon == None else address.lon)
+
+            values = (
+                address.city,
+                address.state,
+                address.postal_code,
+                address.country_code,
+                address.county,
+                listing.db_name,
+                listing.agency_name,
+                listing.status,
+            )
+            for (append, index), value in zip(encoders, values):
+                if value == None:
+                    append(-1)
+                else:
+                    code = index.get(value)
+                    if code == None:
+                        code = index[value] = len(index)
+                    append(code)
+
+            street(address.street)
+            agent(listing.agent_name)
+            listing_id(None if listing.db_listing_id == None else str(listing.db_listing_id))
+            property_id(None if listing.db_property_id == None else str(listing.db_property_id))
+
+        # dicts keep insertion order, which is code order
+        categories = {name: list(index) for name, index in lookup.items()}
+        return cls(numeric, codes, categories, strings)
+
+
+    @classmethod
+    def concat(cls, batches: Iterable["ListingBatch"]) -> "ListingBatch":
+        """
+        Concatenate batches, e.g. pages of one search or several providers.
+        Categorical dictionaries are merged and codes remapped
+        """
+        batches = list(batches)
+        numeric = {name: array("d") for name in NUMERIC_COLUMNS}
+        codes = {name: array("i") for name in CATEGORICAL_COLUMNS}
+        strings = {name: [] for name in STRING_COLUMNS}
+        lookup = {name: {} for name in CATEGORICAL_COLUMNS}
+
+        for batch in batches:
+            for name in NUMERIC_COLUMNS:
+                numeric[name].extend(batch.numeric[name])
+
+            for name in CATEGORICAL_COLUMNS:
+                index = lookup[name]
+                remap = [index.setdefault(value, len(index)) for value in batch.categories[name]]
+                if remap == list(range(len(remap))):
+                    # Same dictionary prefix, codes carry over unchanged
+                    codes[name].extend(batch.codes[name])
+                else:
+                    codes[name].extend([-1 if code < 0 else remap[code] for code in batch.codes[name]])
+
+            for name in STRING_COLUMNS:
+                strings[name].extend(batch.strings[name])
+
+        categories = {name: list(index) for name, index in lookup.items()}
+        return cls(numeric, codes, categories, strings)
+
+
+    def __len__(self) -> int:
+        return len(self.numeric["price"])
+
+
+    def __getitem__(self, name: str) -> list:
+        """
+        Column 'name' as a list of Python values (None for missing)
+        """
+        if name in self.numeric:
+            return [None if math.isnan(x) else x for x in self.numeric[name]]
+        if name in self.codes:
+            values = self.categories[name]
+            return [None if code < 0 else values[code] for code in self.codes[name]]
+        return list(self.strings[name])
+
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate size of the column data in bytes (string objects counted
+        once per distinct categorical value)
+        """
+        import sys
+
+        size = sum(col.itemsize * len(col) for col in self.numeric.values())
+        size += sum(col.itemsize * len(col) for col in self.codes.values())
+        size += sum(sys.getsizeof(v) for values in self.categories.values() for v in values)
+        for col in self.strings.values():
+            size += sys.getsizeof(col) + sum(sys.getsizeof(v) for v in col if v != None)
+        return size
+
+
+    def take(self, indices: Iterable[int]) -> "ListingBatch":
+        """
+        Rows at 'indices', in that order. Sorting and filtering go through
+        here, e.g. with the arrays from 'to_numpy':
+
+            cols = batch.to_numpy()
+            batch.take(np.argsort(cols["price"]))
+            batch.take(np.flatnonzero(cols["num_beds"] >= 3))
+        """
+        indices = [int(i) for i in indices]
+        numeric = {name: array("d", [col[i] for i in indices]) for name, col in self.numeric.items()}
+        codes = {name: array("i", [col[i] for i in indices]) for name, col in self.codes.items()}
+        strings = {name: [col[i] for i in indices] for name, col in self.strings.items()}
+        return ListingBatch(numeric, codes, dict(self.categories), strings)
+
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Dict of NumPy arrays. Numeric columns are zero-copy float64 views of
+        the batch; categorical and string columns are object arrays
+        """
+        import numpy as np
+
+        columns = {}
+        for name, col in self.numeric.items():
+            columns[name] = np.frombuffer(col, dtype=np.float64)
+        for name, col in self.codes.items():
+            # Code -1 indexes the trailing None
+            values = np.array(self.categories[name] + [None], dtype=object)
+            columns[name] = values[np.frombuffer(col, dtype=np.int32)]
+        for name, col in self.strings.items():
+            columns[name] = np.array(col, dtype=object)
+        return columns
+
+
+    def to_pandas(self):
+        """
+        pandas DataFrame. Numeric columns wrap the batch's buffers and
+        categorical columns become 'pd.Categorical' over the same codes
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns = {}
+        for name, col in self.numeric.items():
+            columns[name] = np.frombuffer(col, dtype=np.float64)
+        for name, col in self.codes.items():
+            columns[name] = pd.Categorical.from_codes(np.frombuffer(col, dtype=np.int32), categories=self.categories[name])
+        for name, col in self.strings.items():
+            columns[name] = col
+        return pd.DataFrame(columns, copy=False)
+
+
+    def to_arrow(self):
+        """
+        pyarrow Table. Numeric columns reuse the batch's buffers (NaN is
+        masked to null) and categorical columns become dictionary arrays
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        columns = {}
+        for name, col in self.numeric.items():
+            values = np.frombuffer(col, dtype=np.float64)
+            columns[name] = pa.array(values, mask=np.isnan(values))
+        for name, col in self.codes.items():
+            indices = np.frombuffer(col, dtype=np.int32)
+            columns[name] = pa.DictionaryArray.from_arrays(
+                pa.array(indices, mask=indices < 0),
+                pa.array(self.categories[name], type=pa.string()),
+            )
+        for name, col in self.strings.items():
+            columns[name] = pa.array(col, type=pa.string())
+        return pa.table(columns)
@@ -0,0 +1,346 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+import orjson
+from httpx import Request
+from httpx import Response
+from httpx import BaseTransport, AsyncBaseTransport
+
+from .paths import CACHE_DIR
+from ._http import request_fingerprint
+from ._http import _storable_headers
+
+
+# Seconds a response stays fresh, keyed by "<host><path>" prefix. The
+# longest matching prefix wins; 0 disables caching for that endpoint
+DEFAULT_TTLS = {
+    "www.redfin.com/stingray/api/gis": 600,
+    "www.redfin.com/stingray/do/query-location": 86400,
+    "www.redfin.com/stingray/api/home/details": 3600,
+    "www.zillow.com/async-create-search-page-state": 600,
+    "www.zillow.com/zg-graph": 86400,
+    "zm.zillow.com/api/public/v2/mobile-search/homes/search": 600,
+    "zm.zillow.com/api/public/v3/mobile-search/homes/lookup": 3600,
+    "www.realtor.com/api/v1/rdc_search_srp": 600,
+    "www.realtor.com/frontdoor/graphql": 3600,
+    "www.homes.com/routes/res/consumer/property/autocomplete": 86400,
+    "www.homes.com/routes/res/native/v20/property/getpins": 600,
+    "www.homes.com/routes/res/native/v20/property/getplacardsbylisting": 600,
+}
+
+class ResponseCache:
+    def __init__(
+            self,
+            path: str | Path | None = None,
+            ttls: dict[str, float] | None = None,
+            default_ttl: float = 300,
+            max_bytes: int = 256 * 1024 * 1024,
+            memory_items: int = 256,
+            methods: tuple[str] = ("GET", "POST", "PUT"),
+        ):
+        """
+        On-disk (SQLite) cache of provider responses
+
+        Entries are keyed by 'request_fingerprint', so repeat searches with
+        the same method, URL, params and JSON payload are served locally.
+        Stale entries carrying an ETag or Last-Modified are revalidated with
+        a conditional request instead of being re-downloaded. A small
+        in-memory LRU sits in front of the database for the hottest keys.
+
+        Plug it into a pool to enable it for every provider using that pool:
+
+            pool = ClientPool(cache=ResponseCache())
+            Redfin(pool=pool).query_search("Naperville, IL")
+
+        Parameters
+        ----------
+        path: str | Path | None
+            SQLite file. Defaults to ~/.cache/domus/http.sqlite
+
+        ttls: dict[str, float] | None
+            Freshness per endpoint, keyed by "<host><path>" prefix. Merged
+            over 'DEFAULT_TTLS'
+
+        default_ttl: float
+            Freshness for endpoints not matched by 'ttls'
+
+        max_bytes: int
+            Size bound of the stored bodies. Least recently used entries are
+            evicted past it
+
+        memory_items: int
+            Number of entries kept decoded in memory
+
+        methods: tuple[str]
+            HTTP methods that are cached. Provider searches use PUT/POST for
+            reads, so those are included by default
+
+        Requests flagged with the "stream" extension (the 'iter_*' search
+        methods) bypass the cache, like they bypass 'SingleFlight'.
+        """
+        if path == None:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = CACHE_DIR.joinpath("http.sqlite")
+
+        self.path = Path(path)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.methods = {m.upper() for m in methods}
+
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+        self._ttl_prefixes = sorted(self.ttls, key=len, reverse=True)
+        self._memory: OrderedDict[str, tuple] = OrderedDict()
+        # key -> time of the last memory hit, not yet written to 'accessed'
+        self._touched: dict[str, float] = {}
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER,
+                headers BLOB,
+                content BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                expires REAL,
+                accessed REAL,
+                size INTEGER
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+        # Running size of the stored bodies, so eviction doesn't sum the table
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+    def ttl_for(self, req: Request) -> float:
+        target = f"{req.url.host}{req.url.path}"
+        for prefix in self._ttl_prefixes:
+            if target.startswith(prefix):
+                return self.ttls[prefix]
+        return self.default_ttl
+
+
+    def is_cacheable(self, req: Request) -> bool:
+        return req.method in self.methods and not req.extensions.get("stream") and self.ttl_for(req) > 0
+
+
+    def lookup(self, key: str):
+        """
+        Returns (status, headers, content, etag, last_modified, expires) or None
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry != None:
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+                if len(self._touched) >= self.memory_items:
+                    self._flush_touched()
+                return entry
+
+            row = self._db.execute(
+                "SELECT status, headers, content, etag, last_modified, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row == None:
+                return None
+
+            entry = (row[0], orjson.loads(row[1]), row[2], row[3], row[4], row[5])
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._remember(key, entry)
+            return entry
+
+
+    def store(self, key: str, r: Response, ttl: float):
+        headers = _storable_headers(r)
+        content = r.content
+        now = time.time()
+        entry = (r.status_code, headers, content, r.headers.get("etag"), r.headers.get("last-modified"), now + ttl)
+
+        with self._lock:
+            row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row != None:
+                self._bytes -= row[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry[0], orjson.dumps(headers), content, entry[3], entry[4], entry[5], now, len(content)),
+            )
+            self._bytes += len(content)
+            self._touched.pop(key, None)
+            self._remember(key, entry)
+            self.stats["stores"] += 1
+            self._evict()
+
+
+    def refresh(self, key: str, entry: tuple, ttl: float) -> tuple:
+        """
+        Mark a revalidated (304) entry fresh again
+        """
+        entry = entry[:5] + (time.time() + ttl,)
+        with self._lock:
+            self._db.execute("UPDATE responses SET expires = ?, accessed = ? WHERE key = ?", (entry[5], time.time(), key))
+            self._touched.pop(key, None)
+            self._remember(key, entry)
+        return entry
+
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute("DELETE FROM responses")
+            self._bytes = 0
+
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+
+    def _flush_touched(self):
+        """
+        Write the access times of memory hits to the table, so eviction
+        (least recently accessed first) sees keys served from memory as hot
+        """
+        if self._touched:
+            self._db.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+
+        self._flush_touched()
+
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+            self.stats["evictions"] += 1
+            self._bytes -= size
+            if self._bytes <= self.max_bytes:
+                break
+
+
+    def wrap(self, transport: BaseTransport) -> BaseTransport:
+        return CacheTransport(self, transport)
+
+
+    def wrap_async(self, transport: AsyncBaseTransport) -> AsyncBaseTransport:
+        return AsyncCacheTransport(self, transport)
+
+
+    # Shared by both transports: everything but the actual network call
+
+    def _prepare(self, req: Request):
+        """
+        Returns (key, ttl, entry, request_to_send, fresh_response). The
+        caller's request is left as it is; conditional headers go on a copy
+        """
+        key = request_fingerprint(req)
+        ttl = self.ttl_for(req)
+        entry = self.lookup(key)
+
+        if entry != None and entry[5] > time.time():
+            self._count("hits")
+            return key, ttl, entry, req, _build_response(req, entry)
+
+        if entry != None and (entry[3] or entry[4]):
+            # Stale: revalidate when the server gave us a validator
+            headers = req.headers.copy()
+            if entry[3]:
+                headers["if-none-match"] = entry[3]
+            if entry[4]:
+                headers["if-modified-since"] = entry[4]
+            req = Request(req.method, req.url, headers=headers, stream=req.stream, extensions=req.extensions)
+
+        return key, ttl, entry, req, None
+
+
+    def _finish(self, req: Request, key: str, ttl: float, entry: tuple | None, r: Response) -> Response:
+        if r.status_code == 304 and entry != None:
+            self._count("revalidated")
+            return _build_response(req, self.refresh(key, entry, ttl))
+
+        self._count("misses")
+
+        if r.status_code == 200 and "no-store" not in r.headers.get("cache-control", ""):
+            self.store(key, r, ttl)
+
+        return _build_response(req, (r.status_code, _storable_headers(r), r.content), from_cache=False)
+
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+
+class CacheTransport(BaseTransport):
+    def __init__(self, cache: ResponseCache, transport: BaseTransport):
+        self.cache = cache
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        if not self.cache.is_cacheable(request):
+            return self.transport.handle_request(request)
+
+        key, ttl, entry, send, cached = self.cache._prepare(request)
+        if cached != None:
+            return cached
+
+        r = self.transport.handle_request(send)
+        r.read()
+        r.close()
+        return self.cache._finish(request, key, ttl, entry, r)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCacheTransport(AsyncBaseTransport):
+    def __init__(self, cache: ResponseCache, transport: AsyncBaseTransport):
+        self.cache = cache
+        self.transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if not self.cache.is_cacheable(request):
+            return await self.transport.handle_async_request(request)
+
+        key, ttl, entry, send, cached = self.cache._prepare(request)
+        if cached != None:
+            return cached
+
+        r = await self.transport.handle_async_request(send)
+        await r.aread()
+        await r.aclose()
+        return self.cache._finish(request, key, ttl, entry, r)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def _build_response(req: Request, entry: tuple, from_cache: bool = True) -> Response:
+    return Response(entry[0], headers=entry[1], content=entry[2], request=req, extensions={"from_cache": from_cache})
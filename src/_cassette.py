@@ -0,0 +1,353 @@
+import time
+import base64
+import random
+import asyncio
+import threading
+from typing import Literal
+from pathlib import Path
+
+import orjson
+from httpx import Request
+from httpx import Response
+from httpx import BaseTransport, AsyncBaseTransport
+
+from .paths import ROOT_DIR
+from ._http import request_fingerprint
+from ._http import _storable_headers
+
+
+class Cassette:
+    def __init__(
+            self,
+            path: str | Path | None = None,
+            mode: Literal["replay", "record", "auto"] = "replay",
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            seed: int = 0,
+            match_routes: bool = True,
+        ):
+        """
+        Record provider traffic once and replay it offline
+
+        Interactions are keyed by 'request_fingerprint', so a replayed call
+        gets back exactly the status, headers and body recorded for it.
+        When no exact match exists, the most recent response recorded for
+        the same route (method, host, path and GraphQL operation name) is
+        used instead, so a cassette seeded with one search answers any
+        search against that endpoint.
+
+            cassette = Cassette.from_fixtures(latency=0.05)
+            redfin = Redfin(pool=ClientPool(cassette=cassette))
+            redfin.query_search("Naperville, IL")    # no network
+
+        Parameters
+        ----------
+        path: str | Path | None
+            JSON file the cassette is loaded from (if it exists) and saved to
+
+        mode: "replay" | "record" | "auto"
+            "replay" never touches the network and raises LookupError on a
+            miss. "record" always sends and stores the response. "auto"
+            replays what it has and records the rest
+
+        latency: float
+            Seconds slept before each replayed response, to simulate the
+            network
+
+        jitter: float
+            Extra random delay in [0, jitter) added to 'latency'. Drawn from
+            a generator seeded with 'seed', so runs are repeatable
+
+        seed: int
+            Seed of the jitter generator
+
+        match_routes: bool
+            Fall back to a route-level match when there's no exact one
+        """
+        self.path = Path(path) if path != None else None
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.match_routes = match_routes
+
+        self.interactions: dict[str, dict] = {}
+        self.routes: dict[str, str] = {}
+        self.stats = {"replayed": 0, "route_matched": 0, "recorded": 0}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        if self.path != None and self.path.exists():
+            self.load(self.path)
+
+
+    @classmethod
+    def from_fixtures(cls, root: str | Path | None = None, **kwargs) -> "Cassette":
+        """
+        Replay cassette seeded from the committed search_response-*.json files
+
+        The fixtures only hold the listing arrays, so each one is wrapped in
+        its provider's response envelope, and the lookup hops that precede
+        a search (region / autocomplete / pins) are synthesized from the
+        listings themselves. Every provider's 'query_search' then runs end
+        to end offline, whatever the query.
+        """
+        from ._redfin import Redfin
+        from ._zillow import Zillow
+        from ._realtor import Realtor
+        from ._api import HomesAPI
+
+        root = Path(root) if root != None else ROOT_DIR
+        cassette = cls(**kwargs)
+
+        def _fixture(name: str) -> list[dict]:
+            return orjson.loads(root.joinpath(f"search_response-{name}.json").read_bytes())
+
+        # Redfin: query-location -> gis
+        homes = _fixture("redfin")
+        city, state = homes[0].get("city"), homes[0].get("state")
+        cassette.add(
+            Redfin.request.query_region(f"{city}, {state}"),
+            b"{}&&" + orjson.dumps({
+                "regions": [{
+                    "id": {"tableId": 0, "type": 6},
+                    "name": city,
+                    "cleanedName": city,
+                    "url": f"/city/0/{state}/{city}",
+                    "polygon": "",
+                }]
+            }),
+        )
+        cassette.add(
+            Redfin.request.search_by_region_id(0, 6),
+            b"{}&&" + orjson.dumps({"resultCode": 0, "errorMessage": "Success", "payload": {"homes": homes}}),
+        )
+
+        # Zillow: query understanding -> search page state
+        listings = _fixture("zillow")
+        lats = [x["latLong"]["latitude"] for x in listings if x.get("latLong")]
+        lons = [x["latLong"]["longitude"] for x in listings if x.get("latLong")]
+        mbr = [(min(lons), min(lats)), (max(lons), min(lats)), (max(lons), max(lats)), (min(lons), max(lats)), (min(lons), min(lats))]
+        cassette.add(
+            Zillow.request.query_understanding(listings[0].get("addressCity", "")),
+            orjson.dumps({
+                "data": {
+                    "zgsQueryUnderstandingRequest": {
+                        "results": [{
+                            "id": "0",
+                            "type": "Region",
+                            "subType": "CITY",
+                            "regionId": 0,
+                            "region": {
+                                "geometryType": "POLYGON",
+                                "mbr": "POLYGON((" + ", ".join(f"{lon} {lat}" for lon, lat in mbr) + "))",
+                            },
+                        }]
+                    }
+                }
+            }),
+        )
+        cassette.add(
+            Zillow.request.region_lookup(0, "CITY", coordinates=mbr),
+            orjson.dumps({"cat1": {"searchResults": {"listResults": listings, "mapResults": []}}}),
+        )
+
+        # Realtor: a single search call
+        properties = _fixture("realtor")
+        cassette.add(
+            Realtor.request.query_search(""),
+            orjson.dumps({"data": {"home_search": {"count": len(properties), "total": len(properties), "properties": properties}}}),
+        )
+
+        # Homes: autocomplete -> pins -> placards
+        placards = _fixture("homes")
+        cassette.add(
+            HomesAPI.request.autocomplete(""),
+            orjson.dumps({"suggestions": {"places": [{"d": placards[0].get("generalLocation"), "s": "City", "g": {}}]}}),
+        )
+        cassette.add(
+            HomesAPI.request.getpins({}),
+            orjson.dumps({"pins": [{"lk": {"key": p["listingKey"]["key"]}} for p in placards]}),
+        )
+        start = 0
+        for req in HomesAPI.request.getplacards_chunks([p["listingKey"]["key"] for p in placards]):
+            end = start + len(orjson.loads(req.content)["listingKeys"])
+            cassette.add(req, orjson.dumps({"placards": placards[start:end]}))
+            start = end
+
+        return cassette
+
+
+    def add(self, req: Request, content: bytes, status_code: int = 200, headers: list[tuple[str, str]] | None = None) -> dict:
+        """
+        Register a response for 'req' (and its route)
+        """
+        if headers == None:
+            headers = [("content-type", "application/json")]
+
+        key = request_fingerprint(req)
+        route = _route_key(req)
+        with self._lock:
+            self.interactions[key] = {
+                "fingerprint": key,
+                "route": route,
+                "method": req.method,
+                "url": str(req.url),
+                "status_code": status_code,
+                "headers": headers,
+                "content": content,
+            }
+            self.routes[route] = key
+            return self.interactions[key]
+
+
+    def match(self, req: Request) -> dict | None:
+        interaction = self.interactions.get(request_fingerprint(req))
+        if interaction != None:
+            self.stats["replayed"] += 1
+            return interaction
+
+        if self.match_routes:
+            key = self.routes.get(_route_key(req))
+            if key != None:
+                self.stats["route_matched"] += 1
+                return self.interactions[key]
+
+        return None
+
+
+    def record(self, req: Request, r: Response) -> dict:
+        self.stats["recorded"] += 1
+        return self.add(req, r.content, r.status_code, _storable_headers(r))
+
+
+    def delay(self) -> float:
+        if self.jitter:
+            with self._lock:
+                return self.latency + self._random.random() * self.jitter
+        return self.latency
+
+
+    def load(self, path: str | Path):
+        data = orjson.loads(Path(path).read_bytes())
+        for interaction in data["interactions"]:
+            if interaction.pop("base64", False):
+                interaction["content"] = base64.b64decode(interaction["content"])
+            else:
+                interaction["content"] = interaction["content"].encode()
+            interaction["headers"] = [tuple(h) for h in interaction["headers"]]
+            self.interactions[interaction["fingerprint"]] = interaction
+            self.routes[interaction["route"]] = interaction["fingerprint"]
+
+
+    def save(self, path: str | Path | None = None):
+        path = Path(path) if path != None else self.path
+        if path == None:
+            raise ValueError("cassette has no path to save to")
+
+        interactions = []
+        with self._lock:
+            for interaction in self.interactions.values():
+                interaction = dict(interaction)
+                try:
+                    interaction["content"] = interaction["content"].decode()
+                except UnicodeDecodeError:
+                    interaction["content"] = base64.b64encode(interaction["content"]).decode()
+                    interaction["base64"] = True
+                interactions.append(interaction)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps({"interactions": interactions}, option=orjson.OPT_INDENT_2))
+
+
+    def wrap(self, transport: BaseTransport) -> BaseTransport:
+        return CassetteTransport(self, transport)
+
+
+    def wrap_async(self, transport: AsyncBaseTransport) -> AsyncBaseTransport:
+        return AsyncCassetteTransport(self, transport)
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.mode != "replay" and self.path != None:
+            self.save()
+
+
+class CassetteTransport(BaseTransport):
+    def __init__(self, cassette: Cassette, transport: BaseTransport):
+        self.cassette = cassette
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        if self.cassette.mode != "record":
+            interaction = self.cassette.match(request)
+            if interaction != None:
+                delay = self.cassette.delay()
+                if delay > 0:
+                    time.sleep(delay)
+                return _replay(request, interaction)
+            if self.cassette.mode == "replay":
+                raise LookupError(f"no recorded response for {request.method} {request.url}")
+
+        r = self.transport.handle_request(request)
+        r.read()
+        r.close()
+        return _replay(request, self.cassette.record(request, r))
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCassetteTransport(AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, transport: AsyncBaseTransport):
+        self.cassette = cassette
+        self.transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if self.cassette.mode != "record":
+            interaction = self.cassette.match(request)
+            if interaction != None:
+                delay = self.cassette.delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                return _replay(request, interaction)
+            if self.cassette.mode == "replay":
+                raise LookupError(f"no recorded response for {request.method} {request.url}")
+
+        r = await self.transport.handle_async_request(request)
+        await r.aread()
+        await r.aclose()
+        return _replay(request, self.cassette.record(request, r))
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def _route_key(req: Request) -> str:
+    """
+    "METHOD host/path", plus the GraphQL operation name for JSON bodies
+    that carry one (several operations share one graphql endpoint)
+    """
+    route = f"{req.method} {req.url.host}{req.url.path}"
+    body = req.read()
+    if body[:1] == b"{":
+        try:
+            operation = orjson.loads(body).get("operationName")
+        except orjson.JSONDecodeError:
+            operation = None
+        if operation:
+            route += f"#{operation}"
+    return route
+
+
+def _replay(req: Request, interaction: dict) -> Response:
+    return Response(
+        interaction["status_code"],
+        headers=interaction["headers"],
+        content=interaction["content"],
+        request=req,
+        extensions={"cassette": True},
+    )
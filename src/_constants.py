@@ -266,3 +266,8 @@ HM_TOUR_TYPE = {
     "3d_virtual": 2,
     "video": 4,
 }
+
+# Listing keys per getplacardsbylisting request. Smaller chunks start
+# streaming sooner and spread over more connections; larger ones pay the
+# per-request overhead fewer times (see benchmarks/bench_placards.py)
+HM_PLACARD_CHUNK_SIZE = 100
@@ -0,0 +1,445 @@
+import asyncio
+from pathlib import Path
+from dataclasses import dataclass
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import AsyncIterator
+
+import orjson
+from httpx import Request
+from httpx import Response
+
+from .paths import CACHE_DIR
+from ._http import ClientPool
+from ._http import get_pool
+from ._http import get_background_loop
+from ._http import _iter_on_loop
+from ._paginate import listing_key
+from ._jobs import Job
+
+
+# Area crawling past provider result caps
+#
+# A map search over a whole metro area comes back truncated (Redfin's gis
+# stops at 'num_homes', Zillow's map at 500 pins). The crawler covers the
+# area with a quadtree instead: every tile whose search reaches the cap is
+# split into four and its quadrants are searched, until each tile holds
+# fewer results than the cap. Tiles run concurrently and the results are
+# merged and deduped by listing id. A tile that fails is recorded and
+# skipped rather than ending the crawl. Tiles seen at the cap are
+# remembered in a 'DensityMap' (per provider and search filters), so the
+# next crawl of the area splits them straight away instead of probing them
+# first.
+
+
+@dataclass(frozen=True, slots=True)
+class Tile:
+    north: float
+    south: float
+    east: float
+    west: float
+
+    @classmethod
+    def from_bounds(cls, bounds: dict) -> "Tile":
+        """
+        Tile of a bounding box as returned by 'get_bounding_box'
+        """
+        return cls(bounds["north"], bounds["south"], bounds["east"], bounds["west"])
+
+
+    @classmethod
+    def around(cls, polygon: list[tuple[float, float]]) -> "Tile":
+        """
+        Bounding tile of a (lat, lon) polygon
+        """
+        lats = [point[0] for point in polygon]
+        lons = [point[1] for point in polygon]
+        return cls(max(lats), min(lats), max(lons), min(lons))
+
+
+    @property
+    def key(self) -> str:
+        return f"{self.north:.6f},{self.south:.6f},{self.east:.6f},{self.west:.6f}"
+
+
+    def bounds(self) -> dict:
+        return {"north": self.north, "south": self.south, "east": self.east, "west": self.west}
+
+
+    def polygon(self) -> list[tuple[float, float]]:
+        """
+        Closed (lat, lon) ring of the tile, as taken by the polygon request builders
+        """
+        return [
+            (self.north, self.west),
+            (self.north, self.east),
+            (self.south, self.east),
+            (self.south, self.west),
+            (self.north, self.west),
+        ]
+
+
+    def quadrants(self) -> tuple["Tile", "Tile", "Tile", "Tile"]:
+        lat = (self.north + self.south) / 2
+        lon = (self.east + self.west) / 2
+        return (
+            Tile(self.north, lat, lon, self.west),
+            Tile(self.north, lat, self.east, lon),
+            Tile(lat, self.south, lon, self.west),
+            Tile(lat, self.south, self.east, lon),
+        )
+
+
+    def contains(self, lat: float, lon: float) -> bool:
+        return self.south <= lat <= self.north and self.west <= lon <= self.east
+
+
+    def intersects(self, polygon: list[tuple[float, float]]) -> bool:
+        """
+        Whether any part of the tile lies in the (lat, lon) polygon
+        """
+        if any(self.contains(lat, lon) for lat, lon in polygon):
+            return True
+        corners = self.polygon()
+        if any(point_in_polygon(lat, lon, polygon) for lat, lon in corners[:4]):
+            return True
+        edges = list(zip(corners, corners[1:]))
+        return any(
+            _segments_cross(a, b, c, d)
+            for a, b in zip(polygon, polygon[1:] + polygon[:1])
+            for c, d in edges
+        )
+
+
+def point_in_polygon(lat: float, lon: float, polygon: list[tuple[float, float]]) -> bool:
+    """
+    Ray casting test of a point against a (lat, lon) polygon
+    """
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            if lon < (lon_j - lon_i) * (lat - lat_i) / (lat_j - lat_i) + lon_i:
+                inside = not inside
+        j = i
+    return inside
+
+
+def _segments_cross(a, b, c, d) -> bool:
+    def orientation(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+    return (
+        (orientation(a, b, c) > 0) != (orientation(a, b, d) > 0)
+        and (orientation(c, d, a) > 0) != (orientation(c, d, b) > 0)
+    )
+
+
+class DensityMap:
+    def __init__(self, path: str | Path | None = None):
+        """
+        Result counts of crawled tiles, persisted between runs
+
+        Parameters
+        ----------
+        path: str | Path | None
+            JSON file. Defaults to ~/.cache/domus/density.json
+        """
+        self.path = Path(path) if path != None else CACHE_DIR.joinpath("density.json")
+        self.counts: dict[str, int] = {}
+        if self.path.exists():
+            self.counts = orjson.loads(self.path.read_bytes())
+
+
+    def record(self, name: str, tile: Tile, count: int):
+        self.counts[f"{name}:{tile.key}"] = count
+
+
+    def count(self, name: str, tile: Tile) -> int | None:
+        return self.counts.get(f"{name}:{tile.key}")
+
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(orjson.dumps(self.counts))
+
+
+class AreaCrawler:
+    def __init__(
+            self,
+            name: str,
+            tile_request: Callable[[Tile], Request],
+            read_tile: Callable[[Response], tuple[list[dict], int | None]],
+            cap: int,
+            pool: ClientPool | None = None,
+            density: DensityMap | None = None,
+            max_depth: int = 8,
+            max_in_flight: int = 8,
+            filters: dict[str, Any] | None = None,
+            on_error: Callable[[Tile, BaseException], None] | None = None,
+        ):
+        """
+        Quadtree crawler of a provider's map search
+
+        Parameters
+        ----------
+        name: str
+            Provider the density map entries are recorded under
+
+        tile_request: Callable[[Tile], Request]
+            Builds the search request of one tile
+
+        read_tile: Callable[[Response], tuple[list[dict], int | None]]
+            Normalizes a tile response into (listings, total matches). The
+            total is None when the provider doesn't report one
+
+        cap: int
+            Most results a single search returns. A tile whose reported
+            total (or, without one, its result count) reaches this is split.
+            Coming back with fewer listings than the total doesn't split a
+            tile on its own: map pins without an id (clusters, buildings)
+            never make it into the listings
+
+        pool: ClientPool | None
+            Pool whose async client sends the tiles. Defaults to the
+            process-wide pool
+
+        density: DensityMap | None
+            Remembered tile counts. Tiles recorded at the cap are split
+            without being requested; the map is updated (and saved) after
+            each crawl
+
+        max_depth: int
+            Deepest split; a tile at this depth is kept even if capped
+
+        max_in_flight: int
+            Upper bound on tiles requested at once
+
+        filters: dict[str, Any] | None
+            Search filters the tiles are requested with. Density map
+            entries are recorded per provider and filters, since a filtered
+            search saturates fewer tiles than an unfiltered one
+
+        on_error: Callable[[Tile, BaseException], None] | None
+            Called with each tile whose request fails. Failed tiles are
+            skipped (along with the area under them) and recorded in
+            'failed' either way
+        """
+        self.name = name
+        self.key = name
+        if filters:
+            self.key += orjson.dumps(filters, option=orjson.OPT_SORT_KEYS, default=str).decode()
+        self.tile_request = tile_request
+        self.read_tile = read_tile
+        self.cap = cap
+        self.pool = pool if pool != None else get_pool()
+        self.density = density
+        self.max_depth = max_depth
+        self.max_in_flight = max_in_flight
+        self.on_error = on_error
+        self.stats = {"requests": 0, "split": 0, "presplit": 0, "failed": 0}
+        # tile key -> "<error type>: <message>" of the tiles that failed
+        self.failed: dict[str, str] = {}
+
+
+    def _saturated(self, count: int | None) -> bool:
+        return count != None and count >= self.cap
+
+
+    async def _fetch(self, tile: Tile) -> tuple[list[dict], int | None]:
+        r = await self.pool.async_client.send(self.tile_request(tile))
+        return self.read_tile(r)
+
+
+    def _count(self, tile: Tile, listings: list[dict], total: int | None) -> int:
+        count = len(listings) if total == None else max(total, len(listings))
+        if self.density != None:
+            self.density.record(self.key, tile, count)
+        return count
+
+
+    def _fail(self, tile: Tile, error: BaseException):
+        self.stats["failed"] += 1
+        self.failed[tile.key] = f"{type(error).__name__}: {error}"
+        if self.on_error != None:
+            self.on_error(tile, error)
+
+
+    @staticmethod
+    def _area(area: dict | list[tuple[float, float]]) -> tuple[Tile, list | None]:
+        if isinstance(area, dict):
+            return Tile.from_bounds(area), None
+        return Tile.around(area), list(area)
+
+
+    @staticmethod
+    def _inside(listing: dict, polygon: list | None) -> bool:
+        if polygon == None:
+            return True
+        lat, lon = listing["address"]["lat"], listing["address"]["lon"]
+        return lat == None or lon == None or point_in_polygon(lat, lon, polygon)
+
+
+    async def apages(self, area: dict | list[tuple[float, float]]) -> AsyncIterator[list[dict]]:
+        """
+        Crawl an area and yield each tile's new listings as it completes.
+        Tiles that fail are skipped and recorded in 'failed'
+
+        Parameters
+        ----------
+        area: dict | list[tuple[float, float]]
+            A bounding box as returned by 'get_bounding_box', or a (lat, lon)
+            polygon. Listings outside a polygon are dropped
+        """
+        root, polygon = self._area(area)
+
+        self.failed = {}
+        seen = set()
+        queue = deque([(root, 0)])
+        pending: dict[asyncio.Task, tuple[Tile, int]] = {}
+
+        try:
+            while queue or pending:
+                while queue and len(pending) < self.max_in_flight:
+                    tile, depth = queue.popleft()
+                    if polygon != None and not tile.intersects(polygon):
+                        continue
+                    if depth < self.max_depth and self.density != None and self._saturated(self.density.count(self.key, tile)):
+                        self.stats["presplit"] += 1
+                        queue.extend((quadrant, depth + 1) for quadrant in tile.quadrants())
+                        continue
+                    self.stats["requests"] += 1
+                    pending[asyncio.create_task(self._fetch(tile))] = (tile, depth)
+
+                if not pending:
+                    continue
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tile, depth = pending.pop(task)
+                    error = task.exception()
+                    if error != None:
+                        self._fail(tile, error)
+                        continue
+                    listings, total = task.result()
+
+                    if self._saturated(self._count(tile, listings, total)) and depth < self.max_depth:
+                        self.stats["split"] += 1
+                        queue.extend((quadrant, depth + 1) for quadrant in tile.quadrants())
+
+                    new = []
+                    for listing in listings:
+                        if not self._inside(listing, polygon):
+                            continue
+                        key = listing_key(listing)
+                        if key != None:
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                        new.append(listing)
+                    yield new
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if self.density != None:
+            self.density.save()
+
+
+    async def acrawl(self, area: dict | list[tuple[float, float]]) -> AsyncIterator[dict]:
+        """
+        'apages', one listing at a time
+        """
+        async for listings in self.apages(area):
+            for listing in listings:
+                yield listing
+
+
+    async def arun_job(self, area: dict | list[tuple[float, float]], job: Job, kind: str = "tiles", **kwargs) -> list[dict]:
+        """
+        'acrawl' checkpointed in a 'Job': every tile is a unit of the job and
+        a saturated tile plans its quadrants as new units, so an interrupted
+        crawl resumes with the tiles it hadn't finished. Tiles aren't
+        pre-split from the density map (the journal already holds the
+        splits), but their counts are still recorded in it
+
+        Parameters
+        ----------
+        job: Job
+            Journal of the crawl
+
+        kind: str
+            Kind the tiles are planned under
+
+        **kwargs
+            Passed to 'Job.arun' (e.g. 'max_failures', 'on_progress')
+
+        Returns the crawled listings, deduped. Raises RuntimeError if any
+        tile failed; the tiles that completed stay journaled
+        """
+        root, polygon = self._area(area)
+        self.failed = {}
+
+        def _unit(tile: Tile, depth: int) -> dict:
+            return {tile.key: {"bounds": tile.bounds(), "depth": depth}}
+
+        async def _tile(unit: dict) -> list[dict]:
+            tile, depth = Tile.from_bounds(unit["bounds"]), unit["depth"]
+            if polygon != None and not tile.intersects(polygon):
+                return []
+
+            self.stats["requests"] += 1
+            try:
+                listings, total = await self._fetch(tile)
+            except Exception as e:
+                self._fail(tile, e)
+                raise
+
+            if self._saturated(self._count(tile, listings, total)) and depth < self.max_depth:
+                self.stats["split"] += 1
+                for quadrant in tile.quadrants():
+                    job.plan(kind, _unit(quadrant, depth + 1))
+
+            return [listing for listing in listings if self._inside(listing, polygon)]
+
+        job.plan(kind, _unit(root, 0))
+        progress = await job.arun(kind, _tile, max_in_flight=self.max_in_flight, **kwargs)
+
+        if self.density != None:
+            self.density.save()
+
+        if progress["failed"]:
+            error = next(iter(job.errors(kind).values()))
+            raise RuntimeError(f"{progress['failed']} tiles of job '{job.name}' failed ({error}); run it again to resume")
+
+        seen = set()
+        listings = []
+        for _, tile_listings in job.results(kind):
+            for listing in tile_listings:
+                key = listing_key(listing)
+                if key != None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                listings.append(listing)
+        return listings
+
+
+    def run_job(self, area: dict | list[tuple[float, float]], job: Job, kind: str = "tiles", **kwargs) -> list[dict]:
+        """
+        Sync counterpart of 'arun_job', run on the shared background loop
+        """
+        return get_background_loop().run(self.arun_job(area, job, kind, **kwargs))
+
+
+    def crawl(self, area: dict | list[tuple[float, float]]) -> Iterator[dict]:
+        """
+        Sync counterpart of 'acrawl', run on the shared background loop
+        """
+        return _iter_on_loop(lambda: self.apages(area), flatten=True)
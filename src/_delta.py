@@ -0,0 +1,191 @@
+import math
+import time
+from pathlib import Path
+from dataclasses import field
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import orjson
+
+from .paths import CACHE_DIR
+from ._paginate import listing_key
+
+
+# Incremental (delta) crawls of a region
+#
+# A 'DeltaStore' keeps, per region, the time of the last crawl (the
+# watermark) and a fingerprint (price + status) per listing id. A delta
+# crawl requests the region newest-first and compares each page against the
+# stored fingerprints; the first page holding nothing added or changed ends
+# the crawl, so a night with a handful of changes costs a page or two
+# instead of the whole region. Removals can only be told apart from "not
+# reached yet" by walking every page, so they're reported by full crawls
+# ('full=True') alone.
+#
+# The stop is only as good as the provider's sort. Zillow sorts by most
+# recent change, so a repriced listing moves to the front. Redfin has no
+# such sort and is crawled newest listing first: a price or status change
+# on a listing older than the stop point isn't seen. Run a full crawl
+# periodically (e.g. weekly) to pick those up along with the removals.
+
+
+def fingerprint(listing: dict) -> str:
+    """
+    What a listing is compared on between crawls
+    """
+    return f"{listing.get('price')}|{listing.get('status')}"
+
+
+def reject_sort(kwargs: dict, *keys: str):
+    """
+    Refuse a sort passed as a search filter: the stop point of a delta
+    crawl depends on the sort it sets itself
+    """
+    for key in keys:
+        if key in kwargs:
+            raise ValueError(f"delta crawls set '{key}' themselves; it can't be passed as a filter")
+
+
+def window_days(watermark: float | None, options: tuple[int, ...]) -> int | None:
+    """
+    Smallest of a provider's "listed within N days" options that covers
+    the time since 'watermark', or None if none does
+    """
+    if watermark == None:
+        return None
+    elapsed = math.ceil((time.time() - watermark) / 86400)
+    for days in sorted(options):
+        if days >= elapsed:
+            return days
+    return None
+
+
+@dataclass(slots=True)
+class Delta:
+    region: str
+    added: list[dict] = field(default_factory=list)
+    changed: list[dict] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    complete: bool = False
+    pages: int = 0
+    since: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "region": self.region,
+            "added": self.added,
+            "changed": self.changed,
+            "removed": self.removed,
+            "complete": self.complete,
+            "pages": self.pages,
+            "since": self.since,
+        }
+
+
+class DeltaStore:
+    def __init__(self, path: str | Path | None = None):
+        """
+        Watermarks and listing fingerprints of crawled regions, persisted
+        between runs
+
+        Parameters
+        ----------
+        path: str | Path | None
+            JSON file. Defaults to ~/.cache/domus/delta.json
+        """
+        self.path = Path(path) if path != None else CACHE_DIR.joinpath("delta.json")
+        self.regions: dict[str, dict] = {}
+        if self.path.exists():
+            self.regions = orjson.loads(self.path.read_bytes())
+
+
+    def watermark(self, region: str) -> float | None:
+        return self.regions.get(region, {}).get("watermark")
+
+
+    def fingerprints(self, region: str) -> dict[str, str]:
+        return self.regions.get(region, {}).get("listings", {})
+
+
+    def update(self, region: str, fingerprints: dict[str, str], watermark: float):
+        self.regions[region] = {"watermark": watermark, "listings": fingerprints}
+
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(orjson.dumps(self.regions))
+
+
+async def adelta(
+        pages: AsyncIterator[list[dict]],
+        store: DeltaStore,
+        region: str,
+        full: bool = False,
+        windowed: bool = False,
+    ) -> Delta:
+    """
+    Compare a newest-first page stream against the region's stored
+    fingerprints
+
+    Parameters
+    ----------
+    pages: AsyncIterator[list[dict]]
+        Normalized listings, a page at a time (e.g. '_paginate.apages')
+
+    store: DeltaStore
+        Fingerprints of the last crawl; updated and saved afterwards
+
+    region: str
+        Key the region is stored under
+
+    full: bool
+        Walk every page instead of stopping at the first unchanged one. Only
+        a full walk reports removals, and changes to listings that sort
+        past the stop point. The first crawl of a region is always full
+
+    windowed: bool
+        The pages were filtered to listings newer than the watermark, so
+        reaching the last page doesn't mean every listing was seen
+    """
+    started = time.time()
+    known = store.fingerprints(region)
+    full = full or not known
+
+    delta = Delta(region, since=store.watermark(region))
+    current = dict(known)
+    seen = set()
+
+    try:
+        async for listings in pages:
+            delta.pages += 1
+            new = False
+            for listing in listings:
+                key = listing_key(listing)
+                if key == None:
+                    continue
+                key = str(key)
+                seen.add(key)
+                value = fingerprint(listing)
+                if key not in known:
+                    delta.added.append(listing)
+                    new = True
+                elif known[key] != value:
+                    delta.changed.append(listing)
+                    new = True
+                current[key] = value
+            if not new and not full:
+                break
+        else:
+            delta.complete = not windowed
+    finally:
+        await pages.aclose()
+
+    if delta.complete:
+        delta.removed = [key for key in known if key not in seen]
+        for key in delta.removed:
+            del current[key]
+
+    store.update(region, current, started)
+    store.save()
+
+    return delta
@@ -0,0 +1,309 @@
+import dataclasses
+from typing import Any
+from typing import Callable
+
+from ._models import Listing
+from ._models import Address
+
+
+class Field:
+    def __init__(self, *paths: str, convert: Callable | None = None, default: Any = None):
+        """
+        Source of one target field in a mapping spec
+
+        Parameters
+        ----------
+        paths: str
+            Dotted key paths into the source record, e.g. "location.address.city".
+            Intermediate values that aren't dicts resolve to {} (like
+            'always_get'), so a missing branch just yields 'default'
+
+        convert: Callable | None
+            Applied to the resolved value(s): 'convert(value)' for one path,
+            'convert(*values)' for several
+
+        default: Any
+            Returned by the last lookup when the key is absent
+        """
+        self.paths = paths
+        self.convert = convert
+        self.default = default
+
+
+class Const:
+    def __init__(self, value: Any):
+        """
+        Constant target field, e.g. Const("Redfin") for 'db_name'
+        """
+        self.value = value
+
+
+# Shared stand-in for missing intermediate dicts; generated code only reads it
+_EMPTY = {}
+
+
+class _Absent:
+    """
+    Stand-in for a None intermediate record: every attribute is None
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        return None
+
+
+_ABSENT = _Absent()
+
+
+def compile_extractor(
+        spec: dict[str, str | Field | Const],
+        factory: Callable = Listing,
+        nested: dict[str, Callable] | None = None,
+        name: str = "listing",
+        attrs: bool = False,
+    ) -> Callable[[dict], Any]:
+    """
+    Compile a declarative field mapping into a specialized extractor
+
+    'spec' maps target fields to their source (a dotted path, a 'Field' or
+    a 'Const'). Targets with a dot, e.g. "address.city", are gathered into
+    the 'nested' factory of their prefix. The result is a generated
+    function in which every intermediate dict along the paths is looked up
+    exactly once and the record is built with a single constructor call,
+    so adding a field costs one '.get' per listing.
+
+        listing = compile_extractor({
+            "price": "list_price",
+            "address.city": "location.address.city",
+            "address.state": "location.address.state",
+            "num_baths": Field("description.baths", convert=float),
+            "db_name": Const("Realtor"),
+        })
+
+    With 'attrs=True' the source is a typed record (e.g. a msgspec Struct
+    from '_schemas') rather than a dict: keys are read as attributes, a
+    None intermediate reads as all-None, and 'Field.default' is left to the
+    record's own defaults.
+
+    The generated source is kept on the function as '_source'.
+    """
+    if nested == None:
+        nested = {"address": Address}
+
+    gen = _Codegen(attrs)
+    gen.namespace["_factory"] = factory
+
+    arguments = []
+    groups: dict[str, list[str]] = {}
+    for target, source in spec.items():
+        prefix, _, field = target.rpartition(".")
+        if prefix:
+            if prefix not in nested:
+                raise ValueError(f"no nested factory for '{target}'")
+            groups.setdefault(prefix, []).append(f"{field}={gen.value(source)}")
+        else:
+            arguments.append(f"{field}={gen.value(source)}")
+
+    for prefix, group in groups.items():
+        gen.namespace[f"_factory_{prefix}"] = nested[prefix]
+        arguments.append(f"{prefix}=_factory_{prefix}({', '.join(group)})")
+
+    extractor = gen.function(name, f"_factory({', '.join(arguments)})")
+    extractor.__doc__ = "Normalize a single listing (generated from a field mapping spec)"
+    return extractor
+
+
+def spec_paths(spec: dict[str, str | Field | Const], prefix: str = "") -> tuple[str, ...]:
+    """
+    Every source path a spec reads, under 'prefix' (e.g. "payload.homes.*"),
+    for 'ResponseDecoder.decode(paths=...)'
+    """
+    paths = set()
+    for source in spec.values():
+        if isinstance(source, str):
+            paths.add(source)
+        elif isinstance(source, Field):
+            paths.update(source.paths)
+    if prefix:
+        paths = {f"{prefix}.{path}" for path in paths}
+    return tuple(sorted(paths))
+
+
+class _LazyField:
+    """
+    Non-data descriptor computing one field from the view's source record,
+    then caching it in the instance dict (which shadows the descriptor)
+    """
+    __slots__ = ("name", "getter")
+
+    def __init__(self, name: str, getter: Callable):
+        self.name = name
+        self.getter = getter
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = view.__dict__[self.name] = self.getter(view._src)
+        return value
+
+
+class LazyView:
+    """
+    Normalized listing computed field by field from a raw provider record
+
+    Built by 'compile_view'. A field is normalized on first access and
+    memoized on the instance, so later reads are plain attribute lookups;
+    fields never read are never computed (e.g. Redfin's photo URL list).
+    'materialize' / 'to_dict' produce the full normalized record.
+    """
+    # Filled in per spec by 'compile_view'
+    _factory: Callable = Listing
+    _fields: tuple[str, ...] = ()
+    _nested: tuple[str, ...] = ()
+
+    def __init__(self, src: dict):
+        self._src = src
+
+
+    def materialize(self):
+        """
+        The full normalized record (what 'compile_extractor' would build)
+        """
+        fields = {name: getattr(self, name) for name in self._fields}
+        for name in self._nested:
+            fields[name] = getattr(self, name).materialize()
+        return self._factory(**fields)
+
+
+    def to_dict(self) -> dict:
+        return self.materialize().to_dict()
+
+
+def compile_view(
+        spec: dict[str, str | Field | Const],
+        factory: type = Listing,
+        nested: dict[str, type] | None = None,
+        name: str = "ListingView",
+    ) -> type[LazyView]:
+    """
+    Compile a field mapping into a 'LazyView' subclass: one generated getter
+    per target field, the same lookups 'compile_extractor' inlines
+
+        view = compile_view(Redfin.normalize.fields)(home)
+        view.price, view.address.city    # photos are never parsed
+    """
+    if nested == None:
+        nested = {"address": Address}
+
+    attributes = {}
+    groups: dict[str, dict] = {}
+    for target, source in spec.items():
+        prefix, _, field = target.rpartition(".")
+        if prefix:
+            if prefix not in nested:
+                raise ValueError(f"no nested factory for '{target}'")
+            groups.setdefault(prefix, {})[field] = source
+        else:
+            gen = _Codegen()
+            attributes[field] = _LazyField(field, gen.function(field, gen.value(source)))
+
+    for prefix, group in groups.items():
+        attributes[prefix] = _LazyField(prefix, compile_view(group, nested[prefix], {}, f"{name}_{prefix}"))
+
+    # Unmapped fields of the record fall back to its defaults
+    for f in dataclasses.fields(factory):
+        if f.name in attributes:
+            continue
+        if f.default_factory is not dataclasses.MISSING:
+            attributes[f.name] = _LazyField(f.name, lambda src, default_factory=f.default_factory: default_factory())
+        else:
+            attributes[f.name] = _LazyField(f.name, lambda src, default=f.default: default)
+
+    return type(name, (LazyView,), {
+        **attributes,
+        "_factory": factory,
+        "_fields": tuple(field for field in attributes if field not in groups),
+        "_nested": tuple(groups),
+    })
+
+
+class _Codegen:
+    """
+    Accumulates the source of one generated function of a record 'src'
+    """
+    def __init__(self, attrs: bool = False):
+        self.attrs = attrs
+        self.namespace = {"_EMPTY": _EMPTY, "_ABSENT": _ABSENT}
+        self.lines = []
+        # Variable holding each resolved intermediate path, "" being the record
+        self.resolved = {"": "src"}
+
+
+    def resolve(self, path: str) -> str:
+        """
+        Emit the lookups for all of 'path' but its last key, and return the
+        variable holding that dict
+        """
+        parent = path.rpartition(".")[0]
+        if parent in self.resolved:
+            return self.resolved[parent]
+
+        var = self.resolve(parent)
+        child = f"_{len(self.resolved)}"
+        key = parent.rpartition(".")[2]
+        if self.attrs:
+            self.lines.append(f"    {child} = {var}.{self.attribute(key)}")
+            self.lines.append(f"    if {child} is None: {child} = _ABSENT")
+        else:
+            self.lines.append(f"    {child} = {var}.get({key!r})")
+            self.lines.append(f"    if {child}.__class__ is not dict: {child} = _EMPTY")
+        self.resolved[parent] = child
+        return child
+
+
+    @staticmethod
+    def attribute(key: str) -> str:
+        if not key.isidentifier():
+            raise ValueError(f"'{key}' can't be read as an attribute")
+        return key
+
+
+    def value(self, source: str | Field | Const) -> str:
+        """
+        Expression for one spec entry
+        """
+        if isinstance(source, str):
+            source = Field(source)
+
+        if isinstance(source, Const):
+            return self.bind("_k", source.value)
+
+        values = []
+        for path in source.paths:
+            var = self.resolve(path)
+            key = path.rpartition(".")[2]
+            if self.attrs:
+                values.append(f"{var}.{self.attribute(key)}")
+            elif source.default == None:
+                values.append(f"{var}.get({key!r})")
+            else:
+                values.append(f"{var}.get({key!r}, {self.bind('_d', source.default)})")
+
+        if source.convert == None:
+            return values[0]
+        return f"{self.bind('_c', source.convert)}({', '.join(values)})"
+
+
+    def bind(self, prefix: str, obj: Any) -> str:
+        name = f"{prefix}{len(self.namespace)}"
+        self.namespace[name] = obj
+        return name
+
+
+    def function(self, name: str, expression: str) -> Callable:
+        source = "\n".join([f"def {name}(src):", *self.lines, f"    return {expression}"])
+        exec(compile(source, f"<fieldmap {name}>", "exec"), self.namespace)
+
+        function = self.namespace[name]
+        function._source = source
+        return function
@@ -6,6 +6,7 @@ from haversine import Unit
 from haversine import Direction
 from haversine import inverse_haversine
 
+from ._http import get_pool
 from ._http import fetch_bulk
 
 
@@ -52,8 +53,7 @@ def search(*,
     if kwargs.get("req_only") == True:
         return req
     
-    with httpx.Client() as client:
-        r = client.send(req)
+    r = get_pool().send(req)
 
     data = orjson.loads(r.content)
 
@@ -85,8 +85,7 @@ def polygon_city(city, state=None, county=None, **kwargs):
     if kwargs.get("req_only") == True:
         return req
 
-    with httpx.Client() as client:
-        r = client.send(req)
+    r = get_pool().send(req)
 
     data = orjson.loads(r.content)
 
@@ -142,8 +141,7 @@ def polygon_zipcode(zcta, **kwargs):
     if kwargs.get("req_only") == True:
         return req
 
-    with httpx.Client() as client:
-        r = client.send(req, follow_redirects=True)
+    r = get_pool().send(req, follow_redirects=True)
 
     data = orjson.loads(r.content)
 
@@ -174,8 +172,7 @@ def directions(start_coords:tuple[float, float], end_coords:tuple[float, float],
     if kwargs.get("req_only") == True:
         return req
     
-    with httpx.Client() as client:
-        r = client.send(req)
+    r = get_pool().send(req)
     
     data = orjson.loads(r.content)
 
@@ -327,8 +324,7 @@ class Mapbox:
         if kwargs.get("req_only") == True:
             return req
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = get_pool().send(req)
         
         print(r.url)
 
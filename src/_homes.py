@@ -1,22 +1,81 @@
 from typing import Literal
+from typing import Iterator
+from typing import AsyncIterator
 
 import httpx
-import orjson
 from copy import copy, deepcopy
 
 from ._api import HomesAPI
+from ._http import get_pool
+from ._http import ClientPool
+from ._http import decode_json
+from ._http import register_decoder
 from ._http import send_request
+from ._http import iter_bulk
+from ._http import stream_bulk
+from ._batch import ListingBatch
+from ._models import Agent
+from ._models import Address
+from ._models import PropertyDetails
+from ._fieldmap import Field
+from ._fieldmap import Const
+from ._fieldmap import LazyView
+from ._fieldmap import compile_view
+from ._fieldmap import compile_extractor
+from ._fieldmap import spec_paths
+from ._selective import MSGSPEC_AVAILABLE
 from ._util import readjson
 from ._util import always_get
 from .paths import QUERY_DIR
 from .paths import JSON_DIR
 from ._geo import get_commutes
+from ._constants import HM_PLACARD_CHUNK_SIZE
+
+
+register_decoder("homes", root=("placards",))
+
+
+def _amenities(categories: list | None) -> list[dict]:
+    """
+    Flatten 'amenityCategories' into {category, name, values} rows
+    """
+    return [
+        {
+            "category": category.get("name"),
+            "name": sub.get("name"),
+            "values": [value.strip() for value in (sub.get("value") or "").split(",") if value.strip()],
+        }
+        for category in categories or []
+        for sub in category.get("subCategories") or []
+    ]
+
+
+def _amenity_value(categories: list | None, name: str) -> str | None:
+    for category in categories or []:
+        for sub in category.get("subCategories") or []:
+            if (sub.get("name") or "").lower() == name:
+                return (sub.get("value") or "").lower()
+    return None
+
+
+def _basement(categories: list | None) -> str | None:
+    value = _amenity_value(categories, "basement")
+    if not value or value.startswith("none"):
+        return None
+    return "unfinished" if "unfinished" in value else "finished"
+
+
+def _has_garage(categories: list | None) -> bool | None:
+    value = _amenity_value(categories, "parking")
+    return None if value == None else "garage" in value
+
 
 class Homes:
     def __init__(
             self, 
             favorite_locations: list[str] | None = None,
-            commute_destinations: list[tuple[float, float]] | None = None
+            commute_destinations: list[tuple[float, float]] | None = None,
+            pool: ClientPool | None = None
         ):
         """
         Domus
@@ -27,6 +86,10 @@ class Homes:
 
         commute_destinations: list[tuple[float, float]]
             Coordinates used when calculating the commutes to/from a specific property
+
+        pool: ClientPool
+            Connection pool shared with other provider instances. Defaults to
+            the process-wide pool
         """
 
         if favorite_locations != None:
@@ -41,7 +104,8 @@ class Homes:
         else:
             self.commute_destinations = []
 
-        self.api = HomesAPI()
+        self.pool = pool if pool != None else get_pool()
+        self.api = HomesAPI(pool=self.pool)
 
 
     def find_location(self, query:str, _type:Literal["city", "zipcode"]|None=None, **kwargs) -> dict:
@@ -52,10 +116,14 @@ class Homes:
 
         req = self.api.request.autocomplete(query)
 
-        r = send_request(req)
+        r = send_request(req, self.pool.client)
+
+        data = decode_json(r, "homes")
+
+        return self._select_location(data, _type)
 
-        data = orjson.loads(r.content)
 
+    def _select_location(self, data: dict, _type:Literal["city", "zipcode"]|None=None) -> dict:
         if _type == "city":
             _type = "City"
         elif _type == "zipcode":
@@ -73,6 +141,36 @@ class Homes:
                     break
         
         return location_data
+
+
+    @staticmethod
+    def _listing_keys(r) -> list[str]:
+        """
+        Listing keys of a getpins response
+        """
+        if MSGSPEC_AVAILABLE:
+            from ._schemas import HomesPins
+            from ._schemas import decode_typed
+            return [pin.lk.key for pin in decode_typed(r, "homes", HomesPins).pins]
+        return [x["lk"]["key"] for x in decode_json(r, "homes", ("pins.*.lk.key",))["pins"]]
+
+
+    def _placards(self, listing_keys: list[str], chunk_size: int = HM_PLACARD_CHUNK_SIZE, max_in_flight: int = 8) -> Iterator[list[dict]]:
+        """
+        Hydrate listing keys into normalized placards, 'chunk_size' keys per
+        request and 'max_in_flight' requests at a time, yielding each chunk
+        as it returns
+        """
+        requests = self.api.request.getplacards_chunks(listing_keys, chunk_size)
+
+        for _, listings in iter_bulk(
+                requests,
+                pool=self.pool,
+                consumer=self.normalize.search_response,
+                max_in_flight=max_in_flight,
+                per_host=max_in_flight,
+            ):
+            yield listings
     
 
     def find_location_results(self, query:str, **kwargs):
@@ -89,35 +187,60 @@ class Homes:
         return data
 
 
-    def query_search(self, query:str, **kwargs):
+    def query_search(self, query:str, chunk_size:int=HM_PLACARD_CHUNK_SIZE, max_in_flight:int=8, **kwargs):
         """
         Standard property search tool
+
+        The pins are hydrated 'chunk_size' listing keys per placards request,
+        'max_in_flight' requests at a time
         """
-        client = httpx.Client()
+        client = self.pool.client
 
         query = str(query).strip()
 
         req_query_search = self.api.request.autocomplete(query)
         r = client.send(req_query_search)
-        results_query_search = orjson.loads(r.content)
+        results_query_search = decode_json(r, "homes")
 
         loc = results_query_search.get("suggestions", {}).get("places", [None])[0]
         g = loc["g"]
 
         req_pindata = self.api.request.getpins(g, **kwargs)
         r = client.send(req_pindata)
-        results_pindata = orjson.loads(r.content)
+        listing_keys = self._listing_keys(r)
+
+        # Back in pin order: chunks complete in any order
+        order = {key: i for i, key in enumerate(listing_keys)}
+        listings = [listing for chunk in self._placards(listing_keys, chunk_size, max_in_flight) for listing in chunk]
+        listings.sort(key=lambda listing: order.get(listing["db_listing_id"], len(order)))
+
+        return listings
+
+
+    def iter_query_search(self, query:str, chunk_size:int=HM_PLACARD_CHUNK_SIZE, max_in_flight:int=8, **kwargs):
+        """
+        Streaming 'query_search'
 
-        listing_keys = [x["lk"]["key"] for x in results_pindata["pins"]]
-        req_properties = self.api.request.getplacards(listing_keys)
-        r = client.send(req_properties)
-        results_properties = orjson.loads(r.content)
+        Placards are yielded normalized, one at a time, as each chunk of
+        them returns (in completion order, not pin order)
+        """
+        client = self.pool.client
+
+        query = str(query).strip()
+
+        req_query_search = self.api.request.autocomplete(query)
+        r = client.send(req_query_search)
+        results_query_search = decode_json(r, "homes")
+
+        loc = results_query_search.get("suggestions", {}).get("places", [None])[0]
+        g = loc["g"]
 
-        client.close()
+        req_pindata = self.api.request.getpins(g, **kwargs)
+        r = client.send(req_pindata)
+        listing_keys = self._listing_keys(r)
 
-        normalized_data = self.normalize.property_search(results_properties)
-        # return results_properties
-        return normalized_data
+        for listings in self._placards(listing_keys, chunk_size, max_in_flight):
+            yield from listings
 
 
     def geography_search(self, geography, **kwargs):
@@ -138,18 +261,25 @@ class Homes:
     def property_details(self, property_key:str, **kwargs):
         req = self.api.request.property_details(property_key)
 
-        client = httpx.Client()
-
-        r = client.send(req)
-        data = orjson.loads(r.content)
-
-        client.close()
+        r = self.pool.send(req)
+        data = decode_json(r, "homes")
 
         # normalized_data = readjson(JSON_DIR.joinpath("property_details.json"))
 
         return data
 
     
+    def property_details_full(self, property_key:str) -> dict:
+        """
+        Normalized property details (the schema of json/property_details.jsonc)
+
+        Homes.com serves the whole property from its single detail route
+        """
+        r = self.pool.send(self.api.request.property_details(property_key))
+
+        return self.normalize.details({"details": decode_json(r, "homes")}).to_dict()
+
+
     def add_commute(self, lat:float, lon:float):
         """
         Add a destination to commute tracker
@@ -176,55 +306,225 @@ class Homes:
     class normalize:
         @staticmethod
         def property_search(response_data):
-            template = readjson(JSON_DIR.joinpath("listing_search.json"))
-            
-            normalized_data = []
-            
-            for property in response_data["placards"]:
-                property_data = deepcopy(template)
-                
-                # Address information
-                _address = always_get("address", property, {})
-                property_data["address"]["city"] = _address.get("city")
-                property_data["address"]["country_code"] = _address.get("countryCode")
-                property_data["address"]["county"] = None  # Homes.com doesn't provide county info directly
-                property_data["address"]["postal_code"] = _address.get("postalCode")
-                property_data["address"]["state"] = _address.get("state")
-                property_data["address"]["street"] = _address.get("street")
-                
-                # Latitude and longitude (not available in Homes.com sample)
-                property_data["address"]["lat"] = None
-                property_data["address"]["lon"] = None
-
-                # Price information
-                property_data["price"] = property.get("currentPrice")
-                
-                # Number of beds and baths
-                property_data["num_beds"] = property.get("beds")
-                property_data["num_baths"] = property.get("bathsTotal")
-                
-                # Images
-                property_data["images"] = [
-                    attachment.get("uri") 
-                    for attachment in always_get("attachments", property, [])
-                ]
-
-                # Agent information
-                _agent = always_get("listingAgent", property, {})
-                property_data["agency_name"] = _agent.get("agencyName")
-                property_data["agent_name"] = _agent.get("fullName")
-                property_data["agent_phone"] = _agent.get("phoneNumber")
-                
-                # Price history (Homes.com doesn't provide sold price history)
-                property_data["price_history"] = []
-                
-                # Database fields
-                property_data["db_listing_id"] = always_get("listingKey", property, {}).get("key")
-                property_data["db_property_id"] = always_get("propertyKey", property, {}).get("key")
-                property_data["db_name"] = "Homes"
-
-                normalized_data.append(property_data)
-            
-            return normalized_data
+            return [
+                Homes.normalize.listing(property).to_dict()
+                for property in response_data["placards"]
+            ]
+
+
+        @staticmethod
+        def property_search_batch(response_data) -> ListingBatch:
+            """
+            'property_search' as a columnar 'ListingBatch'
+            """
+            return ListingBatch.from_listings(
+                Homes.normalize.listing(property)
+                for property in response_data["placards"]
+            )
+
+
+        @staticmethod
+        def property_search_views(response_data) -> list[LazyView]:
+            """
+            'property_search' as lazy views, for callers that read a few fields
+            """
+            return [
+                Homes.normalize.view(property)
+                for property in response_data["placards"]
+            ]
+
+
+        # Listing field -> placard path (see '_fieldmap'). Homes.com
+        # placards carry no county or coordinates. "attachments" is a
+        # list; it used to be read with 'always_get', which only passes
+        # dicts through, so 'images' was always empty
+        fields = {
+            "images": Field("attachments", convert=lambda attachments: [
+                attachment.get("uri") for attachment in attachments or []
+            ]),
+            "num_beds": "beds",
+            "num_baths": "bathsTotal",
+            "address.city": "address.city",
+            "address.country_code": "address.countryCode",
+            "address.postal_code": "address.postalCode",
+            "address.state": "address.state",
+            "address.street": "address.street",
+            "price": "currentPrice",
+            "agent_name": "listingAgent.fullName",
+            "agent_phone": "listingAgent.phoneNumber",
+            "agency_name": "listingAgent.agencyName",
+            "db_listing_id": "listingKey.key",
+            "db_property_id": "propertyKey.key",
+            "db_name": Const("Homes"),
+        }
+
+        # Single placard -> 'Listing', e.g. one streamed by 'iter_query_search'
+        listing = staticmethod(compile_extractor(fields))
+
+        # Lazy counterpart of 'listing': normalizes fields on first access
+        view = compile_view(fields, name="HomesListingView")
+
+        # What 'property_search' reads from a search response, so the rest of
+        # each listing is skipped while decoding (see 'ResponseDecoder.decode')
+        search_paths = spec_paths(fields, "placards.*")
+
+        # 'listing' over the typed records of '_schemas'
+        typed_listing = staticmethod(compile_extractor(fields, attrs=True))
+
+        # PropertyDetails field -> path into the decoded detail route
+        # ({"details": ...}), which shares the placard field names
+        details_fields = {
+            "primary_agent.agency_name": "details.listingAgent.agencyName",
+            "primary_agent.email": "details.listingAgent.email",
+            "primary_agent.name": "details.listingAgent.fullName",
+            "primary_agent.key": "details.listingAgent.key",
+            "primary_agent.role": Const("listing_agent"),
+            "primary_agent.phone": "details.listingAgent.phoneNumber",
+            "amenities": Field("details.amenityCategories", convert=_amenities),
+            "images": Field("details.attachments", convert=lambda attachments: [
+                attachment.get("uri") for attachment in attachments or []
+            ]),
+            "num_beds": "details.beds",
+            "num_baths": "details.bathsTotal",
+            "has_garage": Field("details.amenityCategories", convert=_has_garage),
+            "basement": Field("details.amenityCategories", convert=_basement),
+            "address.city": "details.address.city",
+            "address.country_code": "details.address.countryCode",
+            "address.postal_code": "details.address.postalCode",
+            "address.state": "details.address.state",
+            "address.street": "details.address.street",
+            "db_listing_id": "details.listingKey.key",
+            "db_property_id": "details.propertyKey.key",
+            "db_name": Const("Homes"),
+        }
+
+        # Decoded detail route -> 'PropertyDetails'
+        details = staticmethod(compile_extractor(
+            details_fields,
+            factory=PropertyDetails,
+            nested={"address": Address, "primary_agent": Agent},
+            name="property_details",
+        ))
+
+
+        @staticmethod
+        def search_response(r) -> list[dict]:
+            """
+            Decode + normalize a search response: straight into its typed
+            schema when msgspec is installed (a payload that drifted from it
+            raises 'SchemaError'), else through the selective decoder
+            """
+            if MSGSPEC_AVAILABLE:
+                from ._schemas import decode_search
+                return [Homes.normalize.typed_listing(property).to_dict() for property in decode_search(r, "homes")]
+            return Homes.normalize.property_search(decode_json(r, "homes", Homes.normalize.search_paths))
+
+
+
+class AsyncHomes(Homes):
+    """
+    Awaitable twin of 'Homes'
+
+    Every public method is a coroutine sent over the pool's async client, so
+    many searches can run concurrently on a single event loop. Methods take
+    the same parameters as their 'Homes' counterparts.
+    """
+
+    async def find_location(self, query:str, _type:Literal["city", "zipcode"]|None=None, **kwargs) -> dict:
+        data = await self.find_location_results(query)
+
+        return self._select_location(data, _type)
+
+
+    async def find_location_results(self, query:str, **kwargs):
+        query = str(query).strip()
+
+        req = self.api.request.autocomplete(query)
+
+        r = await self.pool.asend(req)
+
+        data = decode_json(r, "homes")
+
+        return data
+
+
+    async def query_search(self, query:str, chunk_size:int=HM_PLACARD_CHUNK_SIZE, max_in_flight:int=8, **kwargs):
+        client = self.pool.async_client
+
+        query = str(query).strip()
+
+        req_query_search = self.api.request.autocomplete(query)
+        r = await client.send(req_query_search)
+        results_query_search = decode_json(r, "homes")
+
+        loc = results_query_search.get("suggestions", {}).get("places", [None])[0]
+        g = loc["g"]
+
+        req_pindata = self.api.request.getpins(g, **kwargs)
+        r = await client.send(req_pindata)
+        listing_keys = self._listing_keys(r)
+
+        order = {key: i for i, key in enumerate(listing_keys)}
+        listings = [listing async for chunk in self._aplacards(listing_keys, chunk_size, max_in_flight) for listing in chunk]
+        listings.sort(key=lambda listing: order.get(listing["db_listing_id"], len(order)))
+
+        return listings
+
+
+    async def iter_query_search(self, query:str, chunk_size:int=HM_PLACARD_CHUNK_SIZE, max_in_flight:int=8, **kwargs):
+        client = self.pool.async_client
+
+        query = str(query).strip()
+
+        req_query_search = self.api.request.autocomplete(query)
+        r = await client.send(req_query_search)
+        results_query_search = decode_json(r, "homes")
+
+        loc = results_query_search.get("suggestions", {}).get("places", [None])[0]
+        g = loc["g"]
+
+        req_pindata = self.api.request.getpins(g, **kwargs)
+        r = await client.send(req_pindata)
+        listing_keys = self._listing_keys(r)
+
+        async for listings in self._aplacards(listing_keys, chunk_size, max_in_flight):
+            for listing in listings:
+                yield listing
+
+
+    async def _aplacards(self, listing_keys: list[str], chunk_size: int = HM_PLACARD_CHUNK_SIZE, max_in_flight: int = 8) -> AsyncIterator[list[dict]]:
+        requests = self.api.request.getplacards_chunks(listing_keys, chunk_size)
+
+        async for _, listings in stream_bulk(
+                requests,
+                client=self.pool.async_client,
+                consumer=self.normalize.search_response,
+                max_in_flight=max_in_flight,
+                per_host=max_in_flight,
+            ):
+            yield listings
+
+
+    async def geography_search(self, geography, **kwargs):
+        req = self.api.request.getpins(geography=geography, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        data = decode_json(r, "homes")
+
+        return data
+
+
+    async def property_details(self, property_key:str, **kwargs):
+        req = self.api.request.property_details(property_key)
+
+        r = await self.pool.asend(req)
+        data = decode_json(r, "homes")
+
+        return data
+
 
+    async def property_details_full(self, property_key:str) -> dict:
+        r = await self.pool.asend(self.api.request.property_details(property_key))
 
+        return self.normalize.details({"details": decode_json(r, "homes")}).to_dict()
@@ -1,11 +1,927 @@
+import time
+import atexit
+import random
 import asyncio
+import hashlib
+import inspect
+import weakref
+import threading
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Coroutine
+from typing import AsyncIterator
+from importlib.util import find_spec
+from http.cookiejar import CookieJar
+from http.cookiejar import DefaultCookiePolicy
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future
 
+import orjson
 from httpx import Limits
 from httpx import Request
 from httpx import Response
+from httpx import TransportError
 from httpx import Client, AsyncClient
+from httpx import HTTPTransport, AsyncHTTPTransport
+from httpx import BaseTransport, AsyncBaseTransport
 
 from .ptext import log_response
+from ._selective import compile_paths
+
+
+# HTTP/2 is only negotiated when the optional 'h2' package is installed
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Guards creation of the process-wide pool, limiter and background loop
+_default_pool_lock = threading.RLock()
+
+
+def request_fingerprint(req: Request) -> str:
+    """
+    Canonical key for a request: method, URL, sorted query params and body
+
+    JSON bodies are re-serialized with sorted keys, so two payloads that only
+    differ in key order (or whitespace) map to the same fingerprint. Headers
+    are not part of the key.
+    """
+    url = req.url
+    params = sorted(url.params.multi_items())
+
+    body = req.read()
+    if body:
+        try:
+            body = orjson.dumps(orjson.loads(body), option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONDecodeError:
+            pass
+
+    h = hashlib.sha256()
+    h.update(f"{req.method} {url.scheme}://{url.host}{url.path}\n".encode())
+    h.update(orjson.dumps(params))
+    h.update(b"\n")
+    h.update(body)
+    return h.hexdigest()
+
+
+class ResponseDecoder:
+    def __init__(self, prefix: bytes = b"", root: tuple[str, ...] = ()):
+        """
+        How to decode one provider's JSON responses
+
+        Parameters
+        ----------
+        prefix: bytes
+            Junk in front of the JSON document, e.g. Redfin's "{}&&". It is
+            skipped by slicing a memoryview, not by copying the body
+
+        root: tuple[str, ...]
+            Object keys leading to the search results array, e.g.
+            ("payload", "homes")
+        """
+        self.prefix = prefix
+        self.root = tuple(root)
+        # Compiled selective decoders, per path set
+        self._selectors: dict[tuple[str, ...], Callable] = {}
+
+
+    def decode(self, content: bytes | Response, paths: tuple[str, ...] | None = None):
+        """
+        Decode a response body with orjson
+
+        Parameters
+        ----------
+        content: bytes | Response
+            The body
+
+        paths: tuple[str, ...] | None
+            Dotted JSON paths ("*" for array items) the caller consumes.
+            When given, only those subtrees are materialized (see
+            '_selective.compile_paths') and the rest of the document is
+            skipped while parsing
+        """
+        if paths != None:
+            decode = self._selectors.get(paths)
+            if decode == None:
+                decode = self._selectors[paths] = compile_paths(paths)
+        else:
+            decode = orjson.loads
+
+        return decode(self.document(content))
+
+
+    def document(self, content: bytes | Response) -> bytes | memoryview:
+        """
+        The JSON document of a body, with the prefix sliced off without a copy
+        """
+        if isinstance(content, Response):
+            content = content.content
+
+        prefix = self.prefix
+        if prefix and content[:len(prefix)] == prefix:
+            return memoryview(content)[len(prefix):]
+        return content
+
+
+    def results(self, content: bytes | Response) -> list:
+        """
+        Decode a search response and return the array at 'root'
+        """
+        data = self.decode(content)
+        for key in self.root:
+            if not isinstance(data, dict):
+                return []
+            data = data.get(key)
+        return data or []
+
+
+class SchemaError(ValueError):
+    """
+    A provider response no longer matches its typed schema (see '_schemas')
+    """
+
+
+# Provider name -> decoder, filled in by each provider module
+_decoders: dict[str, ResponseDecoder] = {}
+_plain_decoder = ResponseDecoder()
+
+
+def register_decoder(provider: str, prefix: bytes = b"", root: tuple[str, ...] = ()) -> ResponseDecoder:
+    decoder = _decoders[provider] = ResponseDecoder(prefix, root)
+    return decoder
+
+
+def get_decoder(provider: str) -> ResponseDecoder:
+    decoder = _decoders.get(provider)
+    if decoder == None:
+        raise ValueError(f"no decoder registered for provider '{provider}'")
+    return decoder
+
+
+def decode_json(content: bytes | Response, provider: str | None = None, paths: tuple[str, ...] | None = None):
+    """
+    Decode a response body with orjson, stripping the envelope registered
+    for 'provider' (if any) and materializing only 'paths' when given
+    """
+    decoder = _plain_decoder if provider == None else get_decoder(provider)
+    return decoder.decode(content, paths)
+
+
+# Statuses that mean "slow down" rather than "this request is wrong"
+THROTTLE_STATUSES = (429, 503)
+
+
+def retry_after(r: Response) -> float | None:
+    """
+    Seconds to wait according to the response's Retry-After header (either
+    delta-seconds or an HTTP date), or None if it has none
+    """
+    value = r.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostBucket:
+    __slots__ = ("rate", "tokens", "updated", "blocked_until", "last_decrease", "throttled", "sent")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0
+        self.sent = 0
+
+
+class RateLimiter:
+    def __init__(
+            self,
+            rate: float = 5.0,
+            min_rate: float = 0.25,
+            max_rate: float = 25.0,
+            burst: float = 4.0,
+            host_rates: dict[str, float] | None = None,
+            increase: float = 1.0,
+            decrease: float = 0.5,
+            max_retries: int = 4,
+            backoff: float = 0.5,
+            max_backoff: float = 30.0,
+        ):
+        """
+        Adaptive token-bucket rate limiter, one bucket per host
+
+        Each host starts at 'rate' requests/second. Successful responses
+        raise the rate additively; 429/503 responses cut it multiplicatively
+        (AIMD) and a Retry-After header pauses the host entirely until it
+        has passed. Throttled requests and transport errors are retried with
+        jittered exponential backoff.
+
+        The limiter is thread-safe and shared between sync and async
+        clients, so 'send_request', 'fetch_bulk' and every pooled client
+        draw from the same per-host budget.
+
+        Parameters
+        ----------
+        rate: float
+            Starting rate for hosts not in 'host_rates' (requests/second)
+
+        min_rate: float
+            Floor the rate never drops below
+
+        max_rate: float
+            Ceiling the rate never ramps above
+
+        burst: float
+            Tokens a bucket can hold, i.e. requests let through at once
+            after an idle period
+
+        host_rates: dict[str, float] | None
+            Starting rate per host, e.g. {"www.zillow.com": 2}
+
+        increase: float
+            Additive increase. The rate grows by about this much per second
+            of error-free traffic
+
+        decrease: float
+            Multiplicative decrease applied on a throttled response
+
+        max_retries: int
+            Retries for throttled responses and transport errors. The last
+            response (or error) is returned to the caller as-is
+
+        backoff: float
+            Base delay of the exponential backoff, in seconds
+
+        max_backoff: float
+            Upper bound on a single backoff delay
+        """
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.host_rates = host_rates or {}
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._buckets: dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+
+    def _bucket(self, host: str) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket == None:
+            bucket = _HostBucket(self.host_rates.get(host, self.rate), self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+
+    def reserve(self, host: str) -> float:
+        """
+        Take a token for 'host' and return how long to wait before sending
+
+        Tokens are handed out in order even when the bucket is empty (it
+        goes negative), so concurrent callers queue up instead of racing
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+            bucket.sent += 1
+
+            wait = 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+            return max(wait, bucket.blocked_until - now)
+
+
+    def acquire(self, host: str):
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+
+    async def acquire_async(self, host: str):
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+    def feedback(self, host: str, r: Response | None):
+        """
+        Adjust the host's rate from a response (None for a transport error)
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+
+            if r != None and r.status_code not in THROTTLE_STATUSES:
+                if r.status_code < 500:
+                    # ~'increase' req/s gained per second at the current rate
+                    bucket.rate = min(self.max_rate, bucket.rate + self.increase / bucket.rate)
+                return
+
+            if r != None:
+                bucket.throttled += 1
+                delay = retry_after(r)
+                if delay != None:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+
+            # A burst of 429s from requests already in flight is one signal,
+            # not many: cut at most once per current inter-request interval
+            if now - bucket.last_decrease >= 1 / bucket.rate:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                bucket.last_decrease = now
+
+
+    def backoff_delay(self, attempt: int, r: Response | None = None) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than Retry-After
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if r != None:
+            delay = max(delay, retry_after(r) or 0.0)
+        return delay
+
+
+    def rates(self) -> dict[str, dict]:
+        """
+        Current state per host, for monitoring
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(bucket.rate, 3),
+                    "tokens": round(min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate), 3),
+                    "blocked_for": round(max(0.0, bucket.blocked_until - now), 3),
+                    "throttled": bucket.throttled,
+                    "sent": bucket.sent,
+                }
+                for host, bucket in self._buckets.items()
+            }
+
+
+    def wrap(self, transport: BaseTransport) -> BaseTransport:
+        return RateLimitTransport(self, transport)
+
+
+    def wrap_async(self, transport: AsyncBaseTransport) -> AsyncBaseTransport:
+        return AsyncRateLimitTransport(self, transport)
+
+
+class RateLimitTransport(BaseTransport):
+    def __init__(self, limiter: RateLimiter, transport: BaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        host = request.url.host
+        request.read()
+
+        for attempt in range(self.limiter.max_retries + 1):
+            self.limiter.acquire(host)
+            try:
+                r = self.transport.handle_request(request)
+            except TransportError:
+                self.limiter.feedback(host, None)
+                if attempt == self.limiter.max_retries:
+                    raise
+                time.sleep(self.limiter.backoff_delay(attempt))
+                continue
+
+            self.limiter.feedback(host, r)
+            if r.status_code not in THROTTLE_STATUSES or attempt == self.limiter.max_retries:
+                return r
+
+            r.close()
+            time.sleep(self.limiter.backoff_delay(attempt, r))
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitTransport(AsyncBaseTransport):
+    def __init__(self, limiter: RateLimiter, transport: AsyncBaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        host = request.url.host
+        await request.aread()
+
+        for attempt in range(self.limiter.max_retries + 1):
+            await self.limiter.acquire_async(host)
+            try:
+                r = await self.transport.handle_async_request(request)
+            except TransportError:
+                self.limiter.feedback(host, None)
+                if attempt == self.limiter.max_retries:
+                    raise
+                await asyncio.sleep(self.limiter.backoff_delay(attempt))
+                continue
+
+            self.limiter.feedback(host, r)
+            if r.status_code not in THROTTLE_STATUSES or attempt == self.limiter.max_retries:
+                return r
+
+            await r.aclose()
+            await asyncio.sleep(self.limiter.backoff_delay(attempt, r))
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_default_limiter: RateLimiter | None = None
+
+
+def get_limiter() -> RateLimiter:
+    """
+    Returns the process-wide limiter, for pools that should share one
+    budget per host. The default pool doesn't pace requests; opt in with
+
+        set_pool(ClientPool(limiter=get_limiter(), singleflight=SingleFlight()))
+    """
+    global _default_limiter
+    if _default_limiter == None:
+        with _default_pool_lock:
+            if _default_limiter == None:
+                _default_limiter = RateLimiter()
+    return _default_limiter
+
+
+
+# Headers that describe the wire encoding rather than the (decoded) body,
+# so they can't be replayed on a response rebuilt from that body
+_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def _storable_headers(r: Response) -> list[tuple[str, str]]:
+    return [(k, v) for k, v in r.headers.multi_items() if k.lower() not in _HOP_HEADERS]
+
+
+class SingleFlight:
+    def __init__(self, methods: tuple[str] = ("GET", "POST", "PUT")):
+        """
+        Coalesces identical requests that are in flight at the same time
+
+        The first caller for a given 'request_fingerprint' performs the
+        network call; concurrent callers with the same fingerprint wait for
+        it and each receive their own response built from the shared body
+        (or the same exception). Nothing is kept once the call completes,
+        so unlike 'ResponseCache' this never serves stale data.
+
+        Requests flagged with the "stream" extension (the 'iter_*' search
+        methods) pass straight through, since sharing them would mean
+        buffering the whole body.
+
+        Parameters
+        ----------
+        methods: tuple[str]
+            HTTP methods that are coalesced. Provider searches use PUT/POST
+            for reads, so those are included by default
+        """
+        self.methods = {m.upper() for m in methods}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+        self._calls: dict[str, list] = {}
+        self._async_calls: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+
+    def do(self, req: Request, send: Callable[[Request], Response]) -> Response:
+        if req.method not in self.methods or req.extensions.get("stream"):
+            return send(req)
+
+        key = request_fingerprint(req)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call == None
+            if leader:
+                # [done event, result, exception]
+                call = self._calls[key] = [threading.Event(), None, None]
+            self.stats["leaders" if leader else "coalesced"] += 1
+
+        if not leader:
+            call[0].wait()
+            if call[2] != None:
+                raise call[2]
+            return _shared_response(req, call[1])
+
+        try:
+            r = send(req)
+            r.read()
+            r.close()
+            call[1] = (r.status_code, _storable_headers(r), r.content, r.extensions)
+        except BaseException as e:
+            call[2] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call[0].set()
+
+        return _shared_response(req, call[1])
+
+
+    async def do_async(self, req: Request, send: Callable[[Request], Coroutine]) -> Response:
+        if req.method not in self.methods or req.extensions.get("stream"):
+            return await send(req)
+
+        key = request_fingerprint(req)
+        calls = self._async_calls.setdefault(asyncio.get_running_loop(), {})
+        shared = calls.get(key)
+
+        if shared != None:
+            self.stats["coalesced"] += 1
+            # shield: one follower being cancelled mustn't cancel the others
+            return _shared_response(req, await asyncio.shield(shared))
+
+        self.stats["leaders"] += 1
+        shared = calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            r = await send(req)
+            await r.aread()
+            await r.aclose()
+            result = (r.status_code, _storable_headers(r), r.content, r.extensions)
+            shared.set_result(result)
+        except BaseException as e:
+            shared.set_exception(e)
+            # Retrieve it so an un-awaited future doesn't log a warning
+            shared.exception()
+            raise
+        finally:
+            calls.pop(key, None)
+
+        return _shared_response(req, result)
+
+
+    def wrap(self, transport: BaseTransport) -> BaseTransport:
+        return SingleFlightTransport(self, transport)
+
+
+    def wrap_async(self, transport: AsyncBaseTransport) -> AsyncBaseTransport:
+        return AsyncSingleFlightTransport(self, transport)
+
+
+class SingleFlightTransport(BaseTransport):
+    def __init__(self, singleflight: SingleFlight, transport: BaseTransport):
+        self.singleflight = singleflight
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        return self.singleflight.do(request, self.transport.handle_request)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncSingleFlightTransport(AsyncBaseTransport):
+    def __init__(self, singleflight: SingleFlight, transport: AsyncBaseTransport):
+        self.singleflight = singleflight
+        self.transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        return await self.singleflight.do_async(request, self.transport.handle_async_request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def _shared_response(req: Request, result: tuple) -> Response:
+    status_code, headers, content, extensions = result
+    return Response(status_code, headers=headers, content=content, request=req, extensions=dict(extensions))
+
+
+class ClientPool:
+    def __init__(
+            self,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 30.0,
+            http2: bool | None = None,
+            cache: "ResponseCache | None" = None,
+            limiter: RateLimiter | None = None,
+            singleflight: SingleFlight | None = None,
+            cassette: "Cassette | None" = None,
+            persist_cookies: bool = False,
+            **client_kwargs
+        ):
+        """
+        Long-lived connection pool shared by the provider classes
+
+        One 'httpx.Client' is kept open for the lifetime of the pool, so
+        repeat calls to the same host reuse keep-alive connections instead
+        of paying for a new TCP + TLS handshake every time.
+
+        Cookies are not persisted by default: the pool's clients are shared
+        by every provider for the life of the process, and a cookie set by
+        one response (a bot-check token, a session id) would otherwise ride
+        along on every later call and change what comes back. Each call
+        starts cookie-less, as it did with a fresh client per call.
+
+        Parameters
+        ----------
+        max_connections: int
+            Upper bound on open connections across all hosts
+
+        max_keepalive_connections: int
+            Number of idle connections kept alive for reuse
+
+        keepalive_expiry: float
+            Seconds an idle connection is kept before it is closed
+
+        http2: bool | None
+            Negotiate HTTP/2 with hosts that offer it. Defaults to True when
+            the 'h2' package is installed
+
+        cache: ResponseCache | None
+            Serve repeat requests from a response cache (see '_cache')
+
+        limiter: RateLimiter | None
+            Pace and retry requests per host. Cache hits bypass it
+
+        singleflight: SingleFlight | None
+            Coalesce identical concurrent requests into one network call
+
+        cassette: Cassette | None
+            Record responses to, or replay them from, a cassette (see
+            '_cassette'). Replayed calls never reach the limiter
+
+        persist_cookies: bool
+            Keep the cookies responses set and send them on later calls to
+            the same site, one jar per client, shared by every provider
+            using the pool. Give a provider its own pool to keep its session
+            apart. 'cookies' in 'client_kwargs' seeds the jar and implies it
+
+        **client_kwargs
+            Extra keyword arguments passed through to 'httpx.Client'. A
+            'transport' given here replaces the network transport; the
+            other layers still wrap it
+        """
+        self.limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 == None else bool(http2)
+        self.cache = cache
+        self.limiter = limiter
+        self.singleflight = singleflight
+        self.cassette = cassette
+        self.transport = client_kwargs.pop("transport", None)
+        self.persist_cookies = persist_cookies or "cookies" in client_kwargs
+        self.client_kwargs = client_kwargs
+
+        self._client: Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+
+    def _client_options(self) -> dict:
+        if self.persist_cookies:
+            return self.client_kwargs
+        # A jar whose policy accepts no domain: nothing is stored or sent
+        return {**self.client_kwargs, "cookies": CookieJar(DefaultCookiePolicy(allowed_domains=[]))}
+
+
+    @property
+    def client(self) -> Client:
+        """
+        The shared sync client (opened on first use)
+        """
+        if self._client == None:
+            with self._lock:
+                if self._client == None:
+                    self._client = Client(transport=self._build_transport(), **self._client_options())
+        return self._client
+
+
+    @property
+    def async_client(self) -> AsyncClient:
+        """
+        The shared async client for the running event loop (opened on first use)
+
+        httpx async clients are bound to the loop they are first used on, so
+        one is kept per loop
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client == None:
+            client = AsyncClient(transport=self._build_async_transport(), **self._client_options())
+            self._async_clients[loop] = client
+        return client
+
+
+    @property
+    def layers(self) -> list:
+        """
+        Transport wrappers, innermost first
+        """
+        return [layer for layer in (self.limiter, self.cassette, self.cache, self.singleflight) if layer != None]
+
+
+    def _build_transport(self, transport: BaseTransport | None = None) -> BaseTransport:
+        transport = transport if transport != None else self.transport
+        if transport == None:
+            transport = HTTPTransport(limits=self.limits, http2=self.http2)
+        for layer in self.layers:
+            transport = layer.wrap(transport)
+        return transport
+
+
+    def _build_async_transport(self, transport: AsyncBaseTransport | None = None) -> AsyncBaseTransport:
+        """
+        The pool's layers around 'transport' (default: the pool's own network
+        transport). Also used for the short-lived clients 'fetch_bulk' and
+        'stream_bulk' open with custom limits
+        """
+        transport = transport if transport != None else self.transport
+        if transport == None:
+            transport = AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+        for layer in self.layers:
+            transport = layer.wrap_async(transport)
+        return transport
+
+
+    def send(self, req: Request, **kwargs) -> Response:
+        return self.client.send(req, **kwargs)
+
+
+    async def asend(self, req: Request, **kwargs) -> Response:
+        return await self.async_client.send(req, **kwargs)
+
+
+    def close(self):
+        with self._lock:
+            if self._client != None:
+                self._client.close()
+                self._client = None
+
+
+    async def aclose(self):
+        """
+        Close the sync client and the async client of the running loop
+        """
+        self.close()
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client != None:
+            await client.aclose()
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+_default_pool: ClientPool | None = None
+
+
+def get_pool() -> ClientPool:
+    """
+    Returns the process-wide pool used when no pool is passed to a provider
+
+    It coalesces identical in-flight requests but has no rate limiter, so
+    nothing is paced unless a limiter is opted into (see 'get_limiter')
+    """
+    global _default_pool
+    if _default_pool == None:
+        with _default_pool_lock:
+            if _default_pool == None:
+                _default_pool = ClientPool(singleflight=SingleFlight())
+    return _default_pool
+
+
+def set_pool(pool: ClientPool):
+    """
+    Replace the process-wide default pool (e.g. to change its limits)
+    """
+    global _default_pool
+    with _default_pool_lock:
+        _default_pool = pool
+
+
+@atexit.register
+def _close_default_pool():
+    if _default_pool != None:
+        _default_pool.close()
+
+
+class BackgroundLoop:
+    def __init__(self, use_uvloop: bool | None = None):
+        """
+        Event loop running forever on a daemon thread
+
+        Sync code submits coroutines to it instead of calling 'asyncio.run'
+        each time, so the loop (and the async clients bound to it) outlive a
+        single batch. Works from inside an already-running loop too, e.g.
+        under Jupyter or an ASGI server.
+
+        Parameters
+        ----------
+        use_uvloop: bool | None
+            Run on uvloop. Defaults to True when 'uvloop' is installed
+        """
+        if use_uvloop == None:
+            use_uvloop = find_spec("uvloop") is not None
+
+        if use_uvloop:
+            import uvloop
+            self.loop = uvloop.new_event_loop()
+        else:
+            self.loop = asyncio.new_event_loop()
+
+        self._thread = threading.Thread(target=self._run_forever, name="domus-http-loop", daemon=True)
+        self._thread.start()
+
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the loop and return a concurrent Future
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("can't block on the background loop from its own thread; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+    def run(self, coro: Coroutine, timeout: float | None = None):
+        """
+        Run a coroutine on the loop and block until it finishes
+        """
+        return self.submit(coro).result(timeout)
+
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+
+    def close(self, pools: Iterable[ClientPool] = ()):
+        """
+        Close the given pools' async clients on the loop, then stop it
+        """
+        if not self.is_running:
+            return
+
+        async def _aclose():
+            for pool in pools:
+                client = pool._async_clients.pop(self.loop, None)
+                if client != None:
+                    await client.aclose()
+
+        try:
+            self.run(_aclose(), timeout=5)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            if not self._thread.is_alive():
+                self.loop.close()
+
+
+_background_loop: BackgroundLoop | None = None
+
+
+def get_background_loop() -> BackgroundLoop:
+    """
+    Returns the process-wide loop that 'fetch_bulk' and 'iter_bulk' run on
+    """
+    global _background_loop
+    if _background_loop == None or not _background_loop.is_running:
+        with _default_pool_lock:
+            if _background_loop == None or not _background_loop.is_running:
+                _background_loop = BackgroundLoop()
+    return _background_loop
+
+
+@atexit.register
+def _close_background_loop():
+    if _background_loop != None:
+        _background_loop.close([_default_pool] if _default_pool != None else [])
 
 
 
@@ -23,28 +939,228 @@ async def _fetch_request(client: AsyncClient, req: Request, **kwargs):
     return r
 
 
-async def _fetch_bulk(request_list: list[Request], **kwargs):
-    limits = Limits(
-        max_connections=kwargs.get("max_connections", 500), 
-        max_keepalive_connections=kwargs.get("max_keepalive_connections", 500)
-    )
+async def _fetch_bulk(request_list: list[Request], pool: ClientPool | None = None, **kwargs):
+    if "max_connections" in kwargs or "max_keepalive_connections" in kwargs:
+        limits = Limits(
+            max_connections=kwargs.get("max_connections", 500), 
+            max_keepalive_connections=kwargs.get("max_keepalive_connections", 500)
+        )
+
+        pool = pool if pool != None else get_pool()
+        transport = pool._build_async_transport(AsyncHTTPTransport(limits=limits))
+
+        async with AsyncClient(transport=transport) as client:
+            tasks = (asyncio.create_task(_fetch_request(client, req, **kwargs)) for req in request_list)
+            responses = await asyncio.gather(*tasks)
+            return responses
+
+    pool = pool if pool != None else get_pool()
+    client = pool.async_client
+
+    # Don't queue more requests on the pool than it has connections, or the
+    # tail of a large batch runs into the pool timeout
+    sem = asyncio.Semaphore(pool.limits.max_connections or 100)
+
+    async def _bounded(req: Request):
+        async with sem:
+            return await _fetch_request(client, req, **kwargs)
+
+    return await asyncio.gather(*(_bounded(req) for req in request_list))
+
+
+async def _fetch_one(
+        client: AsyncClient,
+        req: Request,
+        host_sem: asyncio.Semaphore,
+        consumer: Callable[[Response], Any] | None = None,
+        **kwargs
+    ):
+    async with host_sem:
+        r = await _fetch_request(client, req, **kwargs)
+
+    if consumer == None:
+        return req, r
+
+    result = consumer(r)
+    if inspect.isawaitable(result):
+        result = await result
+
+    return req, result
+
+
+async def stream_bulk(
+        request_list: Iterable[Request],
+        client: AsyncClient | None = None,
+        consumer: Callable[[Response], Any] | None = None,
+        max_in_flight: int = 64,
+        per_host: int = 8,
+        host_limits: dict[str, int] | None = None,
+        **kwargs
+    ) -> AsyncIterator[tuple[Request, Any]]:
+    """
+    Send requests with bounded concurrency and yield them as they complete
 
-    async with AsyncClient(limits=limits) as client:
-        tasks = (asyncio.create_task(_fetch_request(client, req, **kwargs)) for req in request_list)
-        responses = await asyncio.gather(*tasks)
-        return responses
+    Unlike 'fetch_bulk', requests are pulled from 'request_list' lazily and
+    no more than 'max_in_flight' are outstanding at once, so memory stays
+    flat regardless of the size of the batch.
 
+    Parameters
+    ----------
+    request_list: Iterable[Request]
+        Requests to send. May be a generator
 
-def fetch_bulk(request_list: list[Request], **kwargs) -> list[Response]:
+    client: AsyncClient | None
+        Client to send with. A temporary one, layered like the default
+        pool (cache, limiter if set, ...), is opened (and closed) if None
+
+    consumer: Callable[[Response], Any] | None
+        Called with each response as soon as it arrives (may be async). Its
+        return value is yielded in place of the response, which is then
+        dropped
+
+    max_in_flight: int
+        Upper bound on requests outstanding at once
+
+    per_host: int
+        Default cap on concurrent requests to any single host
+
+    host_limits: dict[str, int] | None
+        Per-host overrides of 'per_host', e.g. {"www.redfin.com": 4}
+
+    Yields
+    ------
+    tuple[Request, Response | Any]
+        In completion order, not submission order
+    """
+    if isinstance(request_list, Request):
+        request_list = [request_list]
+
+    host_limits = host_limits or {}
+    host_sems: dict[str, asyncio.Semaphore] = {}
+
+    owns_client = client == None
+    if owns_client:
+        limits = Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        client = AsyncClient(transport=get_pool()._build_async_transport(AsyncHTTPTransport(limits=limits)))
+
+    requests = iter(request_list)
+    pending: set[asyncio.Task] = set()
+
+    def _submit(n: int):
+        while n > 0:
+            req = next(requests, None)
+            if req == None:
+                return
+            host = req.url.host
+            if host not in host_sems:
+                host_sems[host] = asyncio.Semaphore(host_limits.get(host, per_host))
+            pending.add(asyncio.create_task(_fetch_one(client, req, host_sems[host], consumer, **kwargs)))
+            n -= 1
+
+    try:
+        _submit(max_in_flight)
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            _submit(len(done))
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if owns_client:
+            await client.aclose()
+
+
+def fetch_bulk(request_list: list[Request], pool: ClientPool | None = None, **kwargs) -> list[Response]:
+    """
+    Send a batch of requests concurrently and return the responses in order
+
+    The batch runs on the shared background loop over the pool's long-lived
+    async client, so there's no per-call loop or client setup.
+
+    Requests are only paced if the pool has a 'RateLimiter'. The default
+    pool has none, so a large batch goes out as fast as 'max_in_flight'
+    and 'per_host' allow; pass a pool built with 'limiter=get_limiter()'
+    (or set it as the default with 'set_pool') to throttle it per host.
+    """
     if isinstance(request_list, Request):
         request_list = [request_list]
-    return asyncio.run(_fetch_bulk(request_list, **kwargs))
+    return get_background_loop().run(_fetch_bulk(request_list, pool=pool, **kwargs))
+
+
+def fetch_named(requests: dict[str, Request], pool: ClientPool | None = None, **kwargs) -> dict[str, Response]:
+    """
+    'fetch_bulk' over named requests (e.g. the detail sub-endpoints of one
+    property), returning {name: response}
+
+    All requests are in flight at once over the pool's async client, so the
+    batch takes as long as its slowest request rather than their sum.
+    """
+    return dict(zip(requests, fetch_bulk(list(requests.values()), pool=pool, **kwargs)))
+
+
+async def afetch_named(requests: dict[str, Request], pool: ClientPool | None = None, **kwargs) -> dict[str, Response]:
+    """
+    Awaitable 'fetch_named', run on the caller's event loop
+    """
+    return dict(zip(requests, await _fetch_bulk(list(requests.values()), pool=pool, **kwargs)))
+
+
+def iter_bulk(
+        request_list: Iterable[Request],
+        pool: ClientPool | None = None,
+        consumer: Callable[[Response], Any] | None = None,
+        **kwargs
+    ) -> Iterator[tuple[Request, Any]]:
+    """
+    Sync counterpart of 'stream_bulk'
+
+    Yields (request, response) pairs in completion order while the requests
+    run on the shared background loop. Takes the same options as
+    'stream_bulk'.
+    """
+    pool = pool if pool != None else get_pool()
+    return _iter_on_loop(lambda: stream_bulk(request_list, client=pool.async_client, consumer=consumer, **kwargs))
+
+
+def _iter_on_loop(start: Callable[[], AsyncIterator], flatten: bool = False) -> Iterator:
+    """
+    Iterate an async generator from sync code, one item at a time on the
+    shared background loop. With 'flatten', each item is an iterable (e.g.
+    a page of listings) whose elements are yielded instead
+
+    'start' is called on the loop, so the generator (and anything it looks
+    up per loop, like 'ClientPool.async_client') belongs to it. The
+    generator is closed on the loop as well, whether it ran out, raised, or
+    the sync iterator was abandoned early
+    """
+    loop = get_background_loop()
+
+    async def _start():
+        return start()
+
+    agen = loop.run(_start())
+    try:
+        while True:
+            try:
+                item = loop.run(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            if flatten:
+                yield from item
+            else:
+                yield item
+    finally:
+        loop.run(agen.aclose())
 
 
 
 def send_request(req: Request, existing_client: Client | None = None):
     if existing_client == None:
-        client = Client()
+        client = get_pool().client
     else:
         client = existing_client
 
@@ -53,7 +1169,4 @@ def send_request(req: Request, existing_client: Client | None = None):
     if r.status_code != 200:
         log_response(r)
 
-    if existing_client == None:
-        client.close()
-
     return r
\ No newline at end of file
@@ -0,0 +1,313 @@
+import time
+import sqlite3
+import asyncio
+import threading
+from pathlib import Path
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Awaitable
+
+import orjson
+
+from .paths import CACHE_DIR
+from ._http import get_background_loop
+
+
+# Checkpointed crawl jobs
+#
+# A job's work plan is a set of units (a tile, a search page, a property id)
+# grouped by kind, each stored with its JSON payload in a SQLite journal.
+# Running a kind sends its pending units through an async handler, and each
+# unit is marked done (with its JSON result) as soon as it completes, so a
+# crash, a restart or a run of 429s loses at most the units in flight: the
+# next run skips everything already done and picks up the rest. Handlers
+# may plan more units while running (e.g. the quadrants of a saturated
+# tile); they are picked up by the same run.
+
+
+class Job:
+    def __init__(self, name: str, path: str | Path | None = None):
+        """
+        Resumable crawl job journaled to SQLite
+
+            redfin = AsyncRedfin()
+            job = Job("cook-county")
+            job.plan("details", {pid: {"property_id": pid} for pid in property_ids})
+            job.run("details", lambda unit: redfin.property_details_full(**unit))
+            details = dict(job.results("details"))
+
+        Re-running the same lines after a failure only requests the units
+        that haven't completed ('plan' leaves known units alone).
+
+        Parameters
+        ----------
+        name: str
+            Job the units are recorded under. Several jobs share a journal
+
+        path: str | Path | None
+            SQLite file. Defaults to ~/.cache/domus/jobs.sqlite
+        """
+        if path == None:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = CACHE_DIR.joinpath("jobs.sqlite")
+
+        self.name = name
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._started = None
+        self._completed = 0
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS units (
+                job TEXT,
+                kind TEXT,
+                key TEXT,
+                payload BLOB,
+                status TEXT,
+                attempts INTEGER,
+                result BLOB,
+                error TEXT,
+                updated REAL,
+                PRIMARY KEY (job, kind, key)
+            )
+            """
+        )
+
+
+    def plan(self, kind: str, units: dict[str, Any]) -> int:
+        """
+        Add units of work, keyed by a unique string. Units already in the
+        journal (done or not) are left as they are
+
+        Returns the number of units added
+        """
+        now = time.time()
+        with self._lock:
+            before = self._db.total_changes
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO units VALUES (?, ?, ?, ?, 'pending', 0, NULL, NULL, ?)",
+                ((self.name, kind, str(key), orjson.dumps(payload), now) for key, payload in units.items()),
+            )
+            self._db.execute("COMMIT")
+            return self._db.total_changes - before
+
+
+    def pending(self, kind: str) -> list[tuple[str, Any]]:
+        """
+        (key, payload) of the units not done or failed yet, in planning order
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, payload FROM units WHERE job = ? AND kind = ? AND status = 'pending' ORDER BY rowid",
+                (self.name, kind),
+            ).fetchall()
+        return [(key, orjson.loads(payload)) for key, payload in rows]
+
+
+    def complete(self, kind: str, key: str, result: Any = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE units SET status = 'done', attempts = attempts + 1, result = ?, error = NULL, updated = ? "
+                "WHERE job = ? AND kind = ? AND key = ?",
+                (orjson.dumps(result), time.time(), self.name, kind, key),
+            )
+            self._completed += 1
+
+
+    def fail(self, kind: str, key: str, error: BaseException):
+        with self._lock:
+            self._db.execute(
+                "UPDATE units SET status = 'failed', attempts = attempts + 1, error = ?, updated = ? "
+                "WHERE job = ? AND kind = ? AND key = ?",
+                (f"{type(error).__name__}: {error}", time.time(), self.name, kind, key),
+            )
+
+
+    def retry_failed(self, kind: str, max_attempts: int | None = None) -> int:
+        """
+        Put failed units back in the queue, unless they've already been
+        tried 'max_attempts' times
+
+        Returns the number of units requeued
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE units SET status = 'pending' WHERE job = ? AND kind = ? AND status = 'failed' AND attempts < ?",
+                (self.name, kind, max_attempts if max_attempts != None else 2**31),
+            )
+            return cursor.rowcount
+
+
+    def results(self, kind: str) -> Iterator[tuple[str, Any]]:
+        """
+        (key, result) of the done units, in planning order
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, result FROM units WHERE job = ? AND kind = ? AND status = 'done' ORDER BY rowid",
+                (self.name, kind),
+            ).fetchall()
+        for key, result in rows:
+            yield key, orjson.loads(result)
+
+
+    def errors(self, kind: str) -> dict[str, str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, error FROM units WHERE job = ? AND kind = ? AND status = 'failed' ORDER BY rowid",
+                (self.name, kind),
+            ).fetchall()
+        return dict(rows)
+
+
+    def progress(self, kind: str | None = None) -> dict:
+        """
+        Unit counts of the job (or one kind of it), with the completion rate
+        of the current run and the estimated seconds left at that rate
+        """
+        query = "SELECT status, COUNT(*) FROM units WHERE job = ?"
+        params = (self.name,)
+        if kind != None:
+            query += " AND kind = ?"
+            params += (kind,)
+
+        with self._lock:
+            counts = dict(self._db.execute(query + " GROUP BY status", params).fetchall())
+
+        done, failed, pending = counts.get("done", 0), counts.get("failed", 0), counts.get("pending", 0)
+
+        rate = None
+        if self._started != None and self._completed:
+            rate = self._completed / (time.monotonic() - self._started)
+
+        return {
+            "total": done + failed + pending,
+            "done": done,
+            "failed": failed,
+            "pending": pending,
+            "rate": rate,
+            "eta": pending / rate if rate else None,
+        }
+
+
+    def reset(self, kind: str | None = None):
+        """
+        Forget the job's units (or one kind of them)
+        """
+        with self._lock:
+            if kind == None:
+                self._db.execute("DELETE FROM units WHERE job = ?", (self.name,))
+            else:
+                self._db.execute("DELETE FROM units WHERE job = ? AND kind = ?", (self.name, kind))
+
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+    async def arun(
+            self,
+            kind: str,
+            handler: Callable[[Any], Awaitable[Any]],
+            max_in_flight: int = 8,
+            retry_failed: bool = True,
+            max_failures: int | None = None,
+            on_progress: Callable[[dict], None] | None = None,
+        ) -> dict:
+        """
+        Run the pending units of a kind through 'handler' until none are left
+
+        Parameters
+        ----------
+        kind: str
+            Units to run
+
+        handler: Callable[[Any], Awaitable[Any]]
+            Coroutine function taking a unit's payload. Its return value
+            (anything orjson serializes) is journaled as the unit's result.
+            An exception marks the unit failed and the run carries on
+
+        max_in_flight: int
+            Upper bound on units running at once
+
+        retry_failed: bool
+            Requeue the units that failed in earlier runs before starting
+
+        max_failures: int | None
+            Stop after this many failures in a row (e.g. a storm of 429s)
+            and re-raise the last one. The job resumes from there on the
+            next run
+
+        on_progress: Callable[[dict], None] | None
+            Called with 'progress(kind)' after each unit
+
+        Returns the job's 'progress(kind)'
+        """
+        if retry_failed:
+            self.retry_failed(kind)
+
+        self._started = time.monotonic()
+        self._completed = 0
+
+        running: dict[asyncio.Task, str] = {}
+        queue = deque()
+        queued = set()
+        failures = 0
+
+        def _refill():
+            # Units planned since the last look, e.g. by a handler
+            for key, payload in self.pending(kind):
+                if key not in queued:
+                    queued.add(key)
+                    queue.append((key, payload))
+
+        _refill()
+
+        try:
+            while True:
+                if not queue and len(running) < max_in_flight:
+                    _refill()
+                while queue and len(running) < max_in_flight:
+                    key, payload = queue.popleft()
+                    running[asyncio.create_task(handler(payload))] = key
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = running.pop(task)
+                    error = task.exception()
+                    if error != None:
+                        self.fail(kind, key, error)
+                        failures += 1
+                        if max_failures != None and failures >= max_failures:
+                            raise error
+                    else:
+                        self.complete(kind, key, task.result())
+                        failures = 0
+                    if on_progress != None:
+                        on_progress(self.progress(kind))
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return self.progress(kind)
+
+
+    def run(self, kind: str, handler: Callable[[Any], Awaitable[Any]], **kwargs) -> dict:
+        """
+        Sync counterpart of 'arun', run on the shared background loop. The
+        handler is still a coroutine function (e.g. an 'AsyncRedfin' method)
+        """
+        return get_background_loop().run(self.arun(kind, handler, **kwargs))
@@ -0,0 +1,289 @@
+import re
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import AsyncIterable
+from typing import AsyncIterator
+
+import orjson
+from httpx import Response
+
+from ._http import get_decoder
+
+
+_STRUCTURAL = re.compile(rb'[{}\[\]:,"]')
+_BRACKET_OR_QUOTE = re.compile(rb'[{}\[\]"]')
+_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+# orjson's error when a complete value is followed by more data
+_TRAILING_CONTENT = "unexpected content after document"
+
+
+class ArrayItemParser:
+    def __init__(self, path: tuple[str, ...], prefix: bytes = b""):
+        """
+        Incremental parser that pulls the items of one JSON array out of a
+        byte stream
+
+        Only the structure leading to the array at 'path' is tracked; each
+        item is decoded with orjson the moment its closing bracket arrives,
+        so the whole document is never held in memory or materialized.
+        Items are expected to be objects or arrays (listings always are);
+        scalar items are skipped.
+
+        Once the stream ends, call 'flush' for the items still buffered, then
+        'close' to surface a truncated document.
+
+        Parameters
+        ----------
+        path: tuple[str, ...]
+            Object keys leading to the array, e.g. ("payload", "homes")
+
+        prefix: bytes
+            Junk preceding the JSON document that should be skipped, e.g.
+            Redfin's "{}&&"
+        """
+        self.path = tuple(path)
+        self.prefix = prefix
+        self.done = False
+
+        self._buf = b""
+        self._pos = 0
+        # One entry per open container: [is_object, current key, expecting a key]
+        self._stack: list[list] = []
+        # Whether the target array was entered, and where an item cut off by
+        # the end of a chunk starts (plus how much buffer to wait for)
+        self._in_array = False
+        self._item_start: int | None = None
+        self._retry_at = 0
+        self._window = 16384
+
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """
+        Consume the next chunk of the document and return the items it completed
+        """
+        if self.done or not chunk:
+            return []
+
+        if self._item_start != None:
+            # Keep the partial item, drop everything before it
+            self._retry_at -= self._item_start
+            self._buf = self._buf[self._item_start:] + chunk
+            self._item_start = 0
+        else:
+            self._buf = self._buf[self._pos:] + chunk
+            self._pos = 0
+
+        if self.prefix:
+            if len(self._buf) < len(self.prefix) and self.prefix.startswith(self._buf):
+                return []
+            if self._buf.startswith(self.prefix):
+                self._pos = len(self.prefix)
+            self.prefix = b""
+
+        if not self._in_array:
+            self._seek_array()
+        if self._in_array:
+            return self._read_items()
+        return []
+
+
+    def _seek_array(self):
+        buf = self._buf
+        stack = self._stack
+
+        while True:
+            m = _STRUCTURAL.search(buf, self._pos)
+            if m == None:
+                self._pos = len(buf)
+                return
+
+            c = buf[m.start()]
+            if c == 0x22:  # "
+                s = _STRING_TAIL.match(buf, m.end())
+                if s == None:
+                    # String continues in the next chunk
+                    self._pos = m.start()
+                    return
+                if stack and stack[-1][0] and stack[-1][2]:
+                    stack[-1][1] = orjson.loads(buf[m.start():s.end()])
+                self._pos = s.end()
+                continue
+
+            self._pos = m.end()
+            if c == 0x7B:  # {
+                stack.append([True, None, True])
+            elif c == 0x5B:  # [
+                if self._at_target():
+                    self._in_array = True
+                    return
+                stack.append([False, None, False])
+            elif c in (0x7D, 0x5D):  # } ]
+                if stack:
+                    stack.pop()
+            elif c == 0x3A:  # :
+                if stack:
+                    stack[-1][2] = False
+            elif c == 0x2C:  # ,
+                if stack and stack[-1][0]:
+                    stack[-1][2] = True
+
+
+    def _at_target(self) -> bool:
+        stack = self._stack
+        if len(stack) != len(self.path):
+            return False
+        for frame, key in zip(stack, self.path):
+            if not frame[0] or frame[1] != key:
+                return False
+        return not stack or not stack[-1][2]
+
+
+    def _read_items(self) -> list[Any]:
+        buf = self._buf
+        items = []
+
+        if self._item_start != None:
+            if len(buf) < self._retry_at:
+                return items
+            self._pos = self._item_start
+            self._item_start = None
+
+        view = memoryview(buf)
+        try:
+            while True:
+                # Between items: find the next one, or the end of the array
+                m = _BRACKET_OR_QUOTE.search(buf, self._pos)
+                if m == None:
+                    self._pos = len(buf)
+                    break
+
+                c = buf[m.start()]
+                if c == 0x22:
+                    s = _STRING_TAIL.match(buf, m.end())
+                    if s == None:
+                        self._pos = m.start()
+                        break
+                    self._pos = s.end()
+                    continue
+
+                if c == 0x5D or c == 0x7D:
+                    self.done = True
+                    break
+
+                # Let orjson find where the item ends: decoding from the item
+                # on fails at the first byte after a complete value. The
+                # slice is capped since orjson validates all of its input
+                start = m.start()
+                try:
+                    items.append(orjson.loads(view[start:start + self._window]))
+                    self._pos = min(len(buf), start + self._window)
+                    continue
+                except orjson.JSONDecodeError as e:
+                    if e.msg.startswith(_TRAILING_CONTENT):
+                        self._pos = _byte_offset(buf, start, e.pos)
+                        items.append(orjson.loads(view[start:self._pos]))
+                        continue
+                    if start + self._window < len(buf):
+                        # Item larger than the window, but the data is there
+                        self._window *= 2
+                        self._pos = start
+                        continue
+
+                # Anything else means the item is cut off by the end of the
+                # chunk. Retry once the buffer has grown by at least as much
+                # again, so a large item is re-parsed O(log n) times, not per chunk
+                self._item_start = start
+                self._retry_at = len(buf) + max(len(buf) - start, 4096)
+                break
+        finally:
+            view.release()
+
+        return items
+
+
+    def flush(self) -> list[Any]:
+        """
+        Signal the end of the stream and return the complete items still
+        buffered (those whose parse was deferred for more data)
+        """
+        if self.done or self._item_start == None:
+            return []
+
+        self._retry_at = 0
+        return self._read_items()
+
+
+    def close(self):
+        """
+        Raise if the stream ended inside the array (in an item or between
+        two). Call after 'flush', which returns the complete items before
+        the cut
+        """
+        self.flush()
+        if self._item_start != None:
+            orjson.loads(self._buf[self._item_start:])
+        if self._in_array and not self.done:
+            raise orjson.JSONDecodeError(f"stream ended inside the array at '{'.'.join(self.path)}'", "", 0)
+
+
+def _byte_offset(buf: bytes, start: int, chars: int) -> int:
+    """
+    Byte offset 'chars' characters past 'start' (orjson reports character
+    positions, and listings are not always ASCII)
+    """
+    end = start + chars
+    while True:
+        # Each byte is at most one character, so this never overshoots
+        n = len(buf[start:end].decode("utf-8", "ignore"))
+        if n == chars:
+            return end
+        end += chars - n
+
+
+def iter_items(chunks: Iterable[bytes], path: tuple[str, ...], prefix: bytes = b"") -> Iterator[Any]:
+    """
+    Yield the items of the array at 'path' as they complete in 'chunks'
+    """
+    parser = ArrayItemParser(path, prefix)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    yield from parser.flush()
+    parser.close()
+
+
+async def aiter_items(chunks: AsyncIterable[bytes], path: tuple[str, ...], prefix: bytes = b"") -> AsyncIterator[Any]:
+    parser = ArrayItemParser(path, prefix)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+        if parser.done:
+            return
+    for item in parser.flush():
+        yield item
+    parser.close()
+
+
+def iter_listings(r: Response, provider: str) -> Iterator[dict]:
+    """
+    Stream the listings out of a provider search response
+
+    'r' should have been sent with 'stream=True' so the body is read from
+    the network chunk by chunk; it is closed once the array ends
+    """
+    decoder = get_decoder(provider)
+    try:
+        yield from iter_items(r.iter_bytes(), decoder.root, decoder.prefix)
+    finally:
+        r.close()
+
+
+async def aiter_listings(r: Response, provider: str) -> AsyncIterator[dict]:
+    decoder = get_decoder(provider)
+    try:
+        async for item in aiter_items(r.aiter_bytes(), decoder.root, decoder.prefix):
+            yield item
+    finally:
+        await r.aclose()
@@ -0,0 +1,169 @@
+from dataclasses import field
+from dataclasses import dataclass
+
+import orjson
+
+from ._photos import PhotoSet
+
+
+@dataclass(slots=True)
+class Address:
+    city: str | None = None
+    country_code: str | None = None
+    county: str | None = None
+    neighborhood: str | None = None
+    postal_code: str | None = None
+    state: str | None = None
+    street: str | None = None
+    lat: float | None = None
+    lon: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "city": self.city,
+            "country_code": self.country_code,
+            "county": self.county,
+            "neighborhood": self.neighborhood,
+            "postal_code": self.postal_code,
+            "state": self.state,
+            "street": self.street,
+            "lat": self.lat,
+            "lon": self.lon,
+        }
+
+
+@dataclass(slots=True)
+class Listing:
+    """
+    A normalized search result (the schema of json/listing_search.jsonc)
+
+    Normalizers build these directly instead of deep-copying the JSON
+    template per listing. 'to_dict' returns the same shape the template
+    produced, and orjson serializes instances natively ('to_json').
+
+    'images' is a list of URLs or a compact 'PhotoSet' that derives them
+    on demand; both serialize to the list of URLs.
+    """
+    images: list[str] | PhotoSet = field(default_factory=list)
+    mls_info: dict = field(default_factory=dict)
+    neighborhood: dict = field(default_factory=dict)
+    num_beds: int | None = None
+    num_baths: float | None = None
+    address: Address = field(default_factory=Address)
+    price: int | None = None
+    price_history: list[dict] = field(default_factory=list)
+    status: str | None = None
+    agent_name: str | None = None
+    agent_phone: str | None = None
+    agency_name: str | None = None
+    db_listing_id: str | None = None
+    db_property_id: str | None = None
+    db_name: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "images": self.images.urls() if isinstance(self.images, PhotoSet) else self.images,
+            "mls_info": self.mls_info,
+            "neighborhood": self.neighborhood,
+            "num_beds": self.num_beds,
+            "num_baths": self.num_baths,
+            "address": self.address.to_dict(),
+            "price": self.price,
+            "price_history": self.price_history,
+            "status": self.status,
+            "agent_name": self.agent_name,
+            "agent_phone": self.agent_phone,
+            "agency_name": self.agency_name,
+            "db_listing_id": self.db_listing_id,
+            "db_property_id": self.db_property_id,
+            "db_name": self.db_name,
+        }
+
+    def to_json(self) -> bytes:
+        return orjson.dumps(self, default=json_default)
+
+
+@dataclass(slots=True)
+class Agent:
+    agency_name: str | None = None
+    agency_phone: str | None = None
+    email: str | None = None
+    office_email: str | None = None
+    name: str | None = None
+    key: str | None = None
+    role: str | None = None
+    url: str | None = None
+    phone: str | None = None
+    office_phone: str | None = None
+    bio: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "agency_name": self.agency_name,
+            "agency_phone": self.agency_phone,
+            "email": self.email,
+            "office_email": self.office_email,
+            "name": self.name,
+            "key": self.key,
+            "role": self.role,
+            "url": self.url,
+            "phone": self.phone,
+            "office_phone": self.office_phone,
+            "bio": self.bio,
+        }
+
+
+@dataclass(slots=True)
+class PropertyDetails:
+    """
+    Normalized property details (the schema of json/property_details.jsonc)
+
+    Built by each provider's 'normalize.property_details' from the responses
+    of its detail sub-endpoints. 'to_dict' returns the template's shape.
+    """
+    primary_agent: Agent = field(default_factory=Agent)
+    amenities: list[dict] = field(default_factory=list)
+    images: list[str] | PhotoSet = field(default_factory=list)
+    mls_info: dict = field(default_factory=dict)
+    neighborhood: dict = field(default_factory=dict)
+    num_beds: int | None = None
+    num_baths: float | None = None
+    has_garage: bool | None = None
+    basement: str | None = None
+    address: Address = field(default_factory=Address)
+    price_history: list[dict] = field(default_factory=list)
+    views: int | None = None
+    db_listing_id: str | None = None
+    db_property_id: str | None = None
+    db_name: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "primary_agent": self.primary_agent.to_dict(),
+            "amenities": self.amenities,
+            "images": self.images.urls() if isinstance(self.images, PhotoSet) else self.images,
+            "mls_info": self.mls_info,
+            "neighborhood": self.neighborhood,
+            "num_beds": self.num_beds,
+            "num_baths": self.num_baths,
+            "has_garage": self.has_garage,
+            "basement": self.basement,
+            "address": self.address.to_dict(),
+            "price_history": self.price_history,
+            "views": self.views,
+            "db_listing_id": self.db_listing_id,
+            "db_property_id": self.db_property_id,
+            "db_name": self.db_name,
+        }
+
+    def to_json(self) -> bytes:
+        return orjson.dumps(self, default=json_default)
+
+
+def json_default(obj):
+    """
+    orjson 'default' hook for the types records may hold
+    """
+    if isinstance(obj, PhotoSet):
+        return obj.urls()
+    raise TypeError
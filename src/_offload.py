@@ -0,0 +1,185 @@
+import os
+import asyncio
+import multiprocessing
+from collections import deque
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Callable
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+
+import orjson
+from httpx import Response
+
+from ._http import get_decoder
+from ._models import json_default
+
+
+# Per-process cache of the provider normalizers, so each worker imports
+# them once rather than once per task
+_worker_normalizers: dict[str, Callable] = {}
+
+
+def _normalizer(provider: str) -> Callable:
+    normalize = _worker_normalizers.get(provider)
+    if normalize != None:
+        return normalize
+
+    if provider == "redfin":
+        from ._redfin import Redfin
+        normalize = Redfin.normalize.listing
+    elif provider == "zillow":
+        from ._zillow import Zillow
+        normalize = Zillow.normalize.listing
+    elif provider == "realtor":
+        from ._realtor import Realtor
+        normalize = Realtor.normalize.listing
+    elif provider == "homes":
+        from ._homes import Homes
+        normalize = Homes.normalize.listing
+    else:
+        raise ValueError(f"no normalizer for provider '{provider}'")
+
+    _worker_normalizers[provider] = normalize
+    return normalize
+
+
+def _normalize_chunk(provider: str, contents: list[bytes]) -> list[bytes]:
+    """
+    Worker entry point: decode + normalize a chunk of response bodies
+
+    Results go back as orjson bytes, one blob per body, which is much
+    cheaper to pickle across the process boundary than nested dicts.
+    orjson serializes the 'Listing' records directly
+    """
+    # Importing the normalizer registers the provider's decoder
+    normalize = _normalizer(provider)
+    decoder = get_decoder(provider)
+    return [orjson.dumps([normalize(p) for p in decoder.results(content)], default=json_default) for content in contents]
+
+
+class NormalizeExecutor:
+    def __init__(
+            self,
+            workers: int | None = None,
+            chunk_size: int = 4,
+            mp_context: str | None = "spawn",
+        ):
+        """
+        Decode + normalize search responses in a pool of worker processes
+
+        'orjson.loads' and the per-listing normalization are CPU bound, so
+        on a large crawl they stall the event loop that should be driving
+        the network. Raw response bodies are shipped to worker processes
+        instead, a few per task to amortize the IPC, and compact normalized
+        records (orjson bytes) come back.
+
+            with NormalizeExecutor(workers=4) as ex:
+                for req, listings in iter_bulk(requests, consumer=ex.consumer("redfin")):
+                    ...
+
+        Parameters
+        ----------
+        workers: int | None
+            Worker processes. Defaults to the number of CPUs
+
+        chunk_size: int
+            Response bodies sent to a worker per task by 'map'
+
+        mp_context: str | None
+            multiprocessing start method. "spawn" by default, since forking
+            a process that runs the background HTTP loop thread isn't safe
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+
+        context = multiprocessing.get_context(mp_context) if mp_context != None else None
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+
+    def submit(self, provider: str, content: bytes | Response) -> Future:
+        """
+        Normalize one response body; the Future resolves to orjson bytes of
+        the normalized listings
+        """
+        if isinstance(content, Response):
+            content = content.content
+        future = Future()
+        inner = self._executor.submit(_normalize_chunk, provider, [content])
+
+        def _unwrap(f: Future):
+            if f.exception() != None:
+                future.set_exception(f.exception())
+            else:
+                future.set_result(f.result()[0])
+
+        inner.add_done_callback(_unwrap)
+        return future
+
+
+    def normalize(self, provider: str, content: bytes | Response) -> list[dict]:
+        return orjson.loads(self.submit(provider, content).result())
+
+
+    async def normalize_async(self, provider: str, content: bytes | Response) -> list[dict]:
+        """
+        Normalize off the event loop; the loop keeps serving network I/O
+        while the worker runs
+        """
+        return orjson.loads(await asyncio.wrap_future(self.submit(provider, content)))
+
+
+    def map(self, provider: str, contents: Iterable[bytes | Response]) -> Iterator[list[dict]]:
+        """
+        Normalize many response bodies, 'chunk_size' per task, in order
+
+        'contents' is consumed lazily: at most two tasks per worker are
+        outstanding, and the oldest is yielded before more bodies are
+        pulled, so a generator (e.g. over 'iter_bulk') keeps fetching
+        while the workers normalize and memory stays flat
+        """
+        futures = deque()
+
+        def _drain() -> Iterator[list[dict]]:
+            for blob in futures.popleft().result():
+                yield orjson.loads(blob)
+
+        try:
+            chunk = []
+            for content in contents:
+                chunk.append(content.content if isinstance(content, Response) else content)
+                if len(chunk) == self.chunk_size:
+                    if len(futures) >= self.workers * 2:
+                        yield from _drain()
+                    futures.append(self._executor.submit(_normalize_chunk, provider, chunk))
+                    chunk = []
+            if chunk:
+                futures.append(self._executor.submit(_normalize_chunk, provider, chunk))
+
+            while futures:
+                yield from _drain()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+    def consumer(self, provider: str) -> Callable[[Response], Any]:
+        """
+        'stream_bulk' / 'iter_bulk' consumer that yields normalized listings
+        in place of each response
+        """
+        async def _consume(r: Response):
+            return await self.normalize_async(provider, r)
+        return _consume
+
+
+    def close(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,161 @@
+from typing import Callable
+from typing import Iterator
+from typing import AsyncIterator
+
+from httpx import Request
+from httpx import Response
+
+from ._http import ClientPool
+from ._http import get_pool
+from ._http import stream_bulk
+from ._http import _iter_on_loop
+
+
+# Auto-pagination of provider searches
+#
+# Page 1 is fetched alone to learn how many pages there are; the rest then
+# go out together over the pool's async client, at most 'max_in_flight' at
+# a time, so a 20 page search takes about as long as a 2 page one. Each
+# page is decoded + normalized as soon as it arrives.
+
+
+def listing_key(listing: dict):
+    """
+    Identity of a normalized listing, for deduping across pages
+    """
+    key = listing.get("db_listing_id")
+    return key if key != None else listing.get("db_property_id")
+
+
+async def apages(
+        page_request: Callable[[int], Request],
+        read_page: Callable[[Response], tuple[list[dict], int | None]],
+        page_size: int,
+        pool: ClientPool | None = None,
+        max_in_flight: int = 8,
+        ordered: bool = True,
+        max_pages: int | None = None,
+    ) -> AsyncIterator[list[dict]]:
+    """
+    Fetch every page of a search and yield each page's new listings
+
+    Parameters
+    ----------
+    page_request: Callable[[int], Request]
+        Builds the request for a page number (1-based)
+
+    read_page: Callable[[Response], tuple[list[dict], int | None]]
+        Normalizes a page response into (listings, number of the last page).
+        Without a last page, pages are fetched a window at a time until one
+        comes back short (fewer than 'page_size' listings) or adds nothing new
+
+    page_size: int
+        Listings per full page
+
+    pool: ClientPool | None
+        Pool whose async client sends the pages. Defaults to the process-wide
+        pool
+
+    max_in_flight: int
+        Upper bound on pages requested at once
+
+    ordered: bool
+        Yield pages in page order. If False, they're yielded as they arrive
+
+    max_pages: int | None
+        Stop after this many pages
+
+    Yields
+    ------
+    list[dict]
+        Listings not already yielded by an earlier page (see 'listing_key')
+    """
+    pool = pool if pool != None else get_pool()
+    client = pool.async_client
+    seen = set()
+
+    def _new(listings: list[dict]) -> list[dict]:
+        new = []
+        for listing in listings:
+            key = listing_key(listing)
+            if key != None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            new.append(listing)
+        return new
+
+    async def _fetch(pages: range) -> AsyncIterator[tuple[int, list[dict]]]:
+        page_numbers = {}
+
+        def _requests():
+            for page in pages:
+                req = page_request(page)
+                page_numbers[id(req)] = page
+                yield req
+
+        buffered = {}
+        next_page = pages.start
+        async for req, listings in stream_bulk(
+                _requests(),
+                client=client,
+                consumer=lambda r: read_page(r)[0],
+                max_in_flight=max_in_flight,
+                per_host=max_in_flight,
+            ):
+            page = page_numbers.pop(id(req))
+            if not ordered:
+                yield page, listings
+                continue
+            # Hold pages that arrive early until the ones before them are in
+            buffered[page] = listings
+            while next_page in buffered:
+                yield next_page, buffered.pop(next_page)
+                next_page += 1
+
+    listings, last_page = read_page(await client.send(page_request(1)))
+    yield _new(listings)
+
+    if last_page != None:
+        if max_pages != None:
+            last_page = min(last_page, max_pages)
+        async for _, listings in _fetch(range(2, last_page + 1)):
+            yield _new(listings)
+        return
+
+    if len(listings) < page_size:
+        return
+
+    page = 2
+    while max_pages == None or page <= max_pages:
+        stop = page + max_in_flight if max_pages == None else min(page + max_in_flight, max_pages + 1)
+        done = False
+        async for _, listings in _fetch(range(page, stop)):
+            new = _new(listings)
+            if len(listings) < page_size or not new:
+                done = True
+            yield new
+        if done:
+            return
+        page = stop
+
+
+async def apaginate(*args, **kwargs) -> AsyncIterator[dict]:
+    """
+    'apages', one listing at a time. Takes the same parameters
+    """
+    async for listings in apages(*args, **kwargs):
+        for listing in listings:
+            yield listing
+
+
+def paginate(*args, pool: ClientPool | None = None, **kwargs) -> Iterator[dict]:
+    """
+    Sync counterpart of 'apaginate'
+
+    The pages are fetched on the shared background loop (like 'iter_bulk');
+    listings are yielded as each page is ready. Takes the same parameters
+    as 'apages'
+    """
+    pool = pool if pool != None else get_pool()
+    return _iter_on_loop(lambda: apages(*args, pool=pool, **kwargs), flatten=True)
@@ -0,0 +1,200 @@
+from abc import abstractmethod
+from typing import Iterator
+from collections.abc import Sequence
+
+
+class PhotoSet(Sequence):
+    """
+    Compact, lazy sequence of photo URLs
+
+    Subclasses keep only what the URLs are derived from and build each URL
+    when it's indexed or iterated, so a listing with 40 photos holds a few
+    short strings instead of 40 full URLs. Compares equal to the list of
+    URLs it stands for; 'urls' materializes that list.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def url(self, index: int) -> str:
+        """
+        URL of the photo at 'index' (in range)
+        """
+
+    @abstractmethod
+    def resized(self, size) -> "PhotoSet":
+        """
+        Same photos at another size variant
+        """
+
+
+    def urls(self) -> list[str]:
+        return list(self)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.url(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("photo index out of range")
+        return self.url(index)
+
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PhotoSet, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {len(self)} photos>"
+
+
+class RedfinPhotos(PhotoSet):
+    __slots__ = ("value", "mls_id", "datasource_id", "size", "_ranges")
+
+    # Path segment of each size variant on Redfin's CDN
+    SIZES = ("bigphoto", "mbphoto", "islphoto")
+
+    def __init__(self, value: str, mls_id: str, datasource_id: int | str, size: str = "bigphoto"):
+        """
+        Redfin listing photos from the search result's 'photos.value' ranges
+
+        Parameters
+        ----------
+        value: str
+            Range string, e.g. "0-24:0,25:1" (photo ids and their level)
+
+        mls_id: str
+            The listing's MLS number
+
+        datasource_id: int | str
+            Redfin's id of the MLS feed
+
+        size: str
+            CDN size variant, one of SIZES
+        """
+        self.value = value
+        self.mls_id = mls_id
+        self.datasource_id = datasource_id
+        self.size = size
+        self._ranges: tuple[tuple[int, int, str], ...] | None = None
+
+
+    @property
+    def ranges(self) -> tuple[tuple[int, int, str], ...]:
+        """
+        (first id, last id, level) per range, parsed on first use
+        """
+        if self._ranges == None:
+            ranges = []
+            for item in self.value.split(","):
+                range_part, level = item.split(":")
+                if "-" in range_part:
+                    start, end = map(int, range_part.split("-"))
+                else:
+                    start = end = int(range_part)
+                ranges.append((start, end, level.strip()))
+            self._ranges = tuple(ranges)
+        return self._ranges
+
+
+    def _base_url(self) -> str:
+        mls_id = self.mls_id
+        return f"https://ssl.cdn-redfin.com/photo/{self.datasource_id}/{self.size}/{mls_id[-3:]}/{mls_id}"
+
+
+    @staticmethod
+    def _photo_url(base_url: str, photo_id: int, level: str) -> str:
+        if photo_id == 0 and level == "0":
+            # Special case: no level for photo ID 0 and level 0
+            return f"{base_url}_0.jpg"
+        return f"{base_url}_{photo_id}_{level}.jpg"
+
+
+    def url(self, index: int) -> str:
+        for start, end, level in self.ranges:
+            count = max(0, end - start + 1)
+            if index < count:
+                return self._photo_url(self._base_url(), start + index, level)
+            index -= count
+        raise IndexError("photo index out of range")
+
+
+    def resized(self, size: str) -> "RedfinPhotos":
+        photos = RedfinPhotos(self.value, self.mls_id, self.datasource_id, size)
+        photos._ranges = self._ranges
+        return photos
+
+
+    def __len__(self) -> int:
+        return sum(max(0, end - start + 1) for start, end, _ in self.ranges)
+
+
+    def __iter__(self) -> Iterator[str]:
+        base_url = self._base_url()
+        for start, end, level in self.ranges:
+            for photo_id in range(start, end + 1):
+                yield self._photo_url(base_url, photo_id, level)
+
+
+class RealtorPhotos(PhotoSet):
+    __slots__ = ("hrefs", "width")
+
+    def __init__(self, hrefs: tuple[str, ...], width: int = 960):
+        """
+        Realtor.com listing photos, kept as the hrefs of the search result
+
+        Parameters
+        ----------
+        hrefs: tuple[str, ...]
+            Photo hrefs as returned by the API
+
+        width: int
+            Pixel width of the generated URLs (see 'realtor_photo_url')
+        """
+        self.hrefs = hrefs
+        self.width = width
+
+
+    def url(self, index: int) -> str:
+        return realtor_photo_url(self.hrefs[index], self.width)
+
+
+    def resized(self, width: int) -> "RealtorPhotos":
+        return RealtorPhotos(self.hrefs, width)
+
+
+    def __len__(self) -> int:
+        return len(self.hrefs)
+
+
+    def __iter__(self) -> Iterator[str]:
+        width = self.width
+        for href in self.hrefs:
+            yield realtor_photo_url(href, width)
+
+
+def realtor_photo_url(og_url: str, width: int | None) -> str:
+    """
+    Resized variant of a Realtor.com photo href ("...s.jpg" -> "...rd-w960.jpg")
+    """
+    width = 960 if width == None else width
+    width = str(width).strip()
+
+    # Plain string handling: this runs for every photo of every listing,
+    # and parsing each one with httpx.URL + Path dominated normalization
+    scheme, _, rest = og_url.partition("://")
+    host, _, path = rest.partition("/")
+    path = path.split("?", 1)[0].split("#", 1)[0]
+
+    name = path[path.rfind("/") + 1:]
+    dot = name.rfind(".")
+    suffix = name[dot:] if dot > 0 and dot < len(name) - 1 else ""
+
+    new_name = name.replace(f"s{suffix}", f"rd-w{width}{suffix}")
+
+    return f"{scheme}://{host.lower()}/{new_name}"
@@ -6,12 +6,35 @@ from typing import Literal
 from copy import deepcopy
 
 import httpx
-from dateutil import relativedelta
+from dateutil.relativedelta import relativedelta
 
 # from . import paths
 from .paths import JSON_DIR
 from .paths import QUERY_DIR
 from ._geo import get_bounding_box
+from ._http import get_pool
+from ._http import ClientPool
+from ._http import decode_json
+from ._http import fetch_named
+from ._http import afetch_named
+from ._http import register_decoder
+from ._jsonstream import iter_listings
+from ._jsonstream import aiter_listings
+from ._batch import ListingBatch
+from ._models import Agent
+from ._models import Address
+from ._models import PropertyDetails
+from ._photos import RealtorPhotos
+from ._photos import realtor_photo_url
+from ._fieldmap import Field
+from ._fieldmap import Const
+from ._fieldmap import LazyView
+from ._fieldmap import compile_view
+from ._fieldmap import compile_extractor
+from ._fieldmap import spec_paths
+from ._selective import MSGSPEC_AVAILABLE
+from ._paginate import paginate
+from ._paginate import apaginate
 from ._util import readfile
 from ._util import readjson
 from ._util import read_graphql
@@ -19,10 +42,45 @@ from ._util import read_payload
 from ._util import always_get
 
 
+register_decoder("realtor", root=("data", "home_search", "properties"))
+
+
+def _seller(advertisers: list | None) -> dict:
+    """
+    The listing side advertiser of a property (else the first one)
+    """
+    for advertiser in advertisers or []:
+        if advertiser.get("type") == "seller":
+            return advertiser
+    return advertisers[0] if advertisers else {}
+
+
+def _first(items: list | None) -> dict:
+    return items[0] if items else {}
+
+
+def _phone(phones: list | None) -> str | None:
+    return phones[0].get("number") if phones else None
+
+
+def _gallery_photos(gallery: list | None, photos: list | None) -> RealtorPhotos:
+    """
+    Every photo href of the augmented gallery (categories share photos),
+    else the property's own photos
+    """
+    hrefs = {}
+    for category in gallery or []:
+        for photo in category.get("photos") or []:
+            if photo.get("href"):
+                hrefs[photo["href"]] = None
+    if not hrefs:
+        hrefs = {photo["href"]: None for photo in photos or [] if photo.get("href")}
+    return RealtorPhotos(tuple(hrefs))
+
 
 class Realtor:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
 
     def map_search(
             self,
@@ -45,10 +103,9 @@ class Realtor:
             sort_type=sort_type,
             )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = r.json()
+        rawdata = decode_json(r, "realtor")
 
         return rawdata
 
@@ -74,18 +131,82 @@ class Realtor:
             sort_type=sort_type,
             )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = r.json()
-        
-        # data = rawdata.get("data", {}).get("home_search", {}).get("properties")
-        # data = self._compact_search_data(rawdata)
-        data = self.normalize.property_search(rawdata)
+        data = self.normalize.search_response(r)
 
         return data
 
 
+    def iter_query_search(self, query_string, **kwargs):
+        """
+        Streaming 'query_search'
+
+        Listings are parsed out of the search response while it downloads
+        and yielded normalized, one at a time. Takes the same parameters as
+        'query_search'
+        """
+        req = self.request.query_search(query_string=query_string, **kwargs)
+        req.extensions["stream"] = True
+
+        r = self.pool.send(req, stream=True)
+
+        for property in iter_listings(r, "realtor"):
+            yield self.normalize.listing(property).to_dict()
+
+
+    def paginate_query_search(
+            self,
+            query_string,
+            limit=200,
+            max_in_flight: int = 8,
+            ordered: bool = True,
+            max_pages: int | None = None,
+            **kwargs
+        ):
+        """
+        Every page of 'query_search', one normalized listing at a time
+
+        The first page gives the total count; the remaining pages are then
+        fetched concurrently (see '_paginate') and listings are deduped by
+        listing id
+
+        Parameters
+        ----------
+        query_string: str
+            Same as 'query_search'
+
+        limit: int
+            Listings per page (Realtor.com allows up to 200)
+
+        max_in_flight: int
+            Upper bound on pages requested at once
+
+        ordered: bool
+            Yield pages in order. If False, pages are yielded as they arrive
+
+        max_pages: int | None
+            Stop after this many pages
+
+        **kwargs
+            Other 'query_search' filters
+        """
+        return paginate(*self._pages(query_string, limit, **kwargs), pool=self.pool, max_in_flight=max_in_flight, ordered=ordered, max_pages=max_pages)
+
+
+    def _pages(self, query_string, limit, **kwargs):
+        limit = int(limit)
+
+        def page_request(page: int) -> httpx.Request:
+            return self.request.query_search(query_string=query_string, limit=limit, offset=(page - 1) * limit, **kwargs)
+
+        def read_page(r: httpx.Response) -> tuple[list[dict], int | None]:
+            listings, total = self.normalize.search_page(r)
+            return listings, None if total == None else max(1, -(-total // limit))
+
+        return page_request, read_page, limit
+
+
     def city_search(
             self,
             city, 
@@ -107,10 +228,9 @@ class Realtor:
             sort_type=sort_type,
             )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = r.json()
+        rawdata = decode_json(r, "realtor")
 
         # data = self._compact_search_data(rawdata)
 
@@ -139,32 +259,15 @@ class Realtor:
 
     @staticmethod
     def generate_custom_photo_url2(og_url: str, width: int | None):
-        width = 960 if width == None else width
-        width = str(width).strip()
+        return realtor_photo_url(og_url, width)
 
-        url_obj = httpx.URL(og_url)
-        
-        start_idx = url_obj.path.rfind("/") + 1
-
-        urlpath = Path(url_obj.path[start_idx:])
-        
-        old_ending = f"s{urlpath.suffix}"
-        new_ending = f"rd-w{width}{urlpath.suffix}"
-
-        new_name = urlpath.name.replace(old_ending, new_ending)
-
-        edited_url = f"{url_obj.scheme}://{url_obj.host}/" + new_name
-
-        return edited_url
-        
 
     def property_details(self, property_id):
         req = self.request.property_details(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
-        rawdata = r.json()
+        rawdata = decode_json(r, "realtor")
 
         return rawdata
 
@@ -172,26 +275,62 @@ class Realtor:
     def property_and_tax_history(self, property_id):
         req = self.request.property_and_tax_history(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
-            rawdata = r.json()
-        
-            return rawdata
+        rawdata = decode_json(r, "realtor")
+    
+        return rawdata
     
 
     def property_school_data(self, property_id):
         req = self.request.property_school_data(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = r.json()
+        rawdata = decode_json(r, "realtor")
 
         return rawdata
 
 
     def property_estimates(self, property_id, historical_year_start=None, historical_year_end=None, month_forecast_count=None):
+        req = self._property_estimates_request(property_id, historical_year_start, historical_year_end, month_forecast_count)
+
+        r = self.pool.send(req)
+        
+        rawdata = decode_json(r, "realtor")
+
+        return rawdata
+
+
+    def property_details_full(self, property_id) -> dict:
+        """
+        Normalized property details (the schema of json/property_details.jsonc)
+
+        The details, history and gallery queries are sent concurrently over
+        the pool, so this takes as long as the slowest of them instead of
+        their sum (schools, estimates and saves aren't part of the schema)
+        """
+        responses = fetch_named(self._details_requests(property_id), pool=self.pool)
+
+        return self.normalize.details(self._details_data(responses)).to_dict()
+
+
+    def _details_requests(self, property_id) -> dict[str, httpx.Request]:
+        return {
+            "details": self.request.property_details(property_id),
+            "history": self.request.property_and_tax_history(property_id),
+            "gallery": self.request.property_gallery(property_id),
+        }
+
+
+    @staticmethod
+    def _details_data(responses: dict[str, httpx.Response]) -> dict:
+        # A failed sub-query leaves its fields empty instead of failing the
+        # whole record
+        return {name: decode_json(r, "realtor") for name, r in responses.items() if r.status_code == 200}
+
+
+    def _property_estimates_request(self, property_id, historical_year_start=None, historical_year_end=None, month_forecast_count=None):
         today = dt.date.today()
 
         if historical_year_start == None:
@@ -210,21 +349,15 @@ class Realtor:
         
         req = self.request.property_estimates(property_id, hist_year_min, hist_year_max, fcast_date_str)
 
-        with httpx.Client() as client:
-            r = client.send(req)
-        
-        rawdata = r.json()
-
-        return rawdata
+        return req
 
 
     def property_saves(self, property_id):
         req = self.request.property_saves(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = r.json()
+        rawdata = decode_json(r, "realtor")
 
         return rawdata
     
@@ -232,10 +365,9 @@ class Realtor:
     def property_gallery(self, property_id):
         req = self.request.property_gallery(property_id)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = r.json()
+        rawdata = decode_json(r, "realtor")
 
         return rawdata
 
@@ -282,7 +414,8 @@ class Realtor:
             sort_type = str(sort_type).lower() if sort_type != None else "relevant"
 
             payload["variables"]["limit"] = int(limit)
-            # payload["variables"]["offset"] = int(offset)
+            if offset != None:
+                payload["variables"]["offset"] = int(offset)
             payload["variables"]["sort_type"] = sort_type
 
 
@@ -326,7 +459,8 @@ class Realtor:
             sort_type = str(sort_type).lower() if sort_type != None else "relevant"
 
             payload["variables"]["limit"] = int(limit)
-            # payload["variables"]["offset"] = int(offset)
+            if offset != None:
+                payload["variables"]["offset"] = int(offset)
             payload["variables"]["sort_type"] = sort_type
 
 
@@ -364,7 +498,8 @@ class Realtor:
             sort_type = str(sort_type).lower() if sort_type != None else "relevant"
 
             payload["variables"]["limit"] = int(limit)
-            # payload["variables"]["offset"] = int(offset)
+            if offset != None:
+                payload["variables"]["offset"] = int(offset)
             payload["variables"]["sort_type"] = sort_type
 
             req = httpx.Request("POST", url, params=params, json=payload)
@@ -400,7 +535,8 @@ class Realtor:
             sort_type = str(sort_type).lower() if sort_type != None else "relevant"
 
             payload["variables"]["limit"] = int(limit)
-            # payload["variables"]["offset"] = int(offset)
+            if offset != None:
+                payload["variables"]["offset"] = int(offset)
             payload["variables"]["sort_type"] = sort_type
 
             req = httpx.Request("POST", url, params=params, json=payload)
@@ -605,53 +741,256 @@ class Realtor:
     class normalize:
         @staticmethod
         def property_search(response_data):
-            template = readjson(JSON_DIR.joinpath("listing_search.json"))
-            
             property_list: list[dict] = response_data.get("data", {}).get("home_search", {}).get("properties", [])
-            
-            normalized_data = []
-
-            for property in property_list:
-                property_data = deepcopy(template)
-
-                # Address information
-                _location = always_get("location", property, {})
-                property_data["address"]["city"] = _location.get("address", {}).get("city")
-                property_data["address"]["country_code"] = "US"
-                property_data["address"]["county"] = _location.get("county", {}).get("name")
-                property_data["address"]["postal_code"] = _location.get("address", {}).get("postal_code")
-                property_data["address"]["state"] = _location.get("address", {}).get("state")
-                property_data["address"]["street"] = _location.get("address", {}).get("line")
-                property_data["address"]["lat"] = _location.get("coordinate", {}).get("lat")
-                property_data["address"]["lon"] = _location.get("coordinate", {}).get("lon")
-                
-                # Number of beds and baths
-                _description = always_get("description", property, {})
-                property_data["num_beds"] = _description.get("beds")
-                property_data["num_baths"] = float(_description.get("baths_consolidated", "0").split('+')[0])
-                
-                # Images
-                property_data["images"] = [
-                    Realtor.generate_custom_photo_url2(photo.get("href"))
-                    for photo in always_get("photos", property, [])
-                    ]
-                
-                # Price and price history
-                property_data["price"] = property.get("list_price")
-                if _description.get("sold_price"):
-                    property_data["price_history"] = [{
-                        "price": _description.get("sold_price"),
-                        "date": _description.get("sold_date")
-                    }]
-                
-                # Database fields
-                property_data["db_listing_id"] = property.get("listing_id")
-                property_data["db_property_id"] = property.get("property_id")
-                property_data["db_name"] = "Realtor"
-
-                normalized_data.append(property_data)
-            
-            return normalized_data
 
+            return [
+                Realtor.normalize.listing(property).to_dict()
+                for property in property_list
+            ]
 
 
+        @staticmethod
+        def property_search_batch(response_data) -> ListingBatch:
+            """
+            'property_search' as a columnar 'ListingBatch'
+            """
+            return ListingBatch.from_listings(
+                Realtor.normalize.listing(property)
+                for property in response_data.get("data", {}).get("home_search", {}).get("properties", [])
+            )
+
+
+        @staticmethod
+        def property_search_views(response_data) -> list[LazyView]:
+            """
+            'property_search' as lazy views, for callers that read a few fields
+            """
+            return [
+                Realtor.normalize.view(property)
+                for property in response_data.get("data", {}).get("home_search", {}).get("properties", [])
+            ]
+
+
+        # Listing field -> search result path (see '_fieldmap')
+        fields = {
+            "images": Field("photos", convert=lambda photos: RealtorPhotos(tuple(
+                photo["href"] for photo in photos or [] if photo.get("href")
+            ))),
+            "num_beds": "description.beds",
+            "num_baths": Field("description.baths_consolidated", convert=lambda baths: float(str(baths or "0").split('+')[0])),
+            "address.city": "location.address.city",
+            "address.country_code": Const("US"),
+            "address.county": "location.county.name",
+            "address.postal_code": "location.address.postal_code",
+            "address.state": "location.address.state",
+            "address.street": "location.address.line",
+            "address.lat": "location.address.coordinate.lat",
+            "address.lon": "location.address.coordinate.lon",
+            "price": "list_price",
+            "price_history": Field(
+                "description.sold_price", "description.sold_date",
+                convert=lambda price, date: [{"price": price, "date": date}] if price else [],
+            ),
+            "status": "status",
+            "db_listing_id": "listing_id",
+            "db_property_id": "property_id",
+            "db_name": Const("Realtor"),
+        }
+
+        # Single listing -> 'Listing', e.g. one streamed by 'iter_query_search'
+        listing = staticmethod(compile_extractor(fields))
+
+        # Lazy counterpart of 'listing': normalizes fields on first access
+        view = compile_view(fields, name="RealtorListingView")
+
+        # What 'property_search' reads from a search response, so the rest of
+        # each listing is skipped while decoding (see 'ResponseDecoder.decode')
+        search_paths = spec_paths(fields, "data.home_search.properties.*")
+
+        # 'listing' over the typed records of '_schemas'
+        typed_listing = staticmethod(compile_extractor(fields, attrs=True))
+
+        # PropertyDetails field -> path into the decoded detail queries
+        # ({"details": FullPropertyDetails, "history": PropertyAndTaxHistory,
+        # "gallery": GetAugmentedGallery})
+        details_fields = {
+            "primary_agent.agency_name": Field("details.data.home.advertisers", convert=lambda advertisers: (_seller(advertisers).get("office") or {}).get("name")),
+            "primary_agent.email": Field("details.data.home.advertisers", convert=lambda advertisers: _seller(advertisers).get("email")),
+            "primary_agent.office_email": Field("details.data.home.advertisers", convert=lambda advertisers: (_seller(advertisers).get("office") or {}).get("email")),
+            "primary_agent.name": Field("details.data.home.advertisers", convert=lambda advertisers: _seller(advertisers).get("name")),
+            "primary_agent.key": Field("details.data.home.advertisers", convert=lambda advertisers: _seller(advertisers).get("fulfillment_id")),
+            "primary_agent.role": Field("details.data.home.advertisers", convert=lambda advertisers: _seller(advertisers).get("type")),
+            "primary_agent.url": Field("details.data.home.advertisers", convert=lambda advertisers: _seller(advertisers).get("href")),
+            "primary_agent.phone": Field("details.data.home.advertisers", convert=lambda advertisers: _phone(_seller(advertisers).get("phones"))),
+            "primary_agent.office_phone": Field("details.data.home.advertisers", convert=lambda advertisers: _phone((_seller(advertisers).get("office") or {}).get("phones"))),
+            "amenities": Field("details.data.home.details", convert=lambda details: [
+                {"category": detail.get("parent_category"), "name": detail.get("category"), "values": detail.get("text") or []}
+                for detail in details or []
+            ]),
+            "images": Field("gallery.data.home.augmented_gallery", "details.data.home.photos", convert=_gallery_photos),
+            "mls_info": Field("details.data.home.source", convert=lambda source: {
+                "id": source.get("id"),
+                "name": source.get("name"),
+                "listing_id": source.get("listing_id"),
+            } if source else {}),
+            "num_beds": "details.data.home.description.beds",
+            "num_baths": Field("details.data.home.description.baths_consolidated", convert=lambda baths: None if baths == None else float(str(baths).split('+')[0])),
+            "has_garage": Field("details.data.home.description.garage", convert=lambda garage: None if garage == None else bool(garage)),
+            "address.city": "details.data.home.location.address.city",
+            "address.country_code": Const("US"),
+            "address.county": "details.data.home.location.county.name",
+            "address.neighborhood": Field("details.data.home.location.neighborhoods", convert=lambda neighborhoods: _first(neighborhoods).get("name")),
+            "address.postal_code": "details.data.home.location.address.postal_code",
+            "address.state": "details.data.home.location.address.state",
+            "address.street": "details.data.home.location.address.line",
+            "address.lat": "details.data.home.location.address.coordinate.lat",
+            "address.lon": "details.data.home.location.address.coordinate.lon",
+            "price_history": Field("history.data.home.property_history", convert=lambda events: [
+                {
+                    "date": event.get("date"),
+                    "event": event.get("event_name"),
+                    "price": event.get("price"),
+                    "source": event.get("source_name"),
+                }
+                for event in events or []
+            ]),
+            "db_listing_id": "details.data.home.listing_id",
+            "db_property_id": "details.data.home.property_id",
+            "db_name": Const("Realtor"),
+        }
+
+        # Decoded detail queries -> 'PropertyDetails'
+        details = staticmethod(compile_extractor(
+            details_fields,
+            factory=PropertyDetails,
+            nested={"address": Address, "primary_agent": Agent},
+            name="property_details",
+        ))
+
+
+        @staticmethod
+        def search_response(r) -> list[dict]:
+            """
+            Decode + normalize a search response: straight into its typed
+            schema when msgspec is installed (a payload that drifted from it
+            raises 'SchemaError'), else through the selective decoder
+            """
+            return Realtor.normalize.search_page(r)[0]
+
+
+        @staticmethod
+        def search_page(r) -> tuple[list[dict], int | None]:
+            """
+            'search_response' plus the search's total result count
+            """
+            if MSGSPEC_AVAILABLE:
+                from ._schemas import decode_search_page
+                properties, total = decode_search_page(r, "realtor", ("data", "home_search", "total"))
+                return [Realtor.normalize.typed_listing(property).to_dict() for property in properties], total
+            data = decode_json(r, "realtor", Realtor.normalize.search_paths + ("data.home_search.total",))
+            return Realtor.normalize.property_search(data), always_get("home_search", always_get("data", data, {}), {}).get("total")
+
+
+
+
+
+
+class AsyncRealtor(Realtor):
+    """
+    Awaitable twin of 'Realtor'
+
+    Every public method is a coroutine sent over the pool's async client, so
+    many searches can run concurrently on a single event loop. Methods take
+    the same parameters as their 'Realtor' counterparts.
+    """
+
+    async def map_search(self, coordinates:tuple[float], **kwargs):
+        req = self.request.map_search(coordinates, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "realtor")
+
+        return rawdata
+
+
+    async def query_search(self, query_string, **kwargs):
+        req = self.request.query_search(query_string=query_string, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        data = self.normalize.search_response(r)
+
+        return data
+
+
+    async def iter_query_search(self, query_string, **kwargs):
+        req = self.request.query_search(query_string=query_string, **kwargs)
+        req.extensions["stream"] = True
+
+        r = await self.pool.asend(req, stream=True)
+
+        async for property in aiter_listings(r, "realtor"):
+            yield self.normalize.listing(property).to_dict()
+
+
+    async def paginate_query_search(
+            self,
+            query_string,
+            limit=200,
+            max_in_flight: int = 8,
+            ordered: bool = True,
+            max_pages: int | None = None,
+            **kwargs
+        ):
+        async for listing in apaginate(*self._pages(query_string, limit, **kwargs), pool=self.pool, max_in_flight=max_in_flight, ordered=ordered, max_pages=max_pages):
+            yield listing
+
+
+    async def city_search(self, city, **kwargs):
+        req = Realtor.request.query_search(city, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "realtor")
+
+        return rawdata
+
+
+    async def property_details(self, property_id):
+        return await self._fetch_json(self.request.property_details(property_id))
+
+
+    async def property_and_tax_history(self, property_id):
+        return await self._fetch_json(self.request.property_and_tax_history(property_id))
+
+
+    async def property_school_data(self, property_id):
+        return await self._fetch_json(self.request.property_school_data(property_id))
+
+
+    async def property_estimates(self, property_id, historical_year_start=None, historical_year_end=None, month_forecast_count=None):
+        req = self._property_estimates_request(property_id, historical_year_start, historical_year_end, month_forecast_count)
+        return await self._fetch_json(req)
+
+
+    async def property_saves(self, property_id):
+        return await self._fetch_json(self.request.property_saves(property_id))
+
+
+    async def property_gallery(self, property_id):
+        return await self._fetch_json(self.request.property_gallery(property_id))
+
+
+    async def property_details_full(self, property_id) -> dict:
+        responses = await afetch_named(self._details_requests(property_id), pool=self.pool)
+
+        return self.normalize.details(self._details_data(responses)).to_dict()
+
+
+    async def _fetch_json(self, req: httpx.Request):
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "realtor")
+
+        return rawdata
@@ -1,13 +1,47 @@
+import asyncio
 from typing import Literal
+from typing import Callable
 from copy import deepcopy
 
 import httpx
-import orjson
 
 from ._geo import get_bounding_box
 from ._util import readjson
 from ._util import always_get
 from ._http import fetch_bulk
+from ._http import fetch_named
+from ._http import afetch_named
+from ._http import get_pool
+from ._http import ClientPool
+from ._http import decode_json
+from ._http import register_decoder
+from ._http import get_background_loop
+from ._jsonstream import iter_listings
+from ._jsonstream import aiter_listings
+from ._batch import ListingBatch
+from ._models import Agent
+from ._models import Address
+from ._models import PropertyDetails
+from ._photos import RedfinPhotos
+from ._fieldmap import Field
+from ._fieldmap import Const
+from ._fieldmap import LazyView
+from ._fieldmap import compile_view
+from ._fieldmap import compile_extractor
+from ._fieldmap import spec_paths
+from ._selective import MSGSPEC_AVAILABLE
+from ._paginate import paginate
+from ._paginate import apaginate
+from ._paginate import apages
+from ._delta import Delta
+from ._delta import DeltaStore
+from ._delta import adelta
+from ._delta import reject_sort
+from ._delta import window_days
+from ._crawl import Tile
+from ._crawl import DensityMap
+from ._crawl import AreaCrawler
+from ._jobs import Job
 from .paths import JSON_DIR
 from ._constants import RF_UIPT_MAP
 from ._constants import RF_POOL_TYPE_MAP
@@ -15,9 +49,34 @@ from ._constants import RF_REGION_TYPE_MAP
 from ._constants import RF_FINANCING_TYPE_MAP
 from ._constants import RF_REGION_TYPE_REVERSE_MAP
 
+
+# Redfin prefixes its JSON with "{}&&" to defeat JSON hijacking
+register_decoder("redfin", prefix=b"{}&&", root=("payload", "homes"))
+
+
+def _first(items: list | None) -> dict:
+    return items[0] if items else {}
+
+
+def _amenities(super_groups: list | None) -> list[dict]:
+    """
+    Flatten 'amenitiesInfo.superGroups' into {category, name, values} rows
+    """
+    amenities = []
+    for super_group in super_groups or []:
+        for group in super_group.get("amenityGroups") or []:
+            for entry in group.get("amenityEntries") or []:
+                amenities.append({
+                    "category": group.get("groupTitle"),
+                    "name": entry.get("amenityName"),
+                    "values": entry.get("amenityValues") or [],
+                })
+    return amenities
+
+
 class Redfin:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
     
 
     def map_search(
@@ -43,10 +102,9 @@ class Redfin:
                                       time_on_market_range=time_on_market_range, redfin_listings_only=redfin_listings_only,
                                       financing_type=financing_type, pool_type=pool_type, sort_by=sort_by)
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
+        rawdata = decode_json(r, "redfin")
 
         return rawdata
 
@@ -58,11 +116,11 @@ class Redfin:
         ):
         req = self.request.query_region(query)
 
-        client = httpx.Client()
+        client = self.pool.client
 
         r = client.send(req)
         
-        rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
+        rawdata = decode_json(r, "redfin")
 
         lookup_data = self._compact_region_data(rawdata)
         region_id = lookup_data.get("regions", [{}])[0].get("id", {}).get("tableId")
@@ -71,22 +129,244 @@ class Redfin:
         req = self.request.search_by_region_id(region_id, region_type, **kwargs)
         r = client.send(req)
 
-        rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
-        
-        client.close()
-
-        data = self.normalize.property_search(rawdata)
+        data = self.normalize.search_response(r)
         return data
-        return rawdata
+
+
+    def iter_query_search(self, query: str, **kwargs):
+        """
+        Streaming 'query_search'
+
+        Listings are parsed out of the search response while it downloads
+        and yielded normalized, one at a time, instead of decoding the whole
+        payload first. Takes the same parameters as 'query_search'
+        """
+        client = self.pool.client
+
+        req = self.request.query_region(query)
+        r = client.send(req)
+
+        rawdata = decode_json(r, "redfin")
+
+        lookup_data = self._compact_region_data(rawdata)
+        region_id = lookup_data.get("regions", [{}])[0].get("id", {}).get("tableId")
+        region_type = lookup_data.get("regions", [{}])[0].get("id", {}).get("type")
+
+        req = self.request.search_by_region_id(region_id, region_type, **kwargs)
+        req.extensions["stream"] = True
+        r = client.send(req, stream=True)
+
+        for home in iter_listings(r, "redfin"):
+            yield self.normalize.listing(home).to_dict()
+
+
+    def paginate_query_search(
+            self,
+            query: str,
+            num_homes=350,
+            max_in_flight: int = 8,
+            ordered: bool = True,
+            max_pages: int | None = None,
+            **kwargs
+        ):
+        """
+        Every page of 'query_search', one normalized listing at a time
+
+        gis responses don't say how many homes matched, so pages are fetched
+        'max_in_flight' at a time until one comes back short (see
+        '_paginate'). Listings are deduped by listing id
+
+        Parameters
+        ----------
+        query: str
+            Location to search, e.g. "Naperville, IL"
+
+        num_homes: int
+            Homes per page
+
+        max_in_flight: int
+            Upper bound on pages requested at once
+
+        ordered: bool
+            Yield pages in order. If False, pages are yielded as they arrive
+
+        max_pages: int | None
+            Stop after this many pages
+
+        **kwargs
+            Other 'search_by_region_id' filters
+        """
+        r = self.pool.send(self.request.query_region(query))
+
+        pages = self._pages(decode_json(r, "redfin"), num_homes, **kwargs)
+
+        return paginate(*pages, pool=self.pool, max_in_flight=max_in_flight, ordered=ordered, max_pages=max_pages)
+
+
+    def _pages(self, region_data, num_homes=350, **kwargs):
+        lookup_data = self._compact_region_data(region_data)
+        region_id = lookup_data.get("regions", [{}])[0].get("id", {}).get("tableId")
+        region_type = lookup_data.get("regions", [{}])[0].get("id", {}).get("type")
+
+        def page_request(page: int) -> httpx.Request:
+            return self.request.search_by_region_id(region_id, region_type, num_homes=num_homes, page_number=page, **kwargs)
+
+        return page_request, self.normalize.search_page, int(num_homes)
+
+
+    def delta_query_search(
+            self,
+            query: str,
+            store: DeltaStore,
+            num_homes=350,
+            full: bool = False,
+            windowed: bool = False,
+            max_in_flight: int = 2,
+            **kwargs
+        ) -> Delta:
+        """
+        What was added, changed (price or status) or removed in a region
+        since the last delta crawl of it
+
+        Pages are requested newest listing first and the crawl stops at the
+        first page with nothing new (see '_delta'). Redfin has no "recently
+        changed" sort, so a price or status change on a listing older than
+        the stop point is missed; run with 'full=True' periodically to catch
+        those (and removals)
+
+        Parameters
+        ----------
+        query: str
+            Location to search, e.g. "Naperville, IL"
+
+        store: DeltaStore
+            Watermarks and fingerprints of earlier crawls
+
+        num_homes: int
+            Homes per page
+
+        full: bool
+            Walk every page, which is what reports removals
+
+        windowed: bool
+            Also filter the search to homes listed since the watermark
+            ('time_on_market_range'). Fewer pages, but changes to older
+            listings are missed
+
+        max_in_flight: int
+            Upper bound on pages requested at once. Pages past the stopping
+            point are wasted, so keep this low
+
+        **kwargs
+            Other 'search_by_region_id' filters, except 'sort_by'
+        """
+        reject_sort(kwargs, "sort_by")
+
+        r = self.pool.send(self.request.query_region(query))
+
+        crawl = self._delta(query, decode_json(r, "redfin"), store, num_homes, full, windowed, max_in_flight, **kwargs)
+
+        return get_background_loop().run(crawl)
+
+
+    def _delta(self, query, region_data, store, num_homes=350, full=False, windowed=False, max_in_flight=2, **kwargs):
+        region = f"redfin:{query}"
+
+        days = window_days(store.watermark(region), (1, 3, 7, 14, 30)) if windowed and not full else None
+        if days != None:
+            kwargs["time_on_market_range"] = f"{days}-"
+
+        pages = self._pages(region_data, num_homes, sort_by="days-on-redfin-asc", **kwargs)
+
+        return adelta(
+            apages(*pages, pool=self.pool, max_in_flight=max_in_flight),
+            store,
+            region,
+            full=full,
+            windowed=days != None,
+            )
+
+
+    def crawl_area(
+            self,
+            area: dict | list[tuple[float, float]],
+            num_homes=350,
+            density: DensityMap | None = None,
+            max_depth: int = 8,
+            max_in_flight: int = 8,
+            job: Job | None = None,
+            on_error: Callable[[Tile, BaseException], None] | None = None,
+            **kwargs
+        ):
+        """
+        Every home in an area, past the 'num_homes' cap of a single gis search
+
+        The area is split into quadrants wherever a search comes back full
+        (see '_crawl'); listings are deduped by listing id
+
+        Parameters
+        ----------
+        area: dict | list[tuple[float, float]]
+            A bounding box ({"north", "south", "east", "west"}) or a
+            (lat, lon) polygon
+
+        num_homes: int
+            Homes per tile search, which is also the cap tiles are split at
+
+        density: DensityMap | None
+            Tile counts from earlier crawls, used to split dense tiles up front
+
+        max_depth: int
+            Deepest split
+
+        max_in_flight: int
+            Upper bound on tiles requested at once
+
+        job: Job | None
+            Journal the tiles in this job, so an interrupted crawl resumes
+            where it stopped. The listings are then returned once the crawl
+            is complete instead of streamed
+
+        on_error: Callable[[Tile, BaseException], None] | None
+            Called with each tile whose search fails. The crawl skips it and
+            carries on (with a job, it's journaled as failed and retried on
+            the next run)
+
+        **kwargs
+            Other 'polygon_search' filters
+        """
+        crawler = self._crawler(num_homes, density, max_depth, max_in_flight, on_error, **kwargs)
+
+        if job != None:
+            return iter(crawler.run_job(area, job))
+
+        return crawler.crawl(area)
+
+
+    def _crawler(self, num_homes=350, density=None, max_depth=8, max_in_flight=8, on_error=None, **kwargs) -> AreaCrawler:
+        def tile_request(tile: Tile) -> httpx.Request:
+            return self.request.polygon_search(tile.polygon(), num_homes=num_homes, **kwargs)
+
+        return AreaCrawler(
+            "redfin",
+            tile_request,
+            self.normalize.search_page,
+            int(num_homes),
+            pool=self.pool,
+            density=density,
+            max_depth=max_depth,
+            max_in_flight=max_in_flight,
+            filters=kwargs,
+            on_error=on_error,
+            )
 
 
     def region_lookup(self, query:str):
         req = self.request.query_region(query)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
+        rawdata = decode_json(r, "redfin")
 
         data = self._compact_region_data(rawdata)
 
@@ -130,10 +410,9 @@ class Redfin:
             sort_by=sort_by
         )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
+        rawdata = decode_json(r, "redfin", ("payload.homes",))
 
         data = rawdata.get("payload", {}).get("homes")
 
@@ -162,10 +441,9 @@ class Redfin:
                                          time_on_market_range=time_on_market_range, redfin_listings_only=redfin_listings_only,
                                          financing_type=financing_type, pool_type=pool_type, sort_by=sort_by)
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content.replace(b"{}&&", b""))
+        rawdata = decode_json(r, "redfin")
 
         return rawdata
 
@@ -188,17 +466,46 @@ class Redfin:
             self.request.property_parcel_info(property_id, listing_id),
         ]
 
-        responses = fetch_bulk(request_list)
+        responses = fetch_bulk(request_list, pool=self.pool)
 
         all_data = {}
         for r in responses:
             endpoint = r.url.path[r.url.path.rfind("/")+1:]
-            all_data[endpoint] = orjson.loads(r.content.replace(b"{}&&", b""))
+            all_data[endpoint] = decode_json(r, "redfin")
         
 
         return all_data
 
 
+    def property_details_full(self, property_id, listing_id=None) -> dict:
+        """
+        Normalized property details (the schema of json/property_details.jsonc)
+
+        The sub-endpoints the schema is read from are fetched concurrently
+        over the pool, so this takes as long as the slowest of them
+        """
+        responses = fetch_named(self._details_requests(property_id, listing_id), pool=self.pool)
+
+        return self.normalize.details(self._details_data(responses, property_id, listing_id)).to_dict()
+
+
+    def _details_requests(self, property_id, listing_id=None) -> dict[str, httpx.Request]:
+        return {
+            "aboveTheFold": self.request.above_the_fold(property_id, listing_id),
+            "belowTheFold": self.request.below_the_fold(property_id, listing_id),
+        }
+
+
+    @staticmethod
+    def _details_data(responses: dict[str, httpx.Response], property_id, listing_id=None) -> dict:
+        # A failed sub-endpoint leaves its fields empty instead of failing
+        # the whole record
+        data = {name: decode_json(r, "redfin") for name, r in responses.items() if r.status_code == 200}
+        data["propertyId"] = property_id
+        data["listingId"] = listing_id
+        return data
+
+
     def _compact_region_data(self, rawdata):
         data = []
 
@@ -384,6 +691,7 @@ class Redfin:
             financing_type:Literal["FHA", "VA"]=None,
             pool_type:Literal["private", "community", "private_or_community", "no_private_pool"]=None,
             sort_by=None,
+            page_number=1,
             ):
 
             url = "https://www.redfin.com/stingray/api/gis"
@@ -419,10 +727,10 @@ class Redfin:
                 "num_baths": num_baths,
                 "num_homes": num_homes,
                 "ord": sort_by,
-                "page_number": "1",
+                "page_number": str(page_number),
                 "pool_types": pool_type,
                 "sf": sf,
-                "start": "0",
+                "start": str((int(page_number) - 1) * int(num_homes)),
                 "status": "9",
                 "uipt": ",".join(home_types),
                 "v": "8",
@@ -612,88 +920,320 @@ class Redfin:
     class normalize:
         @staticmethod
         def property_search(response_data):
-            # Load the template
-            template = readjson(JSON_DIR.joinpath("listing_search.json"))
-            
-            normalized_data = []
-            i = 0
-            for property in response_data.get("payload", {}).get("homes", []):
-                i += 1
-                property_data = deepcopy(template)
-
-                # mls_id = always_get("mlsId", property, {}).get("value")
-                mls_id = property.get("mlsId", {}).get("value")
-                datasource_id = property.get("dataSourceId")
-                
-                # Address information
-                property_data["address"]["street"] = always_get("streetLine", property, {}).get("value")
-                property_data["address"]["city"] = property.get("city")
-                property_data["address"]["state"] = property.get("state")
-                property_data["address"]["postal_code"] = always_get("postalCode", property, {}).get("value")
-                property_data["address"]["country_code"] = property.get("countryCode", "US")
-                print(property["url"])
-                # Latitude and Longitude
-                _latlong = always_get("latLong", property, {}).get("value", {})
-                property_data["address"]["lat"] = _latlong.get("latitude")
-                property_data["address"]["lon"] = _latlong.get("longitude")
-                
-                # Price information
-                property_data["price"] = always_get("price", property, {}).get("value")
-                
-                # Number of beds and baths
-                property_data["num_beds"] = property.get("beds")
-                property_data["num_baths"] = property.get("baths")
-                
-                # Images
-                property_data["images"] = []
-                image_keys: str = always_get("photos", property, {}).get("value")
-                if image_keys:
-                    property_data["images"].extend(parse_photos(image_keys, mls_id, datasource_id))
-
-                # property_data["images"] = [
-                #     always_get("photos", property, {}).get("value")
-                # ]
-                
-                # Agent information
-                _agent = always_get("listingAgent", property, {})
-                property_data["agent_name"] = _agent.get("name")
-                property_data["agency_name"] = None  # No agency info in Redfin data
-                
-                # Price history (not available in the Redfin sample data)
-                property_data["price_history"] = []
-                
-                # Database fields
-                property_data["db_listing_id"] = property.get("listingId")
-                property_data["db_property_id"] = property.get("propertyId")
-                property_data["db_name"] = "Redfin"
-
-                normalized_data.append(property_data)
-            
-            return normalized_data
+            return [
+                Redfin.normalize.listing(property).to_dict()
+                for property in response_data.get("payload", {}).get("homes", [])
+            ]
 
 
-def parse_photos(photos_value, mls_id, datasource_id):
-    base_url = f"https://ssl.cdn-redfin.com/photo/{datasource_id}/bigphoto/{mls_id[-3:]}/{mls_id}"
-    
-    photo_urls = []
+        @staticmethod
+        def property_search_batch(response_data) -> ListingBatch:
+            """
+            'property_search' as a columnar 'ListingBatch'
+            """
+            return ListingBatch.from_listings(
+                Redfin.normalize.listing(property)
+                for property in response_data.get("payload", {}).get("homes", [])
+            )
 
-    photo_ranges = photos_value.split(",")
 
-    for item in photo_ranges:
-        range_part, level = item.split(":")
-        level = str(level).strip()
-            
-        if "-" in range_part:
-            start, end = map(int, range_part.split("-"))
-        else:
-            start = end = int(range_part)
+        @staticmethod
+        def property_search_views(response_data) -> list[LazyView]:
+            """
+            'property_search' as lazy views, for callers that read a few fields
+            """
+            return [
+                Redfin.normalize.view(property)
+                for property in response_data.get("payload", {}).get("homes", [])
+            ]
+
+
+        # Listing field -> search result path (see '_fieldmap')
+        fields = {
+            "images": Field(
+                "photos.value", "mlsId.value", "dataSourceId",
+                convert=lambda keys, mls_id, datasource_id: RedfinPhotos(keys, mls_id, datasource_id) if keys else [],
+            ),
+            "num_beds": "beds",
+            "num_baths": "baths",
+            "address.city": "city",
+            "address.country_code": Field("countryCode", default="US"),
+            "address.postal_code": "postalCode.value",
+            "address.state": "state",
+            "address.street": "streetLine.value",
+            "address.lat": "latLong.value.latitude",
+            "address.lon": "latLong.value.longitude",
+            "price": "price.value",
+            # Price history is not available in Redfin search results
+            "status": "mlsStatus",
+            "agent_name": "listingAgent.name",
+            "db_listing_id": "listingId",
+            "db_property_id": "propertyId",
+            "db_name": Const("Redfin"),
+        }
+
+        # Single listing -> 'Listing', e.g. one streamed by 'iter_query_search'
+        listing = staticmethod(compile_extractor(fields))
+
+        # Lazy counterpart of 'listing': normalizes fields on first access
+        view = compile_view(fields, name="RedfinListingView")
+
+        # What 'property_search' reads from a search response, so the rest of
+        # each listing is skipped while decoding (see 'ResponseDecoder.decode')
+        search_paths = spec_paths(fields, "payload.homes.*")
+
+        # 'listing' over the typed records of '_schemas'
+        typed_listing = staticmethod(compile_extractor(fields, attrs=True))
+
+        # PropertyDetails field -> path into the decoded detail sub-endpoints
+        # ({"aboveTheFold": ..., "belowTheFold": ..., "propertyId": ..., "listingId": ...})
+        details_fields = {
+            "primary_agent.name": Field(
+                "aboveTheFold.payload.mainHouseInfo.listingAgents",
+                convert=lambda agents: _first(agents).get("agentInfo", {}).get("agentName"),
+            ),
+            "primary_agent.agency_name": Field(
+                "aboveTheFold.payload.mainHouseInfo.listingAgents",
+                convert=lambda agents: _first(agents).get("brokerName"),
+            ),
+            "primary_agent.role": Const("listing_agent"),
+            "amenities": Field("belowTheFold.payload.amenitiesInfo.superGroups", convert=_amenities),
+            "images": Field("aboveTheFold.payload.mediaBrowserInfo.photos", convert=lambda photos: [
+                url for photo in photos or [] if (url := (photo.get("photoUrls") or {}).get("fullScreenPhotoUrl"))
+            ]),
+            "num_beds": "aboveTheFold.payload.addressSectionInfo.beds",
+            "num_baths": "aboveTheFold.payload.addressSectionInfo.baths",
+            "address.city": "aboveTheFold.payload.addressSectionInfo.city",
+            "address.country_code": Field("aboveTheFold.payload.addressSectionInfo.countryCode", default="US"),
+            "address.county": "belowTheFold.payload.publicRecordsInfo.countyName",
+            "address.postal_code": "aboveTheFold.payload.addressSectionInfo.zip",
+            "address.state": "aboveTheFold.payload.addressSectionInfo.state",
+            "address.street": "aboveTheFold.payload.addressSectionInfo.streetAddress.assembledAddress",
+            "address.lat": "aboveTheFold.payload.addressSectionInfo.latLong.latitude",
+            "address.lon": "aboveTheFold.payload.addressSectionInfo.latLong.longitude",
+            "price_history": Field("belowTheFold.payload.propertyHistoryInfo.events", convert=lambda events: [
+                {
+                    "date": event.get("eventDate"),
+                    "event": event.get("eventDescription"),
+                    "price": event.get("price"),
+                    "source": event.get("source"),
+                }
+                for event in events or []
+            ]),
+            "db_listing_id": Field("listingId", convert=lambda listing_id: None if listing_id == None else str(listing_id)),
+            "db_property_id": Field("propertyId", convert=str),
+            "db_name": Const("Redfin"),
+        }
+
+        # Decoded detail sub-endpoints -> 'PropertyDetails'
+        details = staticmethod(compile_extractor(
+            details_fields,
+            factory=PropertyDetails,
+            nested={"address": Address, "primary_agent": Agent},
+            name="property_details",
+        ))
 
-        for photo_id in range(start, end + 1):
-            if str(photo_id) == "0" and str(level) == "0":
-                # Special case: no level for photo ID 0 and level 0
-                photo_url = f"{base_url}_0.jpg"
-            else:
-                photo_url = f"{base_url}_{photo_id}_{level}.jpg"
-            photo_urls.append(photo_url)
 
-    return photo_urls
\ No newline at end of file
+        @staticmethod
+        def search_response(r) -> list[dict]:
+            """
+            Decode + normalize a search response: straight into its typed
+            schema when msgspec is installed (a payload that drifted from it
+            raises 'SchemaError'), else through the selective decoder
+            """
+            if MSGSPEC_AVAILABLE:
+                from ._schemas import decode_search
+                return [Redfin.normalize.typed_listing(property).to_dict() for property in decode_search(r, "redfin")]
+            return Redfin.normalize.property_search(decode_json(r, "redfin", Redfin.normalize.search_paths))
+
+
+        @staticmethod
+        def search_page(r) -> tuple[list[dict], None]:
+            """
+            'search_response' for the paginator: gis responses carry no
+            result count, so there's no page count either
+            """
+            return Redfin.normalize.search_response(r), None
+
+
+class AsyncRedfin(Redfin):
+    """
+    Awaitable twin of 'Redfin'
+
+    Every public method is a coroutine sent over the pool's async client, so
+    many searches can run concurrently on a single event loop. Methods take
+    the same parameters as their 'Redfin' counterparts.
+    """
+
+    async def map_search(self, coordinates:tuple[float], **kwargs):
+        req = self.request.map_search(coordinates=coordinates, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "redfin")
+
+        return rawdata
+
+
+    async def query_search(self, query: str, **kwargs):
+        req = self.request.query_region(query)
+
+        client = self.pool.async_client
+
+        r = await client.send(req)
+
+        rawdata = decode_json(r, "redfin")
+
+        lookup_data = self._compact_region_data(rawdata)
+        region_id = lookup_data.get("regions", [{}])[0].get("id", {}).get("tableId")
+        region_type = lookup_data.get("regions", [{}])[0].get("id", {}).get("type")
+
+        req = self.request.search_by_region_id(region_id, region_type, **kwargs)
+        r = await client.send(req)
+
+        data = self.normalize.search_response(r)
+        return data
+
+
+    async def iter_query_search(self, query: str, **kwargs):
+        client = self.pool.async_client
+
+        req = self.request.query_region(query)
+        r = await client.send(req)
+
+        rawdata = decode_json(r, "redfin")
+
+        lookup_data = self._compact_region_data(rawdata)
+        region_id = lookup_data.get("regions", [{}])[0].get("id", {}).get("tableId")
+        region_type = lookup_data.get("regions", [{}])[0].get("id", {}).get("type")
+
+        req = self.request.search_by_region_id(region_id, region_type, **kwargs)
+        req.extensions["stream"] = True
+        r = await client.send(req, stream=True)
+
+        async for home in aiter_listings(r, "redfin"):
+            yield self.normalize.listing(home).to_dict()
+
+
+    async def paginate_query_search(
+            self,
+            query: str,
+            num_homes=350,
+            max_in_flight: int = 8,
+            ordered: bool = True,
+            max_pages: int | None = None,
+            **kwargs
+        ):
+        r = await self.pool.asend(self.request.query_region(query))
+
+        pages = self._pages(decode_json(r, "redfin"), num_homes, **kwargs)
+
+        async for listing in apaginate(*pages, pool=self.pool, max_in_flight=max_in_flight, ordered=ordered, max_pages=max_pages):
+            yield listing
+
+
+    async def delta_query_search(
+            self,
+            query: str,
+            store: DeltaStore,
+            num_homes=350,
+            full: bool = False,
+            windowed: bool = False,
+            max_in_flight: int = 2,
+            **kwargs
+        ) -> Delta:
+        reject_sort(kwargs, "sort_by")
+
+        r = await self.pool.asend(self.request.query_region(query))
+
+        return await self._delta(query, decode_json(r, "redfin"), store, num_homes, full, windowed, max_in_flight, **kwargs)
+
+
+    async def crawl_area(
+            self,
+            area: dict | list[tuple[float, float]],
+            num_homes=350,
+            density: DensityMap | None = None,
+            max_depth: int = 8,
+            max_in_flight: int = 8,
+            job: Job | None = None,
+            on_error: Callable[[Tile, BaseException], None] | None = None,
+            **kwargs
+        ):
+        crawler = self._crawler(num_homes, density, max_depth, max_in_flight, on_error, **kwargs)
+
+        if job != None:
+            for listing in await crawler.arun_job(area, job):
+                yield listing
+            return
+
+        async for listing in crawler.acrawl(area):
+            yield listing
+
+
+    async def region_lookup(self, query:str):
+        req = self.request.query_region(query)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "redfin")
+
+        data = self._compact_region_data(rawdata)
+
+        return data
+
+
+    async def search_by_region_id(self, region_id, region_type:Literal["zipcode", "city", "county", "neighborhood"], **kwargs):
+        req = self.request.search_by_region_id(region_id=region_id, region_type=region_type, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "redfin", ("payload.homes",))
+
+        data = rawdata.get("payload", {}).get("homes")
+
+        return data
+
+
+    async def polygon_search(self, coordinates_list:list[tuple[float, float]], **kwargs):
+        req = self.request.polygon_search(coordinates_list=coordinates_list, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "redfin")
+
+        return rawdata
+
+
+    async def property_details(self, property_id, listing_id=None):
+        request_list = [
+            self.request.above_the_fold(property_id, listing_id),
+            self.request.below_the_fold(property_id, listing_id),
+            self.request.avm(property_id, listing_id),
+            self.request.property_parcel_info(property_id, listing_id),
+        ]
+
+        client = self.pool.async_client
+
+        responses = await asyncio.gather(*(client.send(req) for req in request_list))
+
+        all_data = {}
+        for r in responses:
+            endpoint = r.url.path[r.url.path.rfind("/")+1:]
+            all_data[endpoint] = decode_json(r, "redfin")
+
+        return all_data
+
+
+    async def property_details_full(self, property_id, listing_id=None) -> dict:
+        responses = await afetch_named(self._details_requests(property_id, listing_id), pool=self.pool)
+
+        return self.normalize.details(self._details_data(responses, property_id, listing_id)).to_dict()
+
+
+def parse_photos(photos_value, mls_id, datasource_id):
+    """
+    Expand a 'photos.value' range string into the full list of photo URLs
+    (see 'RedfinPhotos' for the lazy form)
+    """
+    return RedfinPhotos(photos_value, mls_id, datasource_id).urls()
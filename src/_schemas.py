@@ -0,0 +1,309 @@
+from typing import Any
+
+import msgspec
+from msgspec import Struct
+from msgspec import field
+from httpx import Response
+
+from ._http import SchemaError
+from ._http import get_decoder
+
+
+# Typed schemas of the hot provider responses (requires msgspec)
+#
+# Only the fields the normalizers read are declared; msgspec skips every
+# other key while decoding, so search responses go straight from bytes into
+# these Structs. Identity fields are required and every declared field is
+# type checked, so a provider changing its payload raises 'SchemaError'
+# instead of quietly normalizing to None. Photo lists stay plain dicts.
+#
+# Field names are the JSON keys, which lets the provider 'fields' specs
+# compile to attribute access ('compile_extractor(..., attrs=True)').
+
+
+# Redfin gis: payload.homes
+class RedfinText(Struct):
+    value: str | None = None
+
+
+class RedfinNumber(Struct):
+    value: int | float | None = None
+
+
+class RedfinLatLong(Struct):
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+class RedfinLatLongValue(Struct):
+    value: RedfinLatLong | None = None
+
+
+class RedfinAgent(Struct):
+    name: str | None = None
+
+
+class RedfinHome(Struct, kw_only=True):
+    propertyId: int
+    listingId: int | None = None
+    mlsId: RedfinText | None = None
+    dataSourceId: int | None = None
+    beds: int | None = None
+    baths: float | None = None
+    city: str | None = None
+    state: str | None = None
+    countryCode: str | None = "US"
+    postalCode: RedfinText | None = None
+    streetLine: RedfinText | None = None
+    latLong: RedfinLatLongValue | None = None
+    price: RedfinNumber | None = None
+    mlsStatus: str | None = None
+    photos: RedfinText | None = None
+    listingAgent: RedfinAgent | None = None
+
+
+class RedfinPayload(Struct):
+    homes: list[RedfinHome] = field(default_factory=list)
+
+
+class RedfinSearch(Struct):
+    payload: RedfinPayload | None = None
+
+
+# Realtor ConsumerSearchQuery: data.home_search.properties
+class RealtorDescription(Struct):
+    beds: int | None = None
+    baths_consolidated: str | int | float | None = None
+    sold_price: int | float | None = None
+    sold_date: str | None = None
+
+
+class RealtorCoordinate(Struct):
+    lat: float | None = None
+    lon: float | None = None
+
+
+class RealtorAddress(Struct):
+    city: str | None = None
+    line: str | None = None
+    postal_code: str | None = None
+    state: str | None = None
+    coordinate: RealtorCoordinate | None = None
+
+
+class RealtorCounty(Struct):
+    name: str | None = None
+
+
+class RealtorLocation(Struct):
+    address: RealtorAddress | None = None
+    county: RealtorCounty | None = None
+
+
+class RealtorProperty(Struct, kw_only=True):
+    property_id: str
+    listing_id: str | None = None
+    list_price: int | float | None = None
+    status: str | None = None
+    description: RealtorDescription | None = None
+    location: RealtorLocation | None = None
+    photos: list[dict[str, Any]] | None = None
+
+
+class RealtorHomeSearch(Struct):
+    total: int | None = None
+    properties: list[RealtorProperty] = field(default_factory=list)
+
+
+class RealtorData(Struct):
+    home_search: RealtorHomeSearch | None = None
+
+
+class RealtorSearch(Struct):
+    data: RealtorData | None = None
+
+
+# Zillow search page state: cat1.searchResults.listResults + mapResults
+class ZillowLatLong(Struct):
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+class ZillowListResult(Struct, kw_only=True):
+    zpid: str | int
+    beds: int | None = None
+    baths: float | None = None
+    addressStreet: str | None = None
+    addressCity: str | None = None
+    addressState: str | None = None
+    addressZipcode: str | None = None
+    latLong: ZillowLatLong | None = None
+    unformattedPrice: int | float | None = None
+    statusType: str | None = None
+    brokerName: str | None = None
+    carouselPhotos: list[dict[str, Any]] | None = None
+
+
+# Map pins carry the same keys; building clusters have no zpid
+class ZillowMapResult(ZillowListResult, kw_only=True):
+    zpid: str | int | None = None
+
+
+class ZillowSearchResults(Struct):
+    listResults: list[ZillowListResult] = field(default_factory=list)
+    mapResults: list[ZillowMapResult] = field(default_factory=list)
+
+
+class ZillowSearchList(Struct):
+    totalResultCount: int | None = None
+    totalPages: int | None = None
+
+
+class ZillowCategory(Struct):
+    searchResults: ZillowSearchResults | None = None
+    searchList: ZillowSearchList | None = None
+
+
+class ZillowSearch(Struct):
+    cat1: ZillowCategory | None = None
+
+
+# Homes.com placards and pins
+class HomesKey(Struct):
+    key: str
+
+
+class HomesAddress(Struct):
+    city: str | None = None
+    countryCode: str | None = None
+    postalCode: str | None = None
+    state: str | None = None
+    street: str | None = None
+
+
+class HomesAgent(Struct):
+    fullName: str | None = None
+    phoneNumber: str | None = None
+    agencyName: str | None = None
+
+
+class HomesPlacard(Struct, kw_only=True):
+    listingKey: HomesKey
+    propertyKey: HomesKey | None = None
+    address: HomesAddress | None = None
+    listingAgent: HomesAgent | None = None
+    beds: int | None = None
+    bathsTotal: float | None = None
+    currentPrice: int | float | None = None
+    attachments: list[dict[str, Any]] | None = None
+
+
+class HomesPlacards(Struct):
+    placards: list[HomesPlacard] = field(default_factory=list)
+
+
+class HomesPin(Struct):
+    lk: HomesKey
+
+
+class HomesPins(Struct):
+    pins: list[HomesPin] = field(default_factory=list)
+
+
+# Search response schema per provider; its attributes follow the
+# registered decoder's 'root'
+SEARCH_SCHEMAS = {
+    "redfin": RedfinSearch,
+    "realtor": RealtorSearch,
+    "zillow": ZillowSearch,
+    "homes": HomesPlacards,
+}
+
+_decoders: dict[type, msgspec.json.Decoder] = {}
+
+
+def decode_typed(content: bytes | Response, provider: str, schema: type):
+    """
+    Decode a response body into 'schema', raising 'SchemaError' (with the
+    JSON path that broke) on a mismatch
+    """
+    decoder = _decoders.get(schema)
+    if decoder == None:
+        decoder = _decoders[schema] = msgspec.json.Decoder(schema)
+
+    try:
+        return decoder.decode(get_decoder(provider).document(content))
+    except msgspec.ValidationError as e:
+        raise SchemaError(f"{provider} response doesn't match {schema.__name__}: {e}") from e
+
+
+def _walk(data, path: tuple[str, ...]):
+    for key in path:
+        if data == None:
+            return None
+        data = getattr(data, key)
+    return data
+
+
+def decode_search(content: bytes | Response, provider: str) -> list:
+    """
+    The typed search results of a provider search response
+    """
+    return decode_search_page(content, provider)[0]
+
+
+def decode_search_page(content: bytes | Response, provider: str, total: tuple[str, ...] = ()) -> tuple[list, Any]:
+    """
+    'decode_search' plus the value at the 'total' attribute path (e.g. the
+    result count), from a single decode
+    """
+    data = decode_typed(content, provider, SEARCH_SCHEMAS[provider])
+    return _walk(data, get_decoder(provider).root) or [], _walk(data, total) if total else None
+
+
+def decode_zillow_results(content: bytes | Response) -> list:
+    """
+    Typed 'listResults' of a Zillow search response joined with its
+    'mapResults' on zpid (see 'Zillow.normalize.merge_results'): a list
+    result's unset fields are filled from its map pin, and map-only homes
+    follow the list results
+    """
+    return decode_zillow_page(content)[0]
+
+
+def decode_zillow_page(content: bytes | Response) -> tuple[list, ZillowSearchList]:
+    """
+    'decode_zillow_results' plus the search's counts ('searchList')
+    """
+    data = decode_typed(content, "zillow", ZillowSearch)
+    if data.cat1 == None:
+        return [], ZillowSearchList()
+
+    search_list = data.cat1.searchList if data.cat1.searchList != None else ZillowSearchList()
+    search_results = data.cat1.searchResults
+    if search_results == None:
+        return [], search_list
+    if not search_results.mapResults:
+        return search_results.listResults, search_list
+
+    by_zpid = {}
+    for item in search_results.mapResults:
+        if item.zpid != None:
+            by_zpid[str(item.zpid)] = item
+
+    merged = []
+    replace = msgspec.structs.replace
+    for item in search_results.listResults:
+        match = by_zpid.pop(str(item.zpid), None)
+        if match != None:
+            missing = {
+                name: getattr(match, name)
+                for name in item.__struct_fields__
+                if getattr(item, name) == None and getattr(match, name) != None
+            }
+            if missing:
+                item = replace(item, **missing)
+        merged.append(item)
+
+    merged.extend(by_zpid.values())
+    return merged, search_list
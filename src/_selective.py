@@ -0,0 +1,80 @@
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from importlib.util import find_spec
+
+import orjson
+
+
+# Selective decoding needs msgspec; without it paths decode in full
+MSGSPEC_AVAILABLE = find_spec("msgspec") is not None
+
+
+def path_tree(paths: Iterable[str]) -> dict:
+    """
+    Nest dotted paths into a tree of keys; a leaf is None. "*" stands for
+    every item of an array. A path that is a prefix of another wins (its
+    whole subtree is kept)
+    """
+    tree = {}
+    for path in sorted(paths, key=lambda p: p.count(".")):
+        node = tree
+        *parents, last = path.split(".")
+        for key in parents:
+            if key in node and node[key] == None:
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[last] = None
+    return tree
+
+
+def compile_paths(paths: Iterable[str], name: str = "Selected") -> Callable[[bytes | memoryview], Any]:
+    """
+    Compile a decoder that only materializes the subtrees at 'paths'
+
+    The paths are turned into a tree of msgspec Structs whose fields are
+    the requested keys, so msgspec skips every other key while parsing:
+    discarded sections (mortgage params, search metadata, the listing
+    fields no normalizer reads, ...) are validated but never allocated. The
+    result comes back as plain dicts and lists holding only those keys.
+
+        select = compile_paths(["payload.homes.*.price.value", "payload.homes.*.city"])
+        select(body)    # {"payload": {"homes": [{"price": {"value": 1}, "city": "..."}]}}
+
+    A body whose shape doesn't match (e.g. an error payload where an object
+    was expected) falls back to a full orjson decode, as does everything
+    when msgspec isn't installed.
+    """
+    if not MSGSPEC_AVAILABLE:
+        return orjson.loads
+
+    import msgspec
+
+    def _struct(tree: dict, struct_name: str) -> type:
+        fields = []
+        rename = {}
+        for i, (key, subtree) in enumerate(tree.items()):
+            if subtree == None:
+                kind = Any
+            elif list(subtree) == ["*"]:
+                item = subtree["*"]
+                kind = list[_struct(item, f"{struct_name}_{i}")] if item != None else list
+                kind = kind | None
+            else:
+                kind = _struct(subtree, f"{struct_name}_{i}") | None
+            fields.append((f"f{i}", kind | msgspec.UnsetType, msgspec.UNSET))
+            rename[f"f{i}"] = key
+        # Unset fields are left out of 'to_builtins', so absent keys stay absent
+        return msgspec.defstruct(struct_name, fields, rename=rename, omit_defaults=True)
+
+    decoder = msgspec.json.Decoder(_struct(path_tree(paths), name))
+    to_builtins = msgspec.to_builtins
+
+    def select(content: bytes | memoryview):
+        try:
+            return to_builtins(decoder.decode(content))
+        except msgspec.MsgspecError:
+            return orjson.loads(content)
+
+    return select
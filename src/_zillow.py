@@ -1,13 +1,43 @@
 import json
 from typing import Literal
+from typing import Callable
 
 import rich
 import httpx
-import orjson
 
 from ._geo import get_bounding_box
 from ._constants import ZI_REGION_TYPE_MAP
+from ._http import get_pool
+from ._http import ClientPool
+from ._http import decode_json
+from ._http import register_decoder
 from ._http import send_request
+from ._http import get_background_loop
+from ._jsonstream import iter_listings
+from ._jsonstream import aiter_listings
+from ._batch import ListingBatch
+from ._models import Agent
+from ._models import Address
+from ._models import PropertyDetails
+from ._fieldmap import Field
+from ._fieldmap import Const
+from ._fieldmap import LazyView
+from ._fieldmap import compile_view
+from ._fieldmap import compile_extractor
+from ._fieldmap import spec_paths
+from ._selective import MSGSPEC_AVAILABLE
+from ._paginate import paginate
+from ._paginate import apaginate
+from ._paginate import apages
+from ._delta import Delta
+from ._delta import DeltaStore
+from ._delta import adelta
+from ._delta import reject_sort
+from ._delta import window_days
+from ._crawl import Tile
+from ._crawl import DensityMap
+from ._crawl import AreaCrawler
+from ._jobs import Job
 from ._util import readjson
 from ._util import readfile
 from ._util import read_payload
@@ -17,9 +47,13 @@ from .paths import QUERY_DIR
 _Polygon = list[tuple[float, float]]
 _MultiPolygon = list[list[tuple[float, float]]]
 
+
+register_decoder("zillow", root=("cat1", "searchResults", "listResults"))
+
+
 class Zillow:
-    def __init__(self):
-        pass
+    def __init__(self, pool: ClientPool | None = None) -> None:
+        self.pool = pool if pool != None else get_pool()
 
     def map_search(
             self, 
@@ -81,10 +115,9 @@ class Zillow:
             sort_order=sort_order,
         )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
-        rawdata = orjson.loads(r.content)
+        rawdata = decode_json(r, "zillow")
 
         return rawdata
 
@@ -114,10 +147,9 @@ class Zillow:
             page=page,
         )
         
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
 
-        rawdata = orjson.loads(r.content)
+        rawdata = decode_json(r, "zillow")
 
         return rawdata
     
@@ -147,9 +179,9 @@ class Zillow:
             page=page,
         )
 
-        r = send_request(req)
+        r = send_request(req, self.pool.client)
 
-        rawdata = orjson.loads(r.content)
+        rawdata = decode_json(r, "zillow")
 
         return rawdata
 
@@ -185,82 +217,313 @@ class Zillow:
         ):
         """
         Standard query search
+
+        Returns normalized listings (see 'Zillow.normalize'): the page's
+        'listResults' joined with its 'mapResults' on zpid
         """
 
-        with httpx.Client() as client:
-            req = self.request.query_understanding(query)
-            r = client.send(req)
-            query_data = self._compact_query_understanding(orjson.loads(r.content))
-
-            if region_type != None:
-                for result in query_data:
-                    if str(result["sub_type"]).lower() == region_type.strip().lower():
-                        region_id = result["region_id"]
-                        region_type = result["sub_type"]
-                        coordinates = result["polygon"] # list[tuple[lng, lat]]
-                        break
-            else:
-                result = query_data[0]
-                region_id = result["region_id"]
-                region_type = result["sub_type"]
-                coordinates = result["polygon"] # list[tuple[lng, lat]]
+        client = self.pool.client
+
+        req = self.request.query_understanding(query)
+        r = client.send(req)
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        region_id, region_type, coordinates = self._select_region(query_data, region_type)
+
+        req = self.request.region_lookup(
+            region_id,
+            region_type, 
+            coordinates=coordinates,
+            price_min=price_min,
+            price_max=price_max,
+            num_beds_min=num_beds_min,
+            num_beds_max=num_beds_max,
+            num_baths_min=num_baths_min,
+            num_baths_max=num_baths_max,
+            include_pending_listings=include_pending_listings,
+            include_accepting_offers=include_accepting_offers,
+            open_houses_only=open_houses_only,
+            has_3d_tour_only=has_3d_tour_only,
+            year_built_min=year_built_min,
+            year_built_max=year_built_max,
+            has_finished_basement=has_finished_basement,
+            has_unfinished_basement=has_unfinished_basement,
+            has_garage=has_garage,
+            hide_55plus=age_55plus_only,
+            single_story_only=single_story_only,
+            has_ac=has_ac,
+            has_pool=has_pool,
+            doz=doz,
+            limit=limit,
+            page=page,
+            sort_order=sort_order,
+            )
+        
+        r = client.send(req)
+
+        data = self.normalize.search_response(r)
+        
+        return data
+
+
+    def iter_query_search(
+            self,
+            query,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            age_55plus_only: bool | None = None,
+            **kwargs
+        ):
+        """
+        Streaming 'query_search'
+
+        Yields normalized 'listResults' entries as they are parsed out of
+        the downloading response. Map-only homes ('mapResults') come after
+        the list in the body and aren't joined; use 'query_search' for them.
+        Filters are the same as 'query_search'
+        """
+        client = self.pool.client
+
+        req = self.request.query_understanding(query)
+        r = client.send(req)
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        region_id, region_type, coordinates = self._select_region(query_data, region_type)
+
+        req = self.request.region_lookup(
+            region_id,
+            region_type,
+            coordinates=coordinates,
+            hide_55plus=age_55plus_only,
+            **kwargs
+            )
+        req.extensions["stream"] = True
+        r = client.send(req, stream=True)
+
+        for listing in iter_listings(r, "zillow"):
+            yield self.normalize.listing(listing).to_dict()
+
+
+    def paginate_query_search(
+            self,
+            query,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            age_55plus_only: bool | None = None,
+            max_in_flight: int = 8,
+            ordered: bool = True,
+            max_pages: int | None = None,
+            **kwargs
+        ):
+        """
+        Every page of 'query_search', one normalized listing at a time
+
+        The region is resolved once and the first page gives the page count;
+        the remaining pages are then fetched concurrently (see '_paginate')
+        and listings are deduped by zpid. Filters are the same as
+        'query_search'
+
+        Parameters
+        ----------
+        max_in_flight: int
+            Upper bound on pages requested at once
+
+        ordered: bool
+            Yield pages in order. If False, pages are yielded as they arrive
+
+        max_pages: int | None
+            Stop after this many pages
+        """
+        r = self.pool.send(self.request.query_understanding(query))
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        pages = self._pages(query_data, region_type, age_55plus_only, **kwargs)
+
+        return paginate(*pages, pool=self.pool, max_in_flight=max_in_flight, ordered=ordered, max_pages=max_pages)
 
-            req = self.request.region_lookup(
+
+    def _pages(self, query_data, region_type=None, age_55plus_only=None, **kwargs):
+        region_id, region_type, coordinates = self._select_region(query_data, region_type)
+
+        def page_request(page: int) -> httpx.Request:
+            return self.request.region_lookup(
                 region_id,
-                region_type, 
+                region_type,
                 coordinates=coordinates,
-                price_min=price_min,
-                price_max=price_max,
-                num_beds_min=num_beds_min,
-                num_beds_max=num_beds_max,
-                num_baths_min=num_baths_min,
-                num_baths_max=num_baths_max,
-                include_pending_listings=include_pending_listings,
-                include_accepting_offers=include_accepting_offers,
-                open_houses_only=open_houses_only,
-                has_3d_tour_only=has_3d_tour_only,
-                year_built_min=year_built_min,
-                year_built_max=year_built_max,
-                has_finished_basement=has_finished_basement,
-                has_unfinished_basement=has_unfinished_basement,
-                has_garage=has_garage,
                 hide_55plus=age_55plus_only,
-                single_story_only=single_story_only,
-                has_ac=has_ac,
-                has_pool=has_pool,
-                doz=doz,
-                limit=limit,
                 page=page,
-                sort_order=sort_order,
+                **kwargs
                 )
-            
-            r = client.send(req)
 
-            rawdata = orjson.loads(r.content)
-        
-        data = rawdata.get("cat1", {}).get("searchResults", {}).get("listResults")
-        
-        return data
-        
+        # Zillow pages hold up to 41 list results
+        return page_request, self.normalize.search_page, 41
+
+
+    def delta_query_search(
+            self,
+            query,
+            store: DeltaStore,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            age_55plus_only: bool | None = None,
+            full: bool = False,
+            windowed: bool = False,
+            max_in_flight: int = 2,
+            **kwargs
+        ) -> Delta:
+        """
+        What was added, changed (price or status) or removed in a region
+        since the last delta crawl of it
+
+        Pages are requested most recently changed first and the crawl stops
+        at the first page with nothing new (see '_delta'). Filters are the
+        same as 'query_search', except 'sort_order'. Run with 'full=True'
+        periodically to report removals
+
+        Parameters
+        ----------
+        store: DeltaStore
+            Watermarks and fingerprints of earlier crawls
+
+        full: bool
+            Walk every page, which is what reports removals
+
+        windowed: bool
+            Also filter the search to homes listed since the watermark
+            ('doz'). Fewer pages, but changes to older listings are missed
+
+        max_in_flight: int
+            Upper bound on pages requested at once. Pages past the stopping
+            point are wasted, so keep this low
+        """
+        reject_sort(kwargs, "sort_order")
+
+        r = self.pool.send(self.request.query_understanding(query))
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        crawl = self._delta(query, query_data, store, region_type, age_55plus_only, full, windowed, max_in_flight, **kwargs)
+
+        return get_background_loop().run(crawl)
+
+
+    def _delta(self, query, query_data, store, region_type=None, age_55plus_only=None, full=False, windowed=False, max_in_flight=2, **kwargs):
+        region = f"zillow:{query}"
+
+        doz = window_days(store.watermark(region), (1, 7, 14, 30, 90)) if windowed and not full else None
+        if doz != None:
+            kwargs["doz"] = str(doz)
+
+        pages = self._pages(query_data, region_type, age_55plus_only, sort_order="mostrecentchange", **kwargs)
+
+        return adelta(
+            apages(*pages, pool=self.pool, max_in_flight=max_in_flight),
+            store,
+            region,
+            full=full,
+            windowed=doz != None,
+            )
+
+
+    def crawl_area(
+            self,
+            area: dict | list[tuple[float, float]],
+            density: DensityMap | None = None,
+            max_depth: int = 8,
+            max_in_flight: int = 8,
+            job: Job | None = None,
+            on_error: Callable[[Tile, BaseException], None] | None = None,
+            **kwargs
+        ):
+        """
+        Every home in an area, past the 500 pins of a single map search
+
+        The area is split into quadrants wherever a search reports 500 or
+        more results (see '_crawl'); listings are deduped by zpid
+
+        Parameters
+        ----------
+        area: dict | list[tuple[float, float]]
+            A bounding box ({"north", "south", "east", "west"}) or a
+            (lat, lon) polygon
+
+        density: DensityMap | None
+            Tile counts from earlier crawls, used to split dense tiles up front
+
+        max_depth: int
+            Deepest split
+
+        max_in_flight: int
+            Upper bound on tiles requested at once
+
+        job: Job | None
+            Journal the tiles in this job, so an interrupted crawl resumes
+            where it stopped. The listings are then returned once the crawl
+            is complete instead of streamed
+
+        on_error: Callable[[Tile, BaseException], None] | None
+            Called with each tile whose search fails. The crawl skips it and
+            carries on (with a job, it's journaled as failed and retried on
+            the next run)
+
+        **kwargs
+            Other 'request.map_search' filters
+        """
+        crawler = self._crawler(density, max_depth, max_in_flight, on_error, **kwargs)
+
+        if job != None:
+            return iter(crawler.run_job(area, job))
+
+        return crawler.crawl(area)
+
+
+    def _crawler(self, density=None, max_depth=8, max_in_flight=8, on_error=None, **kwargs) -> AreaCrawler:
+        def tile_request(tile: Tile) -> httpx.Request:
+            return self.request.map_search(None, bounds=tile.bounds(), **kwargs)
+
+        # The map search returns at most 500 pins
+        return AreaCrawler(
+            "zillow",
+            tile_request,
+            self.normalize.search_tile,
+            500,
+            pool=self.pool,
+            density=density,
+            max_depth=max_depth,
+            max_in_flight=max_in_flight,
+            filters=kwargs,
+            on_error=on_error,
+            )
+
 
     def property_details(self, zpid):
         req = self.request.property_details(zpid)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content)
+        rawdata = decode_json(r, "zillow")
 
         return rawdata
 
 
+    def property_details_full(self, zpid) -> dict:
+        """
+        Normalized property details (the schema of json/property_details.jsonc)
+
+        Read from the desktop property query, which carries the price
+        history, facts and attribution the mobile lookup leaves out
+        """
+        r = self.pool.send(self._details_request(zpid))
+
+        return self.normalize.details({"property": decode_json(r, "zillow")}).to_dict()
+
+
+    def _details_request(self, zpid) -> httpx.Request:
+        return self.request.property_details2(zpid, referer=f"https://www.zillow.com/homedetails/{zpid}_zpid/")
+
+
     def region_lookup(self, query:str):
         req = Zillow.request.query_understanding(query)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content)
+        rawdata = decode_json(r, "zillow")
 
         data = self._compact_query_understanding(rawdata)
         # data = rawdata
@@ -271,10 +534,9 @@ class Zillow:
     def autocomplete(self, query_string:str):
         req = self.request.autocomplete_results(query_string)
 
-        with httpx.Client() as client:
-            r = client.send(req)
+        r = self.pool.send(req)
         
-        rawdata = orjson.loads(r.content)
+        rawdata = decode_json(r, "zillow")
 
         data = self._compact_autocomplete(rawdata)
 
@@ -307,6 +569,23 @@ class Zillow:
         return data
 
 
+    def _select_region(self, query_data: list[dict], region_type: str | None = None):
+        """
+        Pick the region to search from compacted query-understanding results
+
+        Returns (region_id, region_type, polygon) where polygon is a list of
+        [lng, lat] pairs
+        """
+        if region_type != None:
+            for result in query_data:
+                if str(result["sub_type"]).lower() == region_type.strip().lower():
+                    return result["region_id"], result["sub_type"], result["polygon"]
+            raise ValueError(f"no '{region_type}' region in query results")
+
+        result = query_data[0]
+        return result["region_id"], result["sub_type"], result["polygon"]
+
+
     def _compact_autocomplete(self, rawdata):
         data = []
 
@@ -373,11 +652,18 @@ class Zillow:
             page: int | None = None,
             limit: int | None = None,
             sort_order:Literal["globalrelevanceex", "days", "beds", "baths", "lot", "paymentd", "paymenta", "featured", "size", "zest", "zesta", "pricea", "priced", "mostrecentchange", "listingstatus"]|None=None,
-        
+            bounds: dict | None = None,
             ) -> httpx.Request:
-
-            radius_mi = int(radius_mi) if radius_mi != None else 5
-            bbox = get_bounding_box(coordinates[0], coordinates[1], radius=radius_mi)
+            """
+            'bounds' ({"north", "south", "east", "west"}) searches that box
+            instead of the one around 'coordinates', and also asks for the
+            map pins ('mapResults'), which go past the 41 list results
+            """
+            if bounds != None:
+                bbox = bounds
+            else:
+                radius_mi = int(radius_mi) if radius_mi != None else 5
+                bbox = get_bounding_box(coordinates[0], coordinates[1], radius=radius_mi)
             
             url = "https://www.zillow.com/async-create-search-page-state"
             
@@ -394,6 +680,9 @@ class Zillow:
                 "westLongitude": bbox["west"],
             }
 
+            if bounds != None:
+                payload["wants"]["cat1"].append("mapResults")
+
             if price_min != None or price_max != None:
                 payload["searchQueryState"]["filterState"]["price"] = {}
                 if price_min != None:
@@ -932,7 +1221,426 @@ class Zillow:
             return f"clipPolygon={final_string}"
 
 
+    class normalize:
+        @staticmethod
+        def merge_results(list_results: list[dict], map_results: list[dict]) -> list[dict]:
+            """
+            Join 'listResults' and 'mapResults' on zpid
+
+            One pass over each side (a hash join): map entries are indexed by
+            zpid and each list entry is filled in with the keys its match has
+            and it lacks (or has as null). Map-only homes (past the list page
+            size) are appended in map order; map entries without a zpid
+            (building clusters) are dropped
+            """
+            if not map_results:
+                return list_results
+
+            by_zpid = {}
+            for item in map_results:
+                zpid = item.get("zpid")
+                if zpid != None:
+                    by_zpid[str(zpid)] = item
+
+            merged = []
+            for item in list_results:
+                match = by_zpid.pop(str(item.get("zpid")), None)
+                if match != None:
+                    item = {
+                        **match,
+                        **{key: value for key, value in item.items() if value != None},
+                    }
+                merged.append(item)
+
+            merged.extend(by_zpid.values())
+            return merged
+
+
+        @staticmethod
+        def results(response_data) -> list[dict]:
+            """
+            Every home of a search response ('listResults' + 'mapResults')
+            """
+            search_results = response_data.get("cat1", {}).get("searchResults") or {}
+            return Zillow.normalize.merge_results(
+                search_results.get("listResults") or [],
+                search_results.get("mapResults") or [],
+            )
+
+
+        @staticmethod
+        def property_search(response_data):
+            return [
+                Zillow.normalize.listing(property).to_dict()
+                for property in Zillow.normalize.results(response_data)
+            ]
+
+
+        @staticmethod
+        def property_search_batch(response_data) -> ListingBatch:
+            """
+            'property_search' as a columnar 'ListingBatch'
+            """
+            return ListingBatch.from_listings(
+                Zillow.normalize.listing(property)
+                for property in Zillow.normalize.results(response_data)
+            )
+
+
+        @staticmethod
+        def property_search_views(response_data) -> list[LazyView]:
+            """
+            'property_search' as lazy views, for callers that read a few fields
+            """
+            return [
+                Zillow.normalize.view(property)
+                for property in Zillow.normalize.results(response_data)
+            ]
+
+
+        # Listing field -> 'listResults'/'mapResults' path (see '_fieldmap').
+        # 'price' is a display string ("$9,850,000"), 'unformattedPrice' the
+        # number
+        fields = {
+            "images": Field("carouselPhotos", convert=lambda photos: [
+                photo["url"] for photo in photos or [] if photo.get("url")
+            ]),
+            "num_beds": "beds",
+            "num_baths": "baths",
+            "address.city": "addressCity",
+            "address.country_code": Const("US"),
+            "address.postal_code": "addressZipcode",
+            "address.state": "addressState",
+            "address.street": "addressStreet",
+            "address.lat": "latLong.latitude",
+            "address.lon": "latLong.longitude",
+            "price": "unformattedPrice",
+            "status": "statusType",
+            "agency_name": "brokerName",
+            "db_property_id": "zpid",
+            "db_name": Const("Zillow"),
+        }
+
+        # Single 'listResults' entry -> 'Listing', e.g. one streamed by
+        # 'iter_query_search'
+        listing = staticmethod(compile_extractor(fields))
+
+        # Lazy counterpart of 'listing': normalizes fields on first access
+        view = compile_view(fields, name="ZillowListingView")
+
+        # What 'property_search' reads from a search response, so the rest of
+        # each listing is skipped while decoding (see 'ResponseDecoder.decode')
+        search_paths = (
+            spec_paths(fields, "cat1.searchResults.listResults.*")
+            + spec_paths(fields, "cat1.searchResults.mapResults.*")
+        )
+
+        # 'listing' over the typed records of '_schemas'
+        typed_listing = staticmethod(compile_extractor(fields, attrs=True))
+
+        # PropertyDetails field -> path into the decoded property query
+        # ({"property": ...})
+        details_fields = {
+            "primary_agent.agency_name": "property.data.property.attributionInfo.brokerName",
+            "primary_agent.agency_phone": "property.data.property.attributionInfo.brokerPhoneNumber",
+            "primary_agent.email": "property.data.property.attributionInfo.agentEmail",
+            "primary_agent.name": "property.data.property.attributionInfo.agentName",
+            "primary_agent.role": Const("listing_agent"),
+            "primary_agent.phone": "property.data.property.attributionInfo.agentPhoneNumber",
+            "images": Field("property.data.property.originalPhotos", convert=lambda photos: [
+                jpeg[-1]["url"]
+                for photo in photos or []
+                if (jpeg := ((photo.get("mixedSources") or {}).get("jpeg") or []))
+            ]),
+            "mls_info": Field(
+                "property.data.property.attributionInfo.mlsId", "property.data.property.attributionInfo.mlsName",
+                convert=lambda mls_id, mls_name: {"id": mls_id, "name": mls_name} if mls_id else {},
+            ),
+            "num_beds": "property.data.property.bedrooms",
+            "num_baths": "property.data.property.bathrooms",
+            "has_garage": "property.data.property.resoFacts.hasGarage",
+            "basement": Field("property.data.property.resoFacts.basement", convert=lambda basement: (
+                None if not basement or basement.lower().startswith("none")
+                else "unfinished" if "unfinished" in basement.lower() else "finished"
+            )),
+            "address.city": "property.data.property.address.city",
+            "address.country_code": Const("US"),
+            "address.county": "property.data.property.county",
+            "address.neighborhood": "property.data.property.neighborhoodRegion.name",
+            "address.postal_code": "property.data.property.address.zipcode",
+            "address.state": "property.data.property.address.state",
+            "address.street": "property.data.property.address.streetAddress",
+            "address.lat": "property.data.property.latitude",
+            "address.lon": "property.data.property.longitude",
+            "price_history": Field("property.data.property.priceHistory", convert=lambda events: [
+                {
+                    "date": event.get("date"),
+                    "event": event.get("event"),
+                    "price": event.get("price"),
+                    "source": event.get("source"),
+                }
+                for event in events or []
+            ]),
+            "views": "property.data.property.pageViewCount",
+            "db_property_id": Field("property.data.property.zpid", convert=lambda zpid: None if zpid == None else str(zpid)),
+            "db_name": Const("Zillow"),
+        }
+
+        # Decoded property query -> 'PropertyDetails'
+        details = staticmethod(compile_extractor(
+            details_fields,
+            factory=PropertyDetails,
+            nested={"address": Address, "primary_agent": Agent},
+            name="property_details",
+        ))
+
+
+        @staticmethod
+        def search_response(r) -> list[dict]:
+            """
+            Decode + normalize a search response: straight into its typed
+            schema when msgspec is installed (a payload that drifted from it
+            raises 'SchemaError'), else through the selective decoder
+            """
+            return Zillow.normalize.search_page(r)[0]
+
+
+        @staticmethod
+        def search_page(r) -> tuple[list[dict], int | None]:
+            """
+            'search_response' plus the search's page count
+            """
+            listings, search_list = Zillow.normalize._search_counts(r)
+            return listings, search_list.get("totalPages")
+
+
+        @staticmethod
+        def search_tile(r) -> tuple[list[dict], int | None]:
+            """
+            'search_response' plus the search's total result count
+            """
+            listings, search_list = Zillow.normalize._search_counts(r)
+            return listings, search_list.get("totalResultCount")
+
+
+        @staticmethod
+        def _search_counts(r) -> tuple[list[dict], dict]:
+            if MSGSPEC_AVAILABLE:
+                from ._schemas import decode_zillow_page
+                properties, search_list = decode_zillow_page(r)
+                listings = [Zillow.normalize.typed_listing(property).to_dict() for property in properties]
+                return listings, {"totalPages": search_list.totalPages, "totalResultCount": search_list.totalResultCount}
+            data = decode_json(r, "zillow", Zillow.normalize.search_paths + ("cat1.searchList",))
+            return Zillow.normalize.property_search(data), data.get("cat1", {}).get("searchList") or {}
+
 
 
+class AsyncZillow(Zillow):
+    """
+    Awaitable twin of 'Zillow'
 
+    Every public method is a coroutine sent over the pool's async client, so
+    many searches can run concurrently on a single event loop. Methods take
+    the same parameters as their 'Zillow' counterparts.
+    """
 
+    async def map_search(self, coordinates:tuple[float, float], age_55plus_only: bool | None = None, **kwargs):
+        req = Zillow.request.map_search(coordinates=coordinates, hide_55plus=age_55plus_only, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "zillow")
+
+        return rawdata
+
+
+    async def map_search1(
+            self,
+            coordinates: tuple[float, float],
+            radius_mi: int | None = None,
+            price_range_min: int | None=None,
+            price_range_max: int | None=None,
+            **kwargs
+            ):
+        req = self.request.map_search1(
+            coordinates=coordinates,
+            radius_mi=radius_mi,
+            price_min=price_range_min,
+            price_max=price_range_max,
+            **kwargs
+        )
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "zillow")
+
+        return rawdata
+
+
+    async def polygon_search(self, polygon: _Polygon | None=None, multi_polygon: _MultiPolygon | None=None, **kwargs):
+        req = self.request.polygon_search(polygon=polygon, multi_polygon=multi_polygon, **kwargs)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "zillow")
+
+        return rawdata
+
+
+    async def query_search(
+            self,
+            query,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            coordinates:list[tuple[float, float]]=None,
+            age_55plus_only: bool | None = None,
+            **kwargs
+        ):
+        client = self.pool.async_client
+
+        req = self.request.query_understanding(query)
+        r = await client.send(req)
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        region_id, region_type, coordinates = self._select_region(query_data, region_type)
+
+        req = self.request.region_lookup(
+            region_id,
+            region_type,
+            coordinates=coordinates,
+            hide_55plus=age_55plus_only,
+            **kwargs
+            )
+
+        r = await client.send(req)
+
+        data = self.normalize.search_response(r)
+
+        return data
+
+
+    async def iter_query_search(
+            self,
+            query,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            age_55plus_only: bool | None = None,
+            **kwargs
+        ):
+        client = self.pool.async_client
+
+        req = self.request.query_understanding(query)
+        r = await client.send(req)
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        region_id, region_type, coordinates = self._select_region(query_data, region_type)
+
+        req = self.request.region_lookup(
+            region_id,
+            region_type,
+            coordinates=coordinates,
+            hide_55plus=age_55plus_only,
+            **kwargs
+            )
+        req.extensions["stream"] = True
+        r = await client.send(req, stream=True)
+
+        async for listing in aiter_listings(r, "zillow"):
+            yield self.normalize.listing(listing).to_dict()
+
+
+    async def paginate_query_search(
+            self,
+            query,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            age_55plus_only: bool | None = None,
+            max_in_flight: int = 8,
+            ordered: bool = True,
+            max_pages: int | None = None,
+            **kwargs
+        ):
+        r = await self.pool.asend(self.request.query_understanding(query))
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        pages = self._pages(query_data, region_type, age_55plus_only, **kwargs)
+
+        async for listing in apaginate(*pages, pool=self.pool, max_in_flight=max_in_flight, ordered=ordered, max_pages=max_pages):
+            yield listing
+
+
+    async def delta_query_search(
+            self,
+            query,
+            store: DeltaStore,
+            region_type:Literal["city", "zipcode", "neighborhood", "address"]=None,
+            age_55plus_only: bool | None = None,
+            full: bool = False,
+            windowed: bool = False,
+            max_in_flight: int = 2,
+            **kwargs
+        ) -> Delta:
+        reject_sort(kwargs, "sort_order")
+
+        r = await self.pool.asend(self.request.query_understanding(query))
+        query_data = self._compact_query_understanding(decode_json(r, "zillow"))
+
+        return await self._delta(query, query_data, store, region_type, age_55plus_only, full, windowed, max_in_flight, **kwargs)
+
+
+    async def crawl_area(
+            self,
+            area: dict | list[tuple[float, float]],
+            density: DensityMap | None = None,
+            max_depth: int = 8,
+            max_in_flight: int = 8,
+            job: Job | None = None,
+            on_error: Callable[[Tile, BaseException], None] | None = None,
+            **kwargs
+        ):
+        crawler = self._crawler(density, max_depth, max_in_flight, on_error, **kwargs)
+
+        if job != None:
+            for listing in await crawler.arun_job(area, job):
+                yield listing
+            return
+
+        async for listing in crawler.acrawl(area):
+            yield listing
+
+
+    async def property_details(self, zpid):
+        req = self.request.property_details(zpid)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "zillow")
+
+        return rawdata
+
+
+    async def property_details_full(self, zpid) -> dict:
+        r = await self.pool.asend(self._details_request(zpid))
+
+        return self.normalize.details({"property": decode_json(r, "zillow")}).to_dict()
+
+
+    async def region_lookup(self, query:str):
+        req = Zillow.request.query_understanding(query)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "zillow")
+
+        data = self._compact_query_understanding(rawdata)
+
+        return data
+
+
+    async def autocomplete(self, query_string:str):
+        req = self.request.autocomplete_results(query_string)
+
+        r = await self.pool.asend(req)
+
+        rawdata = decode_json(r, "zillow")
+
+        data = self._compact_autocomplete(rawdata)
+
+        return data
@@ -2,3 +2,5 @@ from pathlib import Path
 
 QUERY_DIR = Path(__file__).parent.joinpath("query").resolve()
 JSON_DIR = Path(__file__).parent.joinpath("json").resolve()
+CACHE_DIR = Path.home().joinpath(".cache", "domus")
+ROOT_DIR = Path(__file__).parent.parent.resolve()
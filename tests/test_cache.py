@@ -0,0 +1,43 @@
+import time
+
+import httpx
+
+from src._cache import ResponseCache
+
+
+def _response(size: int) -> httpx.Response:
+    return httpx.Response(200, content=b"x" * size)
+
+
+def test_memory_hits_survive_eviction(tmp_path):
+    cache = ResponseCache(tmp_path.joinpath("http.sqlite"), max_bytes=350)
+
+    for key in ("hot", "a", "b"):
+        cache.store(key, _response(100), 60)
+        time.sleep(0.01)
+
+    # Served from the in-memory LRU, never from the table
+    for _ in range(50):
+        assert cache.lookup("hot") != None
+
+    cache.store("c", _response(100), 60)
+
+    assert cache.stats["evictions"] == 1
+    assert cache.lookup("hot") != None
+    assert cache._db.execute("SELECT key FROM responses WHERE key = 'a'").fetchone() == None
+    cache.close()
+
+
+def test_running_size_matches_table(tmp_path):
+    path = tmp_path.joinpath("http.sqlite")
+    cache = ResponseCache(path, max_bytes=250)
+
+    for i in range(5):
+        cache.store(str(i), _response(100), 60)
+    cache.store("4", _response(50), 60)
+
+    stored = cache._db.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert cache._bytes == stored <= 250
+    cache.close()
+
+    assert ResponseCache(path)._bytes == stored
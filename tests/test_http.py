@@ -0,0 +1,62 @@
+import httpx
+import pytest
+
+from src._http import ClientPool
+from src._http import _iter_on_loop
+
+
+def test_iter_on_loop_closes_abandoned_generator():
+    closed = []
+
+    async def numbers():
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed.append(True)
+
+    items = _iter_on_loop(numbers)
+    assert [next(items), next(items)] == [0, 1]
+    items.close()
+    assert closed == [True]
+
+
+def test_iter_on_loop_raises_generator_errors():
+    async def failing():
+        yield 1
+        raise KeyError("page")
+
+    items = _iter_on_loop(failing)
+    assert next(items) == 1
+    with pytest.raises(KeyError):
+        next(items)
+
+
+def test_iter_on_loop_flattens_pages():
+    async def pages():
+        yield [1, 2]
+        yield []
+        yield [3]
+
+    assert list(_iter_on_loop(pages, flatten=True)) == [1, 2, 3]
+
+
+class _CookieTransport(httpx.BaseTransport):
+    def __init__(self):
+        self.sent = []
+
+    def handle_request(self, req: httpx.Request) -> httpx.Response:
+        self.sent.append(req.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=abc; Path=/"}, request=req)
+
+
+@pytest.mark.parametrize("persist_cookies, second", [(False, None), (True, "session=abc")])
+def test_pool_cookie_persistence(persist_cookies, second):
+    transport = _CookieTransport()
+    pool = ClientPool(transport=transport, persist_cookies=persist_cookies)
+
+    pool.client.get("https://www.redfin.com/a")
+    pool.client.get("https://www.redfin.com/b")
+
+    assert transport.sent == [None, second]
+    pool.close()
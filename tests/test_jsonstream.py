@@ -0,0 +1,86 @@
+import orjson
+import pytest
+
+from src._jsonstream import iter_items
+
+
+PATH = ("payload", "homes")
+
+
+def _splits(doc: bytes):
+    """
+    The document cut in two at every byte, then one byte at a time
+    """
+    for i in range(len(doc) + 1):
+        yield [doc[:i], doc[i:]]
+    yield [doc[i:i + 1] for i in range(len(doc))]
+
+
+def _parse_everywhere(doc: bytes, path=PATH, prefix: bytes = b"") -> list:
+    results = [list(iter_items(chunks, path, prefix)) for chunks in _splits(doc)]
+    for result in results[1:]:
+        assert result == results[0]
+    return results[0]
+
+
+def test_split_inside_strings_and_escapes():
+    homes = [
+        {"id": 1, "street": "123 Main St", "note": 'say "hi" \\ back\nslash'},
+        {"id": 2, "street": "4 é\\u00e9 Ave", "tags": ["a,b", "]}", "{["]},
+    ]
+    doc = orjson.dumps({"payload": {"homes": homes}})
+    assert b'\\"' in doc and b"\\\\" in doc
+
+    assert _parse_everywhere(doc) == homes
+
+
+def test_split_inside_multibyte_characters():
+    homes = [
+        {"id": 1, "city": "Montréal", "agent": "José Peña"},
+        {"id": 2, "remarks": "✨ Café \U0001f3e1 中文"},
+        {"id": 3, "city": "Naperville"},
+    ]
+    doc = orjson.dumps({"payload": {"homes": homes}, "after": "über"})
+    assert len(doc) > len(doc.decode())
+
+    assert _parse_everywhere(doc) == homes
+
+
+def test_decoy_keys_are_skipped():
+    doc = orjson.dumps({
+        "homes": [{"id": "top-level decoy"}],
+        "payload": {
+            "meta": {"homes": [{"id": "nested decoy"}], "label": "homes"},
+            "search": {"payload": {"homes": [{"id": "deeper decoy"}]}},
+            "homes": [{"id": 1}, {"id": 2}],
+        },
+    })
+
+    assert _parse_everywhere(doc) == [{"id": 1}, {"id": 2}]
+
+
+def test_empty_array_and_whitespace_between_items():
+    assert _parse_everywhere(b'{"payload": {"homes": []}, "other": [{"id": 9}]}') == []
+    assert _parse_everywhere(b'{"payload":{"homes":[ \n\t ]}}') == []
+
+    doc = b'{ "payload" : { "homes" : [\n  {"id": 1} ,\n\t{"id": 2}\r\n ,  [3, 4]  \n] } }'
+    assert _parse_everywhere(doc) == [{"id": 1}, {"id": 2}, [3, 4]]
+
+
+def test_prefix_is_skipped():
+    doc = b'{}&&' + orjson.dumps({"payload": {"homes": [{"id": 1}]}})
+
+    assert _parse_everywhere(doc, prefix=b"{}&&") == [{"id": 1}]
+
+
+def test_truncated_body_raises():
+    doc = orjson.dumps({"payload": {"homes": [{"id": 1}, {"id": 2, "street": "5 Elm St"}]}})
+
+    # Inside the second item, and between the two
+    for cut in (doc.index(b"Elm"), doc.index(b',{"id":2') + 1):
+        for chunks in _splits(doc[:cut]):
+            items = []
+            with pytest.raises(orjson.JSONDecodeError):
+                for item in iter_items(chunks, PATH):
+                    items.append(item)
+            assert items == [{"id": 1}]
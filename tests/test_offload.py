@@ -0,0 +1,26 @@
+import orjson
+
+from src.paths import ROOT_DIR
+from src._offload import NormalizeExecutor
+
+
+def test_map_pulls_contents_lazily():
+    placards = orjson.loads(ROOT_DIR.joinpath("search_response-homes.json").read_bytes())
+    body = orjson.dumps({"placards": placards})
+    pulled = []
+
+    def contents():
+        for i in range(40):
+            pulled.append(i)
+            yield body
+
+    with NormalizeExecutor(workers=1, chunk_size=2) as ex:
+        results = ex.map("homes", contents())
+        first = next(results)
+        # Two tasks of two bodies in flight, plus the chunk being filled
+        assert len(pulled) <= 6
+        rest = list(results)
+
+    assert len(pulled) == 40
+    assert len(rest) + 1 == 40
+    assert len(first) == len(placards)